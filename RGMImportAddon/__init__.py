@@ -0,0 +1,39 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Add-on metadata
+bl_info = {
+    "name": "Rgm Importer",
+    "author": "ohari",
+    "description": "Imports Rgm Files",
+    "version": (1, 0, 0),
+    "blender": (4, 2, 3),
+    "location": "File > Import > Rgm (.rgm)",
+    "category": "Import-Export"
+}
+
+#textures decompress faster with zlib-ng or ISA-L, see codec.py:
+#import pip
+#pip.main(['install', 'zlib_ng', '--user'])
+
+# The format layer (chunky.py, rgmdata.py) is plain Python and numpy and can be
+# used outside of Blender, eg. "from RGMImportAddon.chunky import Chunky".
+# Blender modules are only imported when the add-on is registered.
+
+def register():
+    from . import operators
+    operators.register()
+
+def unregister():
+    from . import operators
+    operators.unregister()
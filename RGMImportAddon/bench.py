@@ -0,0 +1,258 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Micro-benchmarks of the decode stages on synthetic models, does not need Blender.
+# Run from the repository root:
+#   python -m RGMImportAddon.bench
+#   python -m RGMImportAddon.bench --objects 8 --verts 8000 --float-uvs --skinned --repeat 10
+#   python -m RGMImportAddon.bench --rgt <.rgt files or directories>
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+from . import codec
+from .chunky import Chunky, MapChunkFile, CloseChunkFile
+from .rgmdata import DecodeModel
+from .synth import SynthModelSpec, WriteModel, WriteRgt
+from .trace import Tracer
+
+'''
+    The import options DecodeModel reads, with the defaults of the import operator
+    sModelPath - the model to decode
+    tracer - the Tracer timing the stages
+'''
+class BenchOptions:
+    def __init__(self, sModelPath, tracer):
+        self.importTextures = True
+        self.importMeshes = True
+        self.importBones = True
+        self.importDatamarks = False
+        self.mirrorAxis = False
+        self.importDirectory = 'Work'
+        self.importNormals = True
+        self.weldVertices = False
+        self.weldThreshold = 0.00001
+        self.importCategories = {'Normal', 'Crushed', 'Wrecked', 'Tread'}
+        self.objectFilter = ""
+        self.vertexComponents = {'UVS', 'COLOURS', 'TANGENTS'}
+        self.streamBudget = 0
+        self.fileMap = None
+        self.bakeMaps = False
+        self.profile = 'OFF'
+        self.cancelled = False
+        self.knownChunkHashes = {}
+        self.sModelPath = sModelPath
+        self.sModelName = os.path.splitext(os.path.basename(sModelPath))[0]
+        self.sWorkingDirectory = os.path.dirname(sModelPath).replace('\\', '/')
+        self.sAssetDirectory = ""
+        self.tracer = tracer
+
+#the layouts benchmarked when no options are given
+k_aScenarios = [
+    ("packed uvs", dict(iMeshCount=2, iObjectCount=8, iVertexCount=4000)),
+    ("float uvs", dict(iMeshCount=2, iObjectCount=8, iVertexCount=4000, bCompressedUVs=False, bFloatNormals=True)),
+    ("skinned, 3 uvs", dict(iMeshCount=2, iObjectCount=8, iVertexCount=4000, iSkinBones=32, iBoneCount=64, iUVChannels=3, bColours=True)),
+    ("many small objects", dict(iMeshCount=16, iObjectCount=64, iVertexCount=60)),
+    ("trims", dict(iMeshCount=0, iTrimCount=64, iVertexCount=400)),
+    ("textures", dict(iMeshCount=1, iObjectCount=1, iVertexCount=100, iMaterialCount=2, iTextureSize=1024)),
+    ("embedded textures", dict(iMeshCount=1, iObjectCount=1, iVertexCount=100, iMaterialCount=2, iTextureSize=1024, bEmbedTextures=True)),
+]
+
+'''
+    Decodes a model once, the way ImportRgm.decodeRgm does, with all stages traced
+    sPath - the .rgm file
+    iStreamBudget - window memory in MB for the windowed vertex decode, 0 decodes whole buffers
+    returns - the Tracer holding the spans
+'''
+def DecodeOnce(sPath, iStreamBudget=0):
+    tracer = Tracer(True)
+    oOptions = BenchOptions(sPath, tracer)
+    oOptions.streamBudget = iStreamBudget
+    oRgm = Chunky()
+    with tracer.span("chunk scan") as oSpan:
+        oRgm.loadFromFile(sPath)
+        oSpan.set(chunks=oRgm.iChunkCount, bytes=os.path.getsize(sPath))
+    if iStreamBudget > 0:
+        oOptions.fileMap = MapChunkFile(sPath)
+    try:
+        with tracer.span("decode model", bytes=os.path.getsize(sPath)):
+            DecodeModel(oOptions, oRgm)
+    finally:
+        CloseChunkFile(oOptions.fileMap)
+    return tracer
+
+#textures are converted next to the model only when the .dds is missing
+def RemoveConvertedTextures(sDirectory):
+    for sFile in os.listdir(sDirectory):
+        if sFile.endswith(".dds"):
+            os.remove(os.path.join(sDirectory, sFile))
+
+'''
+    Benchmarks the decode stages of one synthetic model
+    oSpec - the SynthModelSpec
+    iRepeat - number of runs, the fastest run of every stage is reported
+    iStreamBudget - window memory in MB for the windowed vertex decode, 0 decodes whole buffers
+    returns - array of (stage, best seconds, counts of that stage)
+'''
+def BenchModel(oSpec, iRepeat, iStreamBudget=0):
+    with tempfile.TemporaryDirectory() as sDirectory:
+        sPath = WriteModel(sDirectory, oSpec)
+        dBest = {}
+        for i in range(iRepeat):
+            RemoveConvertedTextures(sDirectory)
+            for sName, iCalls, fTotal, dCounts in DecodeOnce(sPath, iStreamBudget).stages():
+                if sName not in dBest or fTotal < dBest[sName][0]:
+                    dBest[sName] = (fTotal, dCounts)
+    return [(sName, fTime, dCounts) for sName, (fTime, dCounts) in dBest.items()]
+
+'''
+    Benchmarks loading an .rgt texture and writing it as .dds
+    iSize - width and height of the texture
+    iMipCount - number of mip levels, 0 for a full mip chain
+    bZlib - zlib compress the mip levels
+    iRepeat - number of runs, the fastest run of every stage is reported
+    returns - array of (stage, best seconds, counts of that stage)
+'''
+def BenchTexture(iSize, iMipCount, bZlib, iRepeat):
+    with tempfile.TemporaryDirectory() as sDirectory:
+        sPath = os.path.join(sDirectory, "bench.rgt")
+        with open(sPath, "wb") as fHandle:
+            fHandle.write(WriteRgt(iSize, iSize, iMipCount, bZlib=bZlib))
+        iFileSize = os.path.getsize(sPath)
+        aBest = [float('inf'), float('inf')]
+        for i in range(iRepeat):
+            oRgt = Chunky()
+            fStart = time.perf_counter()
+            oRgt.loadFromFile(sPath)
+            oRgt.loadDxtc(sPath)
+            fLoaded = time.perf_counter()
+            oRgt.saveDxtc(os.path.join(sDirectory, "bench.dds"))
+            fSaved = time.perf_counter()
+            aBest[0] = min(aBest[0], fLoaded - fStart)
+            aBest[1] = min(aBest[1], fSaved - fLoaded)
+        iDdsSize = os.path.getsize(os.path.join(sDirectory, "bench.dds"))
+    return [("rgt load", aBest[0], {"bytes": iFileSize}), ("dds write", aBest[1], {"bytes": iDdsSize})]
+
+'''
+    Reads the zlib compressed mip levels of an .rgt texture, the way Chunky.loadDxtc finds them
+    sPath - the .rgt file
+    returns - array of (compressed data, decompressed size)
+'''
+def CompressedMips(sPath):
+    oRgt = Chunky()
+    if not oRgt.loadFromFile(sPath):
+        return []
+    aMips = []
+    folderTSet = oRgt.getChunkByType("FOLDTSET")
+    folderTxtr = folderTSet.getChildByType("FOLDTXTR") if folderTSet is not None else None
+    folderDxtc = folderTxtr.getChildByType("FOLDDXTC") if folderTxtr is not None else None
+    if folderDxtc is None or folderDxtc.getChildByType("DATATMAN") is None or folderDxtc.getChildByType("DATATDAT") is None:
+        return aMips
+    with open(sPath, "rb") as fHandle:
+        fHandle.seek(folderDxtc.getChildByType("DATATMAN").iDataPosition)
+        iMipCount = struct.unpack('I', fHandle.read(4))[0]
+        aSizes = [struct.unpack('2I', fHandle.read(8)) for i in range(iMipCount)]
+        fHandle.seek(folderDxtc.getChildByType("DATATDAT").iDataPosition)
+        for iDataLength, iDataLengthCompressed in aSizes:
+            pData = fHandle.read(iDataLengthCompressed)
+            if iDataLengthCompressed != iDataLength:
+                aMips.append((pData, iDataLength))
+    return aMips
+
+'''
+    Benchmarks the installed decompression backends on the mip levels of .rgt textures
+    aPaths - .rgt files and directories searched for them, a synthetic texture is used if empty
+    iRepeat - number of runs, the fastest run of every backend is reported
+    returns - array of (backend, best seconds, counts of that backend)
+'''
+def BenchCodecs(aPaths, iRepeat):
+    aFiles = []
+    for sPath in aPaths:
+        if os.path.isdir(sPath):
+            for sDirectory, aDirectories, aNames in os.walk(sPath):
+                aFiles.extend(os.path.join(sDirectory, sName) for sName in sorted(aNames) if sName.lower().endswith(".rgt"))
+        else:
+            aFiles.append(sPath)
+    if aFiles:
+        aMips = [oMip for sFile in aFiles for oMip in CompressedMips(sFile)]
+    else:
+        with tempfile.TemporaryDirectory() as sDirectory:
+            sPath = os.path.join(sDirectory, "bench.rgt")
+            with open(sPath, "wb") as fHandle:
+                fHandle.write(WriteRgt(2048, 2048, 0, bZlib=True))
+            aMips = CompressedMips(sPath)
+    iBytes = sum(iSize for pData, iSize in aMips)
+
+    sPrevious = codec.sCodecName
+    aResults = []
+    for sName in codec.AvailableCodecs():
+        codec.SetCodec(sName)
+        fBest = float('inf')
+        for i in range(iRepeat):
+            fStart = time.perf_counter()
+            for pData, iSize in aMips:
+                codec.Decompress(pData)
+            fBest = min(fBest, time.perf_counter() - fStart)
+        aResults.append((sName.lower(), fBest, {"bytes": iBytes}))
+    codec.SetCodec(sPrevious)
+    return aResults
+
+#formats the results of one benchmark with the throughput of every stage
+def FormatResults(sTitle, aResults):
+    aLines = [sTitle, f"  {'stage':<20} {'best ms':>10} {'MB/s':>10} {'Mvert/s':>10} {'kface/s':>10}"]
+    for sName, fTime, dCounts in aResults:
+        fTime = max(fTime, 1e-9)
+        sBytes = f"{dCounts['bytes'] / fTime / 1e6:>10.1f}" if "bytes" in dCounts else f"{'':>10}"
+        sVerts = f"{dCounts['vertices'] / fTime / 1e6:>10.2f}" if "vertices" in dCounts else f"{'':>10}"
+        sFaces = f"{dCounts['faces'] / fTime / 1e3:>10.1f}" if "faces" in dCounts else f"{'':>10}"
+        aLines.append(f"  {sName:<20} {fTime * 1000.0:>10.2f} {sBytes} {sVerts} {sFaces}")
+    return "\n".join(aLines)
+
+def main(aArgs=None):
+    oParser = argparse.ArgumentParser(description="Benchmarks the .rgm decode stages on synthetic models")
+    oParser.add_argument("--meshes", type=int, help="number of meshes, runs a single custom model instead of the default set")
+    oParser.add_argument("--objects", type=int, default=8, help="objects per mesh")
+    oParser.add_argument("--verts", type=int, default=4000, help="vertices per object")
+    oParser.add_argument("--trims", type=int, default=0, help="number of trim meshes")
+    oParser.add_argument("--float-uvs", action="store_true", help="store UVs and normals as floats")
+    oParser.add_argument("--uv-channels", type=int, default=1, help="number of UV channels")
+    oParser.add_argument("--skinned", action="store_true", help="store bone indices and weights")
+    oParser.add_argument("--bones", type=int, default=0, help="bones in the skeleton")
+    oParser.add_argument("--texture-size", type=int, default=1024, help="size of the benchmarked .rgt texture")
+    oParser.add_argument("--mips", type=int, default=0, help="mip levels of the texture, 0 for a full chain")
+    oParser.add_argument("--no-zlib", action="store_true", help="store the texture mip levels uncompressed")
+    oParser.add_argument("--stream-budget", type=int, default=0, help="decode vertex buffers in windows of this many MB")
+    oParser.add_argument("--rgt", nargs="*", help="only benchmark the decompression backends, on these .rgt files or directories (a synthetic texture if none are given)")
+    oParser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the fastest one is reported")
+    oArgs = oParser.parse_args(aArgs)
+
+    if oArgs.rgt is not None:
+        print(FormatResults("decompression, MB/s of decompressed data", BenchCodecs(oArgs.rgt, oArgs.repeat)))
+        return
+    if oArgs.meshes is not None:
+        aScenarios = [("custom", dict(iMeshCount=oArgs.meshes, iObjectCount=oArgs.objects, iVertexCount=oArgs.verts, iTrimCount=oArgs.trims,
+            bCompressedUVs=not oArgs.float_uvs, bFloatNormals=oArgs.float_uvs, iUVChannels=oArgs.uv_channels,
+            iSkinBones=32 if oArgs.skinned else 0, iBoneCount=oArgs.bones))]
+    else:
+        aScenarios = k_aScenarios
+
+    for sTitle, dSpec in aScenarios:
+        print(FormatResults("model: " + sTitle, BenchModel(SynthModelSpec(**dSpec), oArgs.repeat, oArgs.stream_budget)))
+    sTitle = f"texture: {oArgs.texture_size}x{oArgs.texture_size}, " + ("uncompressed" if oArgs.no_zlib else "zlib")
+    print(FormatResults(sTitle, BenchTexture(oArgs.texture_size, oArgs.mips, not oArgs.no_zlib, oArgs.repeat)))
+
+if __name__ == "__main__":
+    main()
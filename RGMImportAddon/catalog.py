@@ -0,0 +1,309 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Asset catalog: scans a directory tree of .rgm/.rga files into a SQLite database.
+# Only chunk headers and a few small strings are read, no vertex data is decoded.
+# Plain Python, does not need Blender. Run from the repository root:
+#   python -m RGMImportAddon.catalog scan <asset directory> catalog.db
+#   python -m RGMImportAddon.catalog find catalog.db panzer
+
+import argparse
+import os
+import sqlite3
+import struct
+import time
+
+from .chunky import Chunky
+from .trace import DebugPrint
+
+k_aModelExtensions = (".rgm", ".rga")
+k_aTextureExtensions = (".rgt", ".dds", ".tga")
+
+k_sSchema = '''
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    object_count INTEGER NOT NULL DEFAULT 0,
+    vertex_count INTEGER NOT NULL DEFAULT 0,
+    face_count INTEGER NOT NULL DEFAULT 0,
+    bone_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    buffer_vertex_count INTEGER NOT NULL,
+    face_count INTEGER NOT NULL,
+    material TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS materials (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    shader TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS textures (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    material TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS animations (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_model ON objects(model_id);
+CREATE INDEX IF NOT EXISTS objects_name ON objects(name);
+CREATE INDEX IF NOT EXISTS materials_model ON materials(model_id);
+CREATE INDEX IF NOT EXISTS materials_name ON materials(name);
+CREATE INDEX IF NOT EXISTS textures_model ON textures(model_id);
+CREATE INDEX IF NOT EXISTS textures_path ON textures(path);
+CREATE INDEX IF NOT EXISTS animations_model ON animations(model_id);
+CREATE INDEX IF NOT EXISTS animations_name ON animations(name);
+'''
+
+'''
+    Holds what the catalog knows about one model file
+    aObjects - array of (name, kind, buffer vertex count, face count, material), kind is "mesh" or "trim"
+    aMaterials - array of (name, shader)
+    aTextures - array of (material, variable name, path as stored in the model)
+    aAnimations - array of animation names
+    iVertexCount - number of vertices of all meshes and trims, the objects of a mesh share its vertices
+    iBoneCount - number of bones in the skeleton
+'''
+class CatalogEntry:
+    def __init__(self):
+        self.aObjects = []
+        self.aMaterials = []
+        self.aTextures = []
+        self.aAnimations = []
+        self.iVertexCount = 0
+        self.iBoneCount = 0
+
+def ReadU32(fHandle):
+    return struct.unpack('<I', fHandle.read(4))[0]
+
+def ReadString(fHandle):
+    return fHandle.read(ReadU32(fHandle)).decode('utf-8', 'replace').rstrip('\x00')
+
+#skips the per-vertex component list and the vertex buffer, returns the vertex count
+def SkipVertexBuffer(fHandle):
+    iComponentCount = ReadU32(fHandle)
+    fHandle.seek(iComponentCount * 12, 1)
+    iVertCount, iVertexSize = struct.unpack('<2I', fHandle.read(8))
+    fHandle.seek(iVertCount * iVertexSize, 1)
+    return iVertCount
+
+'''
+    Reads the object names and counts of a mesh DATADATA chunk, the layout DecodeMeshDataData reads, seeking over all arrays
+    fHandle - the model file
+    oChunk - the DATADATA chunk
+    oEntry - the CatalogEntry to add the objects to
+'''
+def ScanMeshDataData(fHandle, oChunk, oEntry):
+    fHandle.seek(oChunk.iDataPosition + 1)
+    aObjects = []
+    for i in range(ReadU32(fHandle)):
+        iIndexCount = ReadU32(fHandle)
+        fHandle.seek(iIndexCount * 2 + 13, 1)
+        aObjects.append((ReadString(fHandle), iIndexCount // 3))
+    iVertCount = SkipVertexBuffer(fHandle)
+    oEntry.iVertexCount += iVertCount
+    fHandle.seek(4, 1) #unknown
+    sMaterialName = ReadString(fHandle)
+    for sName, iFaceCount in aObjects:
+        oEntry.aObjects.append((sName, "mesh", iVertCount, iFaceCount, sMaterialName))
+
+'''
+    Reads the counts of a trim DATADATA chunk, the layout DecodeTrimDataData reads, seeking over all arrays
+    fHandle - the model file
+    oChunk - the DATADATA chunk
+    sName - name of the trim
+    oEntry - the CatalogEntry to add the trim to
+'''
+def ScanTrimDataData(fHandle, oChunk, sName, oEntry):
+    fHandle.seek(oChunk.iDataPosition)
+    iVertCount = SkipVertexBuffer(fHandle)
+    oEntry.iVertexCount += iVertCount
+    fHandle.seek(8, 1) #unknown
+    iVertsPerFace, iIndexCount = struct.unpack('<2I', fHandle.read(8))
+    fHandle.seek(iIndexCount * 2, 1)
+    sMaterialName = ReadString(fHandle)
+    oEntry.aObjects.append((sName, "trim", iVertCount, iIndexCount // max(iVertsPerFace, 1), sMaterialName))
+
+'''
+    Reads the shader and the texture variables of a FOLDMTRL folder
+    fHandle - the model file
+    oChunk - the FOLDMTRL chunk
+    oEntry - the CatalogEntry to add the material to
+'''
+def ScanMaterial(fHandle, oChunk, oEntry):
+    sShaderName = ""
+    for oChild in oChunk.aChildren:
+        if oChild.sType == "DATAINFO":
+            fHandle.seek(oChild.iDataPosition)
+            sShaderName = ReadString(fHandle)
+        elif "VAR" in oChild.sType:
+            fHandle.seek(oChild.iDataPosition)
+            sVarName = ReadString(fHandle)
+            fHandle.seek(4, 1)
+            #only variables holding a single string that names a texture file
+            iStrLen = ReadU32(fHandle)
+            if fHandle.tell() + iStrLen != oChild.iDataPosition + oChild.iDataLength:
+                continue
+            sValue = fHandle.read(iStrLen).decode('utf-8', 'replace').rstrip('\x00')
+            if sValue.lower().endswith(k_aTextureExtensions):
+                oEntry.aTextures.append((oChunk.sName, sVarName, sValue))
+    oEntry.aMaterials.append((oChunk.sName, sShaderName))
+
+def ScanChunk(fHandle, oChunk, oEntry):
+    if oChunk.sType == "FOLDMRGM":
+        oData = oChunk.getChildByType("DATADATA")
+        if oData is not None:
+            ScanMeshDataData(fHandle, oData, oEntry)
+    elif oChunk.sType == "FOLDTRIM":
+        #the first child of a trim is not its DATADATA
+        oData = next((oChild for oChild in oChunk.aChildren[1:] if oChild.sType == "DATADATA"), None)
+        if oData is not None:
+            ScanTrimDataData(fHandle, oData, oChunk.sName, oEntry)
+    elif oChunk.sType == "FOLDSKEL":
+        if oChunk.iChildCount > 0:
+            fHandle.seek(oChunk.aChildren[0].iDataPosition)
+            oEntry.iBoneCount += ReadU32(fHandle)
+    elif oChunk.sType == "FOLDMTRL":
+        ScanMaterial(fHandle, oChunk, oEntry)
+    elif oChunk.sType == "FOLDANIM":
+        oEntry.aAnimations.append(oChunk.sName)
+    else:
+        for oChild in oChunk.aChildren:
+            ScanChunk(fHandle, oChild, oEntry)
+
+'''
+    Reads the catalog entry of a model, without decoding vertex data
+    sPath - the .rgm or .rga file
+    returns - a CatalogEntry, None if the file can't be read
+'''
+def ScanModel(sPath):
+    oModel = Chunky()
+    if not oModel.loadFromFile(sPath):
+        return None
+    oEntry = CatalogEntry()
+    with open(sPath, "rb") as fHandle:
+        for oChunk in oModel.aChunks:
+            ScanChunk(fHandle, oChunk, oEntry)
+    return oEntry
+
+def OpenCatalog(sDatabase):
+    oConnection = sqlite3.connect(sDatabase)
+    oConnection.execute("PRAGMA foreign_keys = ON")
+    oConnection.executescript(k_sSchema)
+    return oConnection
+
+def StoreEntry(oConnection, sPath, oStat, oEntry, sError):
+    oConnection.execute("DELETE FROM models WHERE path = ?", (sPath,))
+    if oEntry is None:
+        oEntry = CatalogEntry()
+    oCursor = oConnection.execute(
+        "INSERT INTO models (path, mtime_ns, size, object_count, vertex_count, face_count, bone_count, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (sPath, oStat.st_mtime_ns, oStat.st_size, len(oEntry.aObjects), oEntry.iVertexCount,
+        sum(oObject[3] for oObject in oEntry.aObjects), oEntry.iBoneCount, sError))
+    iModelId = oCursor.lastrowid
+    oConnection.executemany("INSERT INTO objects VALUES (?, ?, ?, ?, ?, ?)", [(iModelId,) + oObject for oObject in oEntry.aObjects])
+    oConnection.executemany("INSERT INTO materials VALUES (?, ?, ?)", [(iModelId,) + oMaterial for oMaterial in oEntry.aMaterials])
+    oConnection.executemany("INSERT INTO textures VALUES (?, ?, ?, ?)", [(iModelId,) + oTexture for oTexture in oEntry.aTextures])
+    oConnection.executemany("INSERT INTO animations VALUES (?, ?)", [(iModelId, sName) for sName in oEntry.aAnimations])
+
+'''
+    Scans a directory tree into the catalog. Files whose modification time and size did not change since
+    the last scan are skipped, files that were removed from the tree are removed from the catalog.
+    sRoot - the asset directory
+    sDatabase - path of the SQLite database, created if missing
+    returns - (number of files scanned, number skipped as unchanged, number removed)
+'''
+def ScanTree(sRoot, sDatabase):
+    sRoot = os.path.abspath(sRoot)
+    oConnection = OpenCatalog(sDatabase)
+    #paths are stored with forward slashes, so the catalog can be shared between systems
+    sPrefix = sRoot.replace('\\', '/').rstrip('/') + '/'
+    dKnown = {sPath: (iMtime, iSize) for sPath, iMtime, iSize in oConnection.execute(
+        "SELECT path, mtime_ns, size FROM models WHERE substr(path, 1, ?) = ?", (len(sPrefix), sPrefix))}
+    iScanned = iSkipped = 0
+    with oConnection:
+        for sDirectory, aDirectories, aFiles in os.walk(sRoot):
+            aDirectories.sort()
+            for sFile in sorted(aFiles):
+                if not sFile.lower().endswith(k_aModelExtensions):
+                    continue
+                sFilePath = os.path.join(sDirectory, sFile)
+                sPath = sFilePath.replace('\\', '/')
+                oStat = os.stat(sFilePath)
+                if dKnown.pop(sPath, None) == (oStat.st_mtime_ns, oStat.st_size):
+                    iSkipped += 1
+                    continue
+                DebugPrint("Scanning " + sPath)
+                try:
+                    oEntry = ScanModel(sFilePath)
+                    sError = None if oEntry is not None else "not a chunky file"
+                except (OSError, struct.error, UnicodeDecodeError) as error:
+                    oEntry, sError = None, str(error)
+                if sError is not None:
+                    print("Unable to scan " + sPath + ": " + sError)
+                StoreEntry(oConnection, sPath, oStat, oEntry, sError)
+                iScanned += 1
+        #whatever is left was not found in the tree anymore
+        oConnection.executemany("DELETE FROM models WHERE path = ?", [(sPath,) for sPath in dKnown])
+    oConnection.close()
+    return iScanned, iSkipped, len(dKnown)
+
+'''
+    Finds models by model path, object, material, texture or animation name
+    sDatabase - path of the SQLite database
+    sPattern - text to search for, SQL LIKE wildcards can be used
+    returns - array of (path, object count, vertex count, face count, bone count) sorted by path
+'''
+def FindModels(sDatabase, sPattern):
+    sLike = "%" + sPattern + "%"
+    oConnection = OpenCatalog(sDatabase)
+    aRows = oConnection.execute('''
+        SELECT path, object_count, vertex_count, face_count, bone_count FROM models WHERE path LIKE ?1
+            OR id IN (SELECT model_id FROM objects WHERE name LIKE ?1)
+            OR id IN (SELECT model_id FROM materials WHERE name LIKE ?1)
+            OR id IN (SELECT model_id FROM textures WHERE path LIKE ?1)
+            OR id IN (SELECT model_id FROM animations WHERE name LIKE ?1)
+        ORDER BY path''', (sLike,)).fetchall()
+    oConnection.close()
+    return aRows
+
+def main(aArgs=None):
+    oParser = argparse.ArgumentParser(description="Catalogs .rgm/.rga files in a SQLite database without importing them")
+    oCommands = oParser.add_subparsers(dest="command", required=True)
+    oScan = oCommands.add_parser("scan", help="scan an asset directory, only new and changed files are read")
+    oScan.add_argument("root", help="asset directory")
+    oScan.add_argument("database", help="SQLite catalog file")
+    oFind = oCommands.add_parser("find", help="list models whose path, objects, materials, textures or animations match")
+    oFind.add_argument("database", help="SQLite catalog file")
+    oFind.add_argument("pattern", help="text to search for")
+    oArgs = oParser.parse_args(aArgs)
+
+    if oArgs.command == "scan":
+        fStart = time.perf_counter()
+        iScanned, iSkipped, iRemoved = ScanTree(oArgs.root, oArgs.database)
+        print(f"{iScanned} scanned, {iSkipped} unchanged, {iRemoved} removed in {time.perf_counter() - fStart:.2f} s")
+    else:
+        for sPath, iObjects, iVertices, iFaces, iBones in FindModels(oArgs.database, oArgs.pattern):
+            print(f"{sPath}: {iObjects} objects, {iVertices} vertices, {iFaces} faces, {iBones} bones")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Chunky file format: chunk tree, RGT textures and their conversion to .dds.
+# Plain Python, does not need Blender.
+
+import struct
+import mmap
+import io
+
+from .trace import DebugPrint
+from .codec import Decompress
+from .schema import k_oChunkyHeader, k_oChunkHeader, k_oCount, k_oDxtcFormat, k_oMipEntry, k_oMipHeader
+
+'''
+    Reads a string of length N from file.
+    f - file handle
+    n - length of string
+    returns - the string on success, false on error
+'''
+def read_string_n(f, n):
+    s = ""
+    for i in range(n):
+        b = f.read(1)
+        if not b:
+            return False
+        s += b.decode('utf-8')
+    return s
+
+class MipLevel:
+    def __init__(self):
+        self.iDataLength = 0
+        self.iDataLengthCompressed = 0
+        self.pData = b''
+        self.iWidth = 0
+        self.iHeight = 0
+
+'''
+    Represents a chunk in a chunky file
+    sType - eg. "FOLDMODL" or "DATAVBOL"
+    iVersion - version
+    sName - chunk name / info string
+    iDataPosition - absolute offset in file where data begins
+    iDataLength - length of data in file
+    iChildCount - number of child chunks (for FOLDxxxx)
+    aChildren - array of child chunks (1 through iChildCount inclusive; for FOLDxxxx)
+    sKey - path of the chunk in the chunk tree, see rgmdata.AssignChunkKeys
+'''
+class Chunk:
+    def __init__(self, currDepth=0):
+        self.sType = ""
+        self.iVersion = 0
+        self.sName = ""
+        self.iDataPosition = 0
+        self.iDataLength = 0
+        self.iChildCount = 0
+        self.aChildren = []
+        self.sKey = ""
+        self.currDepth = currDepth
+
+    '''
+        Reads a chunk from file
+        f - file handle
+        returns - true on success, other values on error
+    '''
+    def loadFromFile(self, f):
+        dHeader = k_oChunkHeader.read(f)
+        if dHeader is None:
+            DebugPrint("EOF")
+            return False
+        self.sType = dHeader["sType"]
+        self.iVersion = dHeader["iVersion"]
+        self.iDataLength = dHeader["iDataLength"]
+        self.sName = dHeader["sName"]
+        #print(self.currDepth * '--' + self.sType + ": " + self.sName)
+        self.iDataPosition = f.tell()
+        if self.sType[:4] == "FOLD":
+            self.currDepth = self.currDepth + 1
+            while f.tell() < (self.iDataPosition + self.iDataLength):
+                child = Chunk(self.currDepth)
+                if not child.loadFromFile(f):
+                    print("Chunk Error")
+                    return False
+                self.aChildren.append(child)
+                self.iChildCount += 1
+            self.currDepth = self.currDepth - 1
+        else:
+            f.seek(self.iDataLength, 1)
+        return True
+    
+    def getChildByType(self, type):
+        for child in self.aChildren:
+            if child.sType == type:
+                return child
+        return None
+    
+    
+'''
+    Represents a chunky file
+    sHeader - the file header
+    iVersion - version
+    iChunkCount - number of root level chunks
+    aChunks - array of root level chunks (1 through iChunkCount inclusive)
+    fFile - the file handle
+'''
+class Chunky:
+    def __init__(self):
+        self.sHeader = ""
+        self.iVersion = 0
+        self.iChunkCount = 0
+        self.aChunks = []
+        self.fFile = None
+        
+        self.pMipLevels = []
+        self.pData = 0
+        self.iWidth = 0
+        self.iHeight = 0
+        self.iDataLength = 0
+        self.iMipCount = 0
+        self.iMipCurrent = 0
+        self.iDxtCompression = 0
+                   
+
+    '''
+        Reads an entire chunky file
+        sName - name of file to open
+        returns - true on success, other values on error
+    '''
+    def loadFromFile(self, sName):
+        try:
+            with open(sName, "rb") as fHandle:
+                self.fFile = fHandle
+                dHeader = k_oChunkyHeader.read(fHandle)
+                self.sHeader = dHeader["sHeader"]
+                self.iVersion = dHeader["iVersion"]
+                while True:
+                    chunk = Chunk(0)
+                    if not chunk.loadFromFile(fHandle):
+                        break
+                    self.aChunks.append(chunk)
+                    self.iChunkCount += 1
+            DebugPrint("Chunky Success")
+            return True
+        except Exception as error:
+            print("Chunky Error: ", error)
+            return False
+        
+    def getChunkByType(self, type):
+        for chunk in self.aChunks:
+            if chunk.sType == type:
+                return chunk
+        return None
+    
+    def getImageType(self):
+        folderTSet = self.getChunkByType("FOLDTSET")
+        if folderTSet is not None:
+            folderTxtr = folderTSet.getChildByType("FOLDTXTR")
+            if folderTxtr is not None:
+                folderDxtc = folderTxtr.getChildByType("FOLDIMG")
+                if folderDxtc is not None:
+                    self.eFormat = "TGA" 
+                else:
+                    folderDxtc = folderTxtr.getChildByType("FOLDDXTC")
+                    if folderDxtc is not None:
+                        self.eFormat = "DXTC"
+                    else:
+                        self.eFormat = None
+                        print("Cannot locate texture folder")
+        return self.eFormat
+    
+    def loadDxtc(self, sFilename):
+        folderTSet = self.getChunkByType("FOLDTSET")
+        if folderTSet is not None:
+            with open(sFilename, "rb") as fHandle:
+                return self.loadDxtcFolder(folderTSet, fHandle)
+        else:
+            print("Cannot locate tset folder")
+            return None
+
+    '''
+        Reads the DXTC texture of a FOLDTSET folder
+        folderTSet - the FOLDTSET chunk
+        fHandle - file holding the chunk data at the offsets of the chunky file the chunks were read from, minus iBase
+        iBase - where fHandle starts in that chunky file, eg. the data position of folderTSet for a buffer of its data
+        returns - true on success, other values on error
+    '''
+    def loadDxtcFolder(self, folderTSet, fHandle, iBase=0):
+        folderTxtr = folderTSet.getChildByType("FOLDTXTR")
+        if folderTxtr is not None:
+            folderDxtc = folderTxtr.getChildByType("FOLDDXTC")
+            if folderDxtc is not None:
+                dataTFmt = folderDxtc.getChildByType("DATATFMT")
+                if dataTFmt is not None:
+                    fHandle.seek(dataTFmt.iDataPosition - iBase)
+                    dFormat = k_oDxtcFormat.read(fHandle)
+                    self.iWidth = dFormat["iWidth"]
+                    self.iHeight = dFormat["iHeight"]
+                    #print("Image-Size: ", self.iWidth, "x", self.iHeight)
+                    self.iDxtCompression = dFormat["iCompression"]
+                    if (self.iDxtCompression == 13) or (self.iDxtCompression == 22):
+                        self.iDxtCompression = 1
+                        #print("DXTC Compression: DXTC 1")
+                    elif (self.iDxtCompression == 14):
+                        self.iDxtCompression = 3
+                        #print("DXTC Compression: DXTC 3")
+                    elif (self.iDxtCompression == 15):
+                        self.iDxtCompression = 5
+                        #print("DXTC Compression: DXTC 5")
+                    else:
+                        print("Error")
+                        return False
+                else:
+                    print("Cannot locate DATATFMT")
+                    return None
+                dataTMan = folderDxtc.getChildByType("DATATMAN")
+                if dataTMan is not None:
+                    fHandle.seek(dataTMan.iDataPosition - iBase)
+                    pMipTable = fHandle.read(dataTMan.iDataLength)
+                    self.iMipCount = k_oCount.unpack_from(pMipTable)[0]["iCount"]
+                    aMipEntries = k_oMipEntry.unpack_array(pMipTable, 4, self.iMipCount)[0]
+                else:
+                    print("Cannot locate DATATMAN")
+                    return None
+                dataTDat = folderDxtc.getChildByType("DATATDAT")
+                if dataTDat is not None:
+                    #the mip levels follow each other, smallest first
+                    fHandle.seek(dataTDat.iDataPosition - iBase)
+                    for dMipEntry in aMipEntries:
+                        pCurrentLevel = MipLevel()
+                        pCurrentLevel.iDataLength = dMipEntry["iDataLength"]
+                        iDataLengthCompressed = dMipEntry["iDataLengthCompressed"]
+                        pCurrentLevel.pData += fHandle.read(iDataLengthCompressed)
+                        if(iDataLengthCompressed != pCurrentLevel.iDataLength):
+                            pCurrentLevel.pData = Decompress(pCurrentLevel.pData)
+                        dMipHeader = k_oMipHeader.unpack_from(pCurrentLevel.pData)[0]
+                        self.iMipCurrent = dMipHeader["iMipLevel"]
+                        pCurrentLevel.iWidth = dMipHeader["iWidth"]
+                        pCurrentLevel.iHeight = dMipHeader["iHeight"]
+                        pCurrentLevel.iDataLength = dMipHeader["iDataLength"]
+                        self.pMipLevels.insert(0, pCurrentLevel)
+                        #print("Curr. Mip-Level: ", self.iMipCurrent, " Curr. Image-Size: ",pCurrentLevel.iWidth, "x", pCurrentLevel.iHeight, " Curr. Datalength:",pCurrentLevel.iDataLength, " ")
+
+                    self.iWidth = self.pMipLevels[self.iMipCurrent].iWidth
+                    self.iHeight = self.pMipLevels[self.iMipCurrent].iHeight
+                    self.iDataLength = self.pMipLevels[self.iMipCurrent].iDataLength
+                    self.pData = self.pMipLevels[self.iMipCurrent].pData
+                    #self.pData += b'FF'# + 16
+                    #print("Image decompressed")
+                    #print("Image-Size: ", self.iWidth, "x", self.iHeight)
+                    #print("Image-Data-Size:", self.iDataLength)
+                    return True
+                else:
+                    print("Cannot locate DATATDAT")
+                    return None
+            else:
+                print("Cannot locate texture folder")
+                return None
+        else:
+            print("Cannot locate texture folder")
+            return None
+
+    '''
+        Builds the .dds file of the loaded DXTC texture
+        returns - the file as bytes, None for an unknown compression
+    '''
+    def dxtcBytes(self):
+        fHandle = io.BytesIO()
+        fHandle.write(b'DDS ')
+        fHandle.write(struct.pack('I', 124))
+        #N = 1 | 2 | 4 | 0x1000 | (bMipLevels ? 0x20000 : 0) | 0x80000; // DDSD_CAPS, DDSD_WIDTH, DDSD_HEIGHT, DDSD_PIXELFORMAT, DDSD_MIPMAPCOUNT, DDSD_LINEARSIZE
+        if self.iMipCount > 1:
+            n = 1 | 2 | 4 | 4096 | 131072 | 524288
+        else:
+            n = 1 | 2 | 4 | 4096 | 0 | 524288
+        fHandle.write(struct.pack('I', n))
+        fHandle.write(struct.pack('I', self.iHeight))
+        fHandle.write(struct.pack('I', self.iWidth))
+        fHandle.write(struct.pack('I', self.iDataLength))
+        fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', self.iMipCount))
+        for i in range(11):
+            fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', 32))
+        fHandle.write(struct.pack('I', 4))
+        if self.iDxtCompression == 1:
+            fHandle.write(b'DXT1')
+        elif self.iDxtCompression == 3:
+            fHandle.write(b'DXT3')
+        elif self.iDxtCompression == 5:
+            fHandle.write(b'DXT5')
+        else:
+            print("Compression Error")
+            return None
+        fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', 0))
+        fHandle.write(struct.pack('I', 0))
+        #N = (bMipLevels ? 8 : 0) | 0x1000 | (bMipLevels ? 0x400000 : 0); // DDSCAPS_COMPLEX, DDSCAPS_TEXTURE, DDSCAPS_MIPMAP
+        if self.iMipCount > 1:
+            n = 8 | 4096 | 4194304
+        else:
+            n = 0 | 4096 | 0
+        fHandle.write(struct.pack('I', n))
+        for iMipLevel in self.pMipLevels:
+            fHandle.write(iMipLevel.pData)
+        return fHandle.getvalue()
+
+    def saveDxtc(self, outFile):
+        pDds = self.dxtcBytes()
+        if pDds is None:
+            return False
+        try:
+            with open(outFile, 'wb') as fHandle:
+                fHandle.write(pDds)
+                DebugPrint(".dds File finished")
+        except:
+            print("Error while writing .rgt file ", outFile)
+
+
+def importRgt(sFilename):
+    if sFilename is not None:
+        oRgt = Chunky()
+        if not oRgt.loadFromFile(sFilename):
+            print("Unable to load .rgt file ", sFilename)
+        else:
+            if(oRgt.getImageType() == "DXTC"):
+                DebugPrint("DXTC recognized, ", end='')
+                oRgt.loadDxtc(sFilename)
+                outFile = sFilename.split('.')[0] + ".dds"
+                DebugPrint(".dds file with ", oRgt.iMipCount, " mip levels will be written")
+                oRgt.saveDxtc(outFile)
+            else: 
+                print("Invalid image type, can't be converted") 
+
+'''
+    Decodes a DXTC texture set embedded in a model into a .dds file in memory, the same way importRgt converts a .rgt file
+    folderTSet - the FOLDTSET chunk
+    pData - the data of the FOLDTSET chunk, see ReadChunkData
+    returns - the .dds file as bytes, None if the set holds no DXTC texture
+'''
+def DecodeEmbeddedDxtc(folderTSet, pData):
+    oTexture = Chunky()
+    if oTexture.loadDxtcFolder(folderTSet, io.BytesIO(pData), folderTSet.iDataPosition) is not True:
+        return None
+    return oTexture.dxtcBytes()
+
+'''
+    Maps a chunky file instead of reading it, the pages are only loaded while they are used
+    sFilename - the chunky file
+    returns - the mapping, to pass to ReadChunkData and to close with CloseChunkFile once the import is done
+'''
+def MapChunkFile(sFilename):
+    with open(sFilename, "rb") as fHandle:
+        #the whole file is mapped, a mapping has to start at a multiple of the page size
+        return mmap.mmap(fHandle.fileno(), 0, access=mmap.ACCESS_READ)
+
+'''
+    Closes a mapping of MapChunkFile
+    oMap - the mapping, None does nothing
+'''
+def CloseChunkFile(oMap):
+    if oMap is None:
+        return
+    try:
+        oMap.close()
+    except BufferError:
+        #data read from it is still in use, the file is unmapped once that is freed
+        pass
+
+'''
+    Reads the data of a chunk
+    sFilename - the chunky file the chunk was loaded from
+    oChunk - the chunk
+    oMap - a mapping of the file, see MapChunkFile, None reads the chunk from the file
+    returns - the chunk data as bytes, a memoryview of oMap if it is given
+'''
+def ReadChunkData(sFilename, oChunk, oMap=None):
+    if oMap is not None:
+        return memoryview(oMap)[oChunk.iDataPosition:oChunk.iDataPosition + oChunk.iDataLength]
+    with open(sFilename, "rb") as fHandle:
+        fHandle.seek(oChunk.iDataPosition)
+        return fHandle.read(oChunk.iDataLength)
@@ -0,0 +1,77 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# zlib decompression of texture mip levels. The faster zlib-ng (pip package zlib-ng) and
+# ISA-L (pip package isal) are used when they are installed, Python's zlib otherwise.
+
+import importlib
+import zlib
+
+#backend name, module implementing the zlib interface, in the order 'AUTO' tries them
+k_aBackends = [
+    ('ZLIB_NG', "zlib_ng.zlib_ng"),
+    ('ISAL', "isal.isal_zlib"),
+    ('ZLIB', "zlib"),
+]
+
+#the backend in use, see SetCodec
+sCodecName = 'ZLIB'
+fnDecompress = zlib.decompress
+
+'''
+    Loads the module of a backend
+    sName - backend name from k_aBackends
+    returns - the module, None if it is not installed
+'''
+def LoadBackend(sName):
+    for sBackend, sModule in k_aBackends:
+        if sBackend == sName:
+            try:
+                return importlib.import_module(sModule)
+            except ImportError:
+                return None
+    return None
+
+'''
+    Lists the installed backends
+    returns - array of backend names, fastest first
+'''
+def AvailableCodecs():
+    return [sName for sName, sModule in k_aBackends if LoadBackend(sName) is not None]
+
+'''
+    Picks the decompression backend
+    sName - backend name from k_aBackends, or 'AUTO' for the fastest installed one
+    returns - the name of the backend in use, Python's zlib if the requested one is not installed
+'''
+def SetCodec(sName):
+    global sCodecName, fnDecompress
+    aNames = AvailableCodecs() if sName == 'AUTO' else [sName]
+    for sCandidate in aNames:
+        oModule = LoadBackend(sCandidate)
+        if oModule is not None:
+            sCodecName, fnDecompress = sCandidate, oModule.decompress
+            return sCodecName
+    print("Decompression backend " + sName + " is not installed, using zlib")
+    sCodecName, fnDecompress = 'ZLIB', zlib.decompress
+    return sCodecName
+
+'''
+    Decompresses a zlib stream with the backend in use
+    pData - the compressed data
+    returns - the decompressed bytes
+'''
+def Decompress(pData):
+    return fnDecompress(pData)
+
+SetCodec('AUTO')
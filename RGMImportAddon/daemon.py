@@ -0,0 +1,338 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Import service for batch conversions: a Blender started once in background mode takes import jobs over a local
+# socket, so Blender startup is not paid again for every model. Jobs run one after another, each in an empty scene.
+# Start it with the add-on installed (or the repository root on PYTHONPATH):
+#   blender --background --python-expr "from RGMImportAddon import daemon; daemon.main()" -- serve --port 8765
+# and send jobs from any Python, Blender is not needed for that:
+#   python -m RGMImportAddon.daemon submit model.rgm model.blend --option importTextures=true --wait
+#   python -m RGMImportAddon.daemon list
+#
+# The protocol is one JSON object per line in both directions. Requests have a "command":
+#   submit   - "model", "output" (.blend, .glb, .gltf, .fbx, .obj or .usd*, "" for none) and "options", keyword arguments of ImportRgm.setData
+#   status   - "job", the id submit returned
+#   wait     - "job", answers when the job is done
+#   cancel   - "job"
+#   list     - all jobs
+#   shutdown - stops the service once the running job is done
+# Replies have "ok" and either the result or an "error".
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+k_sHost = "127.0.0.1"
+k_iPort = 8765
+
+#the options of a job, with the defaults of the import operator
+k_dDefaultOptions = {
+    "importTextures": False,
+    "importAnimations": False,
+    "importDirectory": 'Work',
+    "importMeshes": True,
+    "importBones": False,
+    "importDatamarks": False,
+    "mirrorAxis": False,
+    "weldVertices": False,
+    "weldThreshold": 0.00001,
+    "importNormals": True,
+    "debug": False,
+    "shareMeshes": True,
+    "importCategories": ['Normal', 'Crushed', 'Wrecked', 'Tread'],
+    "objectFilter": "",
+    "vertexComponents": ['UVS', 'COLOURS', 'TANGENTS'],
+    "streamBudget": 0,
+    "memoryReport": False,
+    "bakeMaps": False,
+}
+
+'''
+    Creates the importer of a model, Blender only
+    sModelPath - the .rgm file
+    dOptions - keyword arguments of ImportRgm.setData, missing ones take the values of k_dDefaultOptions
+    returns - an ImportRgm instance
+'''
+def ImporterFromOptions(sModelPath, dOptions):
+    from .scene import ImportRgm
+    dOptions = dict(k_dDefaultOptions, **dOptions)
+    importer = ImportRgm()
+    importer.setData(False, sModelPath, dOptions.pop("importTextures"), dOptions.pop("importAnimations"), dOptions.pop("importDirectory"),
+        dOptions.pop("importMeshes"), dOptions.pop("importBones"), dOptions.pop("importDatamarks"), dOptions.pop("mirrorAxis"), **dOptions)
+    return importer
+
+'''
+    Writes the current scene to a file, the format is picked by the extension
+    sPath - the output file
+'''
+def ExportScene(sPath):
+    import bpy
+    sExtension = os.path.splitext(sPath)[1].lower()
+    if sExtension == ".blend":
+        bpy.ops.wm.save_as_mainfile(filepath=sPath, copy=True)
+    elif sExtension in (".glb", ".gltf"):
+        bpy.ops.export_scene.gltf(filepath=sPath, export_format='GLB' if sExtension == ".glb" else 'GLTF_SEPARATE')
+    elif sExtension == ".fbx":
+        bpy.ops.export_scene.fbx(filepath=sPath)
+    elif sExtension == ".obj":
+        bpy.ops.wm.obj_export(filepath=sPath)
+    elif sExtension in (".usd", ".usda", ".usdc", ".usdz"):
+        bpy.ops.wm.usd_export(filepath=sPath)
+    else:
+        raise ValueError("Unsupported output format: " + sPath)
+
+'''
+    One import job of the service
+    iId - job id
+    sModelPath - the .rgm file
+    sOutputPath - the file the scene is written to, empty to only import
+    dOptions - keyword arguments of ImportRgm.setData, see k_dDefaultOptions
+'''
+class DaemonJob:
+    def __init__(self, iId, sModelPath, sOutputPath, dOptions):
+        self.iId = iId
+        self.sModelPath = sModelPath
+        self.sOutputPath = sOutputPath
+        self.dOptions = dOptions
+        self.sState = 'QUEUED' #QUEUED, RUNNING, FINISHED, FAILED or CANCELLED
+        self.sError = ""
+        self.fQueued = time.time()
+        self.fStarted = 0.0
+        self.fFinished = 0.0
+        self.fImportSeconds = 0.0
+        self.fExportSeconds = 0.0
+        self.dMemory = None #the memory report of the import, with the memoryReport option
+        self.aWarnings = [] #problems the import worked around, see Tracer.warn
+        self.oImport = None #the ImportRgmJob while the job runs
+        self.oDone = asyncio.Event()
+
+    def status(self):
+        return {
+            "job": self.iId,
+            "model": self.sModelPath,
+            "output": self.sOutputPath,
+            "state": self.sState,
+            "error": self.sError,
+            "queued": self.fQueued,
+            "started": self.fStarted,
+            "finished": self.fFinished,
+            "waitSeconds": (self.fStarted or time.time()) - self.fQueued,
+            "importSeconds": self.fImportSeconds,
+            "exportSeconds": self.fExportSeconds,
+            "memory": self.dMemory,
+            "warnings": self.aWarnings,
+        }
+
+'''
+    The import service, runs inside a Blender started in background mode
+'''
+class ImportDaemon:
+    def __init__(self):
+        self.dJobs = {}
+        self.iNextId = 1
+        self.oQueue = asyncio.Queue()
+        self.oStopped = asyncio.Event()
+
+    def submit(self, sModelPath, sOutputPath, dOptions):
+        aUnknown = [sKey for sKey in dOptions if sKey not in k_dDefaultOptions]
+        if aUnknown:
+            raise ValueError("Unknown options: " + ", ".join(aUnknown))
+        if sOutputPath:
+            #fail early instead of after the import
+            sExtension = os.path.splitext(sOutputPath)[1].lower()
+            if sExtension not in (".blend", ".glb", ".gltf", ".fbx", ".obj", ".usd", ".usda", ".usdc", ".usdz"):
+                raise ValueError("Unsupported output format: " + sOutputPath)
+        oJob = DaemonJob(self.iNextId, os.path.abspath(sModelPath), os.path.abspath(sOutputPath) if sOutputPath else "", dict(k_dDefaultOptions, **dOptions))
+        self.iNextId += 1
+        self.dJobs[oJob.iId] = oJob
+        self.oQueue.put_nowait(oJob)
+        return oJob
+
+    def cancel(self, oJob):
+        if oJob.sState == 'QUEUED':
+            oJob.sState = 'CANCELLED'
+            oJob.oDone.set()
+        elif oJob.oImport is not None:
+            oJob.oImport.cancel()
+
+    # Imports the model of a job into an empty scene and writes the output, yields to the server between datablocks
+    async def runJob(self, oJob):
+        import bpy
+        from .scene import ImportRgmJob
+        oJob.sState = 'RUNNING'
+        oJob.fStarted = time.time()
+        bpy.ops.wm.read_homefile(use_empty=True)
+
+        oJob.oImport = ImportRgmJob([ImporterFromOptions(oJob.sModelPath, oJob.dOptions)], 1)
+        oJob.oImport.start()
+        sState = 'RUNNING'
+        while sState == 'RUNNING':
+            sState = oJob.oImport.update(0.05)
+            await asyncio.sleep(0.005)
+        oJob.fImportSeconds = time.time() - oJob.fStarted
+        oMemory = oJob.oImport.aImporters[0].tracer.oMemory
+        if oMemory is not None:
+            oJob.dMemory = oMemory.report()
+        oJob.aWarnings = oJob.oImport.warnings()
+        if oJob.oImport.error is not None:
+            raise RuntimeError(oJob.oImport.error)
+        if sState == 'CANCELLED':
+            oJob.sState = 'CANCELLED'
+            return
+        if oJob.oImport.aFailed:
+            raise RuntimeError("Unable to load " + ", ".join(oJob.oImport.aFailed))
+
+        if oJob.sOutputPath:
+            fExportStart = time.time()
+            os.makedirs(os.path.dirname(oJob.sOutputPath), exist_ok=True)
+            ExportScene(oJob.sOutputPath)
+            oJob.fExportSeconds = time.time() - fExportStart
+        oJob.sState = 'FINISHED'
+
+    async def worker(self):
+        while not self.oStopped.is_set():
+            oJob = await self.oQueue.get()
+            if oJob is None or oJob.sState != 'QUEUED':
+                continue
+            try:
+                await self.runJob(oJob)
+            except Exception as error:
+                oJob.sState = 'FAILED'
+                oJob.sError = str(error)
+            oJob.oImport = None
+            oJob.fFinished = time.time()
+            print(f"Job {oJob.iId} {oJob.sState.lower()}: {oJob.sModelPath} in {oJob.fFinished - oJob.fStarted:.2f}s {oJob.sError}")
+            oJob.oDone.set()
+
+    def job(self, dRequest):
+        oJob = self.dJobs.get(dRequest.get("job"))
+        if oJob is None:
+            raise ValueError("Unknown job: " + str(dRequest.get("job")))
+        return oJob
+
+    async def handleRequest(self, dRequest):
+        sCommand = dRequest.get("command")
+        if sCommand == "submit":
+            return self.submit(dRequest["model"], dRequest.get("output", ""), dRequest.get("options", {})).status()
+        elif sCommand == "status":
+            return self.job(dRequest).status()
+        elif sCommand == "wait":
+            oJob = self.job(dRequest)
+            await oJob.oDone.wait()
+            return oJob.status()
+        elif sCommand == "cancel":
+            oJob = self.job(dRequest)
+            self.cancel(oJob)
+            return oJob.status()
+        elif sCommand == "list":
+            return {"jobs": [oJob.status() for oJob in self.dJobs.values()]}
+        elif sCommand == "shutdown":
+            self.oStopped.set()
+            self.oQueue.put_nowait(None)
+            return {}
+        raise ValueError("Unknown command: " + str(sCommand))
+
+    async def handleClient(self, oReader, oWriter):
+        try:
+            while not oReader.at_eof():
+                sLine = await oReader.readline()
+                if not sLine.strip():
+                    continue
+                try:
+                    dReply = dict(await self.handleRequest(json.loads(sLine)), ok=True)
+                except Exception as error:
+                    dReply = {"ok": False, "error": str(error)}
+                oWriter.write((json.dumps(dReply) + "\n").encode('utf-8'))
+                await oWriter.drain()
+        except ConnectionError:
+            pass
+        finally:
+            oWriter.close()
+
+    async def serve(self, sHost, iPort):
+        oServer = await asyncio.start_server(self.handleClient, sHost, iPort)
+        print(f"Rgm import service listening on {sHost}:{iPort}")
+        oWorker = asyncio.ensure_future(self.worker())
+        async with oServer:
+            await self.oStopped.wait()
+            #the running job is finished before Blender quits, the queued ones are dropped
+            await oWorker
+            for oJob in self.dJobs.values():
+                self.cancel(oJob)
+        print("Rgm import service stopped")
+
+'''
+    Sends one request to the import service and waits for the reply
+    dRequest - the request, see the top of this file
+    sHost, iPort - address of the service
+    returns - the reply
+'''
+def SendRequest(dRequest, sHost=k_sHost, iPort=k_iPort):
+    async def Send():
+        oReader, oWriter = await asyncio.open_connection(sHost, iPort)
+        oWriter.write((json.dumps(dRequest) + "\n").encode('utf-8'))
+        await oWriter.drain()
+        sLine = await oReader.readline()
+        oWriter.close()
+        return json.loads(sLine)
+    return asyncio.run(Send())
+
+#parses key=value job options, values are JSON where possible, eg. importTextures=true, importCategories=["Normal"]
+def ParseOption(sOption):
+    sKey, sSeparator, sValue = sOption.partition("=")
+    try:
+        return sKey, json.loads(sValue)
+    except ValueError:
+        return sKey, sValue
+
+def main(aArgs=None):
+    if aArgs is None:
+        #inside Blender the arguments of the script follow "--"
+        aArgs = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    oParser = argparse.ArgumentParser(description="Rgm import service for batch conversions")
+    oParser.add_argument("--host", default=k_sHost)
+    oParser.add_argument("--port", type=int, default=k_iPort)
+    oCommands = oParser.add_subparsers(dest="command", required=True)
+    oCommands.add_parser("serve", help="run the service, inside blender --background")
+    oSubmit = oCommands.add_parser("submit", help="queue an import job")
+    oSubmit.add_argument("model", help="the .rgm file")
+    oSubmit.add_argument("output", nargs="?", default="", help="file the imported scene is written to, .blend, .glb, .gltf, .fbx, .obj or .usd")
+    oSubmit.add_argument("--option", action="append", default=[], help="import option as key=value, eg. importTextures=true")
+    oSubmit.add_argument("--wait", action="store_true", help="wait until the job is done")
+    for sCommand in ("status", "wait", "cancel"):
+        oCommands.add_parser(sCommand, help=sCommand + " a job").add_argument("job", type=int)
+    oCommands.add_parser("list", help="list all jobs")
+    oCommands.add_parser("shutdown", help="stop the service")
+    oArgs = oParser.parse_args(aArgs)
+
+    if oArgs.command == "serve":
+        asyncio.run(ImportDaemon().serve(oArgs.host, oArgs.port))
+        return
+    if oArgs.command == "submit":
+        dRequest = {"command": "submit", "model": oArgs.model, "output": oArgs.output, "options": dict(ParseOption(sOption) for sOption in oArgs.option)}
+    elif oArgs.command in ("status", "wait", "cancel"):
+        dRequest = {"command": oArgs.command, "job": oArgs.job}
+    else:
+        dRequest = {"command": oArgs.command}
+    dReply = SendRequest(dRequest, oArgs.host, oArgs.port)
+    if oArgs.command == "submit" and oArgs.wait and dReply["ok"]:
+        dReply = SendRequest({"command": "wait", "job": dReply["job"]}, oArgs.host, oArgs.port)
+    print(json.dumps(dReply, indent=2))
+    if not dReply["ok"] or dReply.get("state") in ('FAILED', 'CANCELLED'):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
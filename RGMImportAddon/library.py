@@ -0,0 +1,338 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Builds a Blender asset library out of a directory of models: one .blend per .rgm with the imported model marked as asset.
+# A manifest next to the library holds the content hashes of the inputs of every entry (model, textures, animations),
+# the importer version and the import options, so a rebuild only imports models whose inputs changed.
+# The imports run in background Blender processes, run from the repository root:
+#   python -m RGMImportAddon.library <asset directory> <library directory> --workers 4 --blender /path/to/blender
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import bl_info
+from .catalog import ScanModel
+from .daemon import k_dDefaultOptions, ParseOption
+
+k_sManifestName = "library_manifest.json"
+k_iManifestVersion = 1
+#the modules that change what an import decodes and builds, a change to them rebuilds the library
+k_aImporterModules = ("chunky.py", "schema.py", "codec.py", "rgmdata.py", "scene.py")
+
+'''
+    Identifies the importer code, entries built by another version are rebuilt
+    returns - the add-on version and a hash of the importer modules
+'''
+def ImporterVersion():
+    oHash = hashlib.blake2b(digest_size=8)
+    sDirectory = os.path.dirname(os.path.abspath(__file__))
+    for sModule in k_aImporterModules:
+        with open(os.path.join(sDirectory, sModule), "rb") as fHandle:
+            oHash.update(fHandle.read())
+    return ".".join(str(i) for i in bl_info["version"]) + "+" + oHash.hexdigest()
+
+def OptionsHash(dOptions):
+    return hashlib.blake2b(json.dumps(dOptions, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+
+def FileHash(sPath):
+    oHash = hashlib.blake2b(digest_size=16)
+    with open(sPath, "rb") as fHandle:
+        for pBlock in iter(lambda: fHandle.read(1 << 20), b""):
+            oHash.update(pBlock)
+    return oHash.hexdigest()
+
+'''
+    Hashes an input file, the hash of the last build is reused if size and modification time did not change
+    sPath - the file
+    dKnown - the inputs of the entry in the last manifest, path to {"hash", "size", "mtime_ns"}
+    returns - {"hash", "size", "mtime_ns"}, hash is None for a missing file
+'''
+def InputState(sPath, dKnown):
+    try:
+        oStat = os.stat(sPath)
+    except OSError:
+        return {"hash": None, "size": 0, "mtime_ns": 0}
+    dState = {"hash": None, "size": oStat.st_size, "mtime_ns": oStat.st_mtime_ns}
+    dOld = dKnown.get(sPath)
+    if dOld is not None and dOld["size"] == dState["size"] and dOld["mtime_ns"] == dState["mtime_ns"]:
+        dState["hash"] = dOld["hash"]
+    else:
+        dState["hash"] = FileHash(sPath)
+    return dState
+
+'''
+    Lists the files an import of a model reads, resolved like DecodeMaterial does
+    sModelPath - the .rgm file
+    dOptions - the import options
+    sAssetDirectory - the asset directory for importDirectory 'Asset'
+    returns - sorted array of paths, textures are listed as .rgt if there is one, as the .dds is converted from it
+'''
+def ModelInputs(sModelPath, dOptions, sAssetDirectory):
+    aInputs = {sModelPath}
+    sDirectory = os.path.dirname(sModelPath)
+    oEntry = ScanModel(sModelPath)
+    if oEntry is not None and dOptions["importTextures"]:
+        for sMaterial, sVariable, sTexture in oEntry.aTextures:
+            sTexture = sTexture.replace('\\', '/').rsplit('.', 1)[0]
+            if dOptions["importDirectory"] == 'Asset':
+                sBase = os.path.join(sAssetDirectory, "data", sTexture)
+            else:
+                sBase = os.path.join(sDirectory, sTexture.rsplit('/', 1)[-1])
+            aInputs.add(sBase + ".rgt" if os.path.isfile(sBase + ".rgt") else sBase + ".dds")
+    if dOptions["importAnimations"]:
+        aInputs.update(os.path.join(sDirectory, sFile) for sFile in os.listdir(sDirectory) if sFile.lower().endswith(".rga"))
+    return sorted(os.path.normpath(sPath) for sPath in aInputs)
+
+def LoadManifest(sLibrary):
+    try:
+        with open(os.path.join(sLibrary, k_sManifestName), "r", encoding="utf-8") as fHandle:
+            dManifest = json.load(fHandle)
+        if dManifest.get("version") == k_iManifestVersion:
+            return dManifest
+    except (OSError, ValueError):
+        pass
+    return {"version": k_iManifestVersion, "entries": {}}
+
+#writes a file next to its destination and renames it over it, so readers never see a partly written file
+def WriteAtomic(sPath, pData):
+    iHandle, sTempPath = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(sPath))
+    try:
+        with os.fdopen(iHandle, "wb") as fHandle:
+            fHandle.write(pData)
+        os.replace(sTempPath, sPath)
+    except BaseException:
+        os.remove(sTempPath)
+        raise
+
+def SaveManifest(sLibrary, dManifest):
+    WriteAtomic(os.path.join(sLibrary, k_sManifestName), json.dumps(dManifest, indent=1, sort_keys=True).encode('utf-8'))
+
+'''
+    Works out which library entries are out of date
+    sSource - the directory of models
+    sLibrary - the library directory
+    dManifest - the manifest of the last build
+    dOptions - the import options
+    sAssetDirectory - the asset directory for importDirectory 'Asset'
+    returns - (array of (key, entry) to build, number of entries up to date, keys of entries whose model is gone)
+'''
+def PlanBuild(sSource, sLibrary, dManifest, dOptions, sAssetDirectory):
+    sVersion = ImporterVersion()
+    sOptions = OptionsHash(dOptions)
+    dEntries = dManifest["entries"]
+    aJobs = []
+    aFound = set()
+    iUpToDate = 0
+    for sDirectory, aDirectories, aFiles in os.walk(sSource):
+        aDirectories.sort()
+        for sFile in sorted(aFiles):
+            if not sFile.lower().endswith(".rgm"):
+                continue
+            sModelPath = os.path.join(sDirectory, sFile)
+            #entries are keyed by the model path relative to the source, with forward slashes
+            sKey = os.path.relpath(sModelPath, sSource).replace('\\', '/')
+            aFound.add(sKey)
+            dOld = dEntries.get(sKey, {})
+            dKnown = dOld.get("inputs", {})
+            dInputs = {sPath: InputState(sPath, dKnown) for sPath in ModelInputs(sModelPath, dOptions, sAssetDirectory)}
+            dEntry = {
+                "model": sModelPath,
+                "output": os.path.splitext(sKey)[0] + ".blend",
+                "importer": sVersion,
+                "options": sOptions,
+                "inputs": dInputs,
+            }
+            bCurrent = dOld.get("importer") == sVersion and dOld.get("options") == sOptions \
+                and {sPath: dState["hash"] for sPath, dState in dKnown.items()} == {sPath: dState["hash"] for sPath, dState in dInputs.items()} \
+                and os.path.isfile(os.path.join(sLibrary, dEntry["output"]))
+            if bCurrent:
+                #keeps the refreshed modification times, so the files are not hashed again
+                dEntries[sKey] = dEntry
+                iUpToDate += 1
+            else:
+                aJobs.append((sKey, dEntry))
+    return aJobs, iUpToDate, [sKey for sKey in dEntries if sKey not in aFound]
+
+'''
+    Runs background Blender processes that build library entries, see BuildEntries
+    aJobs - array of (key, entry) from PlanBuild
+    sLibrary - the library directory
+    dOptions - the import options
+    sAssetDirectory - the asset directory for importDirectory 'Asset'
+    sBlender - the Blender executable
+    iWorkers - number of Blender processes
+    fnFinished - called with (key, entry, error) for every job, error is None if the entry was built
+'''
+def RunWorkers(aJobs, sLibrary, dOptions, sAssetDirectory, sBlender, iWorkers, fnFinished):
+    #the largest models go first and every process takes the next one, so the processes finish at about the same time
+    aJobs = sorted(aJobs, key=lambda oJob: -os.path.getsize(oJob[1]["model"]))
+    aBatches = [aJobs[i::iWorkers] for i in range(iWorkers) if aJobs[i::iWorkers]]
+    dEnvironment = dict(os.environ)
+    #the workers import this package from where it is now, it does not have to be installed
+    sPackageRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dEnvironment["PYTHONPATH"] = os.pathsep.join(filter(None, (sPackageRoot, dEnvironment.get("PYTHONPATH"))))
+    sPackage = __package__
+    with tempfile.TemporaryDirectory() as sTempDirectory:
+        aProcesses = []
+        for i, aBatch in enumerate(aBatches):
+            sJobsPath = os.path.join(sTempDirectory, f"jobs{i}.json")
+            sResultsPath = os.path.join(sTempDirectory, f"results{i}.jsonl")
+            with open(sJobsPath, "w", encoding="utf-8") as fHandle:
+                json.dump({"library": sLibrary, "options": dOptions, "assetDirectory": sAssetDirectory,
+                    "jobs": [{"key": sKey, "model": dEntry["model"], "output": dEntry["output"]} for sKey, dEntry in aBatch]}, fHandle)
+            aCommand = [sBlender, "--background", "--factory-startup", "--python-expr",
+                f"from {sPackage} import library; library.main()", "--", "worker", sJobsPath, sResultsPath]
+            aProcesses.append((subprocess.Popen(aCommand, env=dEnvironment, stdout=subprocess.DEVNULL), aBatch, sResultsPath))
+        for oProcess, aBatch, sResultsPath in aProcesses:
+            iReturnCode = oProcess.wait()
+            dResults = {}
+            if os.path.isfile(sResultsPath):
+                with open(sResultsPath, "r", encoding="utf-8") as fHandle:
+                    for sLine in fHandle:
+                        dResult = json.loads(sLine)
+                        dResults[dResult["key"]] = dResult["error"]
+            for sKey, dEntry in aBatch:
+                fnFinished(sKey, dEntry, dResults.get(sKey, f"worker exited with code {iReturnCode} before building it"))
+
+'''
+    Brings a library up to date with its source directory, only entries whose inputs, importer version or options changed are built
+    sSource - the directory of models
+    sLibrary - the library directory, created if missing
+    dOptions - import options, see daemon.k_dDefaultOptions
+    sBlender - the Blender executable
+    iWorkers - number of Blender processes, 0 uses one per CPU
+    sAssetDirectory - the asset directory for importDirectory 'Asset', the source directory if empty
+    returns - (number built, number failed, number up to date, number removed)
+'''
+def BuildLibrary(sSource, sLibrary, dOptions=None, sBlender="blender", iWorkers=0, sAssetDirectory=""):
+    sSource = os.path.abspath(sSource)
+    sLibrary = os.path.abspath(sLibrary)
+    sAssetDirectory = os.path.abspath(sAssetDirectory or sSource)
+    dOptions = dict(k_dDefaultOptions, **(dOptions or {}))
+    os.makedirs(sLibrary, exist_ok=True)
+    dManifest = LoadManifest(sLibrary)
+    aJobs, iUpToDate, aRemoved = PlanBuild(sSource, sLibrary, dManifest, dOptions, sAssetDirectory)
+
+    for sKey in aRemoved:
+        sOutput = os.path.join(sLibrary, dManifest["entries"].pop(sKey)["output"])
+        if os.path.isfile(sOutput):
+            os.remove(sOutput)
+    SaveManifest(sLibrary, dManifest)
+
+    aCounts = [0, 0]
+    def Finished(sKey, dEntry, sError):
+        if sError is None:
+            dManifest["entries"][sKey] = dEntry
+            aCounts[0] += 1
+        else:
+            print("Unable to build " + sKey + ": " + sError)
+            aCounts[1] += 1
+    if aJobs:
+        print(f"Building {len(aJobs)} of {len(aJobs) + iUpToDate} library entries")
+        RunWorkers(aJobs, sLibrary, dOptions, sAssetDirectory, sBlender, iWorkers if iWorkers > 0 else (os.cpu_count() or 1), Finished)
+        SaveManifest(sLibrary, dManifest)
+    return aCounts[0], aCounts[1], iUpToDate, len(aRemoved)
+
+'''
+    Imports a model into an empty scene, marks it as asset and saves it, Blender only
+    sModelPath - the .rgm file
+    sOutputPath - the .blend file, replaced once it is completely written
+    dOptions - the import options
+    sAssetDirectory - the asset directory for importDirectory 'Asset'
+    sKey - the model path in the source directory, stored as the asset description
+'''
+def BuildEntry(sModelPath, sOutputPath, dOptions, sAssetDirectory, sKey):
+    import bpy
+    from .daemon import ImporterFromOptions
+    from .scene import ImportRgmJob
+    bpy.ops.wm.read_homefile(use_empty=True)
+    importer = ImporterFromOptions(sModelPath, dOptions)
+    importer.sAssetDirectory = sAssetDirectory
+    importer.modelCollection = True
+    oImport = ImportRgmJob([importer], 1)
+    oImport.start()
+    sState = oImport.update(float('inf'), bBlocking=True)
+    if oImport.error is not None:
+        raise RuntimeError(oImport.error)
+    if sState != 'FINISHED' or oImport.aFailed:
+        raise RuntimeError("Unable to load " + sModelPath)
+
+    aAssets = [importer.rootCollection] if importer.rootCollection is not None else list(bpy.data.objects)
+    for oAsset in aAssets:
+        oAsset.asset_mark()
+        oAsset.asset_data.description = sKey
+        oAsset.asset_data.tags.new(os.path.dirname(sKey).rsplit('/', 1)[-1] or "rgm")
+
+    os.makedirs(os.path.dirname(sOutputPath), exist_ok=True)
+    sTempPath = os.path.join(os.path.dirname(sOutputPath), ".building_" + os.path.basename(sOutputPath))
+    try:
+        bpy.ops.wm.save_as_mainfile(filepath=sTempPath, copy=True, compress=True)
+        os.replace(sTempPath, sOutputPath)
+    finally:
+        if os.path.isfile(sTempPath):
+            os.remove(sTempPath)
+
+'''
+    Builds the jobs of one worker process, Blender only. Writes one JSON line per job to the results file as it goes.
+    sJobsPath - the jobs file RunWorkers wrote
+    sResultsPath - the results file
+'''
+def BuildEntries(sJobsPath, sResultsPath):
+    with open(sJobsPath, "r", encoding="utf-8") as fHandle:
+        dJobs = json.load(fHandle)
+    with open(sResultsPath, "a", encoding="utf-8") as fResults:
+        for dJob in dJobs["jobs"]:
+            fStart = time.perf_counter()
+            try:
+                BuildEntry(dJob["model"], os.path.join(dJobs["library"], dJob["output"]), dJobs["options"], dJobs["assetDirectory"], dJob["key"])
+                sError = None
+            except Exception as error:
+                sError = str(error) or type(error).__name__
+            print(f"{dJob['key']}: {'built' if sError is None else sError} in {time.perf_counter() - fStart:.2f}s", file=sys.stderr)
+            fResults.write(json.dumps({"key": dJob["key"], "error": sError}) + "\n")
+            fResults.flush()
+
+def main(aArgs=None):
+    if aArgs is None:
+        #inside Blender the arguments of the script follow "--"
+        aArgs = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if aArgs[:1] == ["worker"]:
+        BuildEntries(aArgs[1], aArgs[2])
+        return
+    oParser = argparse.ArgumentParser(description="Builds a Blender asset library from a directory of .rgm models, only changed models are imported again")
+    oParser.add_argument("source", help="directory of models")
+    oParser.add_argument("library", help="directory of the library .blend files")
+    oParser.add_argument("--blender", default="blender", help="the Blender executable")
+    oParser.add_argument("--workers", type=int, default=0, help="number of Blender processes, 0 uses one per CPU")
+    oParser.add_argument("--asset-directory", default="", help="asset directory textures are looked up in with importDirectory=\"Asset\", the source by default")
+    oParser.add_argument("--option", action="append", default=[], help="import option as key=value, eg. importTextures=true")
+    oArgs = oParser.parse_args(aArgs)
+
+    dOptions = dict(ParseOption(sOption) for sOption in oArgs.option)
+    aUnknown = [sKey for sKey in dOptions if sKey not in k_dDefaultOptions]
+    if aUnknown:
+        oParser.error("unknown options: " + ", ".join(aUnknown))
+    fStart = time.perf_counter()
+    iBuilt, iFailed, iUpToDate, iRemoved = BuildLibrary(oArgs.source, oArgs.library, dOptions, oArgs.blender, oArgs.workers, oArgs.asset_directory)
+    print(f"{iBuilt} built, {iFailed} failed, {iUpToDate} up to date, {iRemoved} removed in {time.perf_counter() - fStart:.1f}s")
+    if iFailed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
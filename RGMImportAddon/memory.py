@@ -0,0 +1,126 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Memory accounting of the import stages with tracemalloc, fed by the spans of a Tracer.
+# Plain Python, does not need Blender.
+
+import json
+import threading
+import tracemalloc
+
+'''
+    Records the Python memory of every import stage: the peak allocated above what was allocated when the stage began,
+    and what the stage left allocated when it ended. Nested stages count towards their parents too.
+    Stages running on several threads at once see each other's allocations, so the importer runs them one after another
+    while it measures. Sizes of the Blender datablocks an import created are added with addDatablock.
+'''
+class MemoryAccount:
+    def __init__(self):
+        self.dStages = {} #stage name: [calls, peak bytes, retained bytes]
+        self.aDatablocks = [] #(kind, name, bytes)
+        self.iPeak = 0 #highest traced memory seen
+        self.bStarted = False #tracemalloc was started by this account
+        self.oLock = threading.Lock()
+        self.oLocal = threading.local()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.bStarted = True
+
+    def stop(self):
+        if self.bStarted:
+            tracemalloc.stop()
+            self.bStarted = False
+
+    # Called by Span.__enter__, every thread keeps its own stack of open stages
+    def enter(self, sName):
+        self.start()
+        aStack = self.oLocal.__dict__.setdefault("aStack", [])
+        iCurrent, iPeak = tracemalloc.get_traced_memory()
+        if aStack:
+            #the parent's peak so far, before the peak is reset for this stage
+            aStack[-1][2] = max(aStack[-1][2], iPeak)
+        tracemalloc.reset_peak()
+        aStack.append([sName, iCurrent, iCurrent])
+
+    # Called by Span.__exit__
+    def exit(self):
+        aStack = self.oLocal.__dict__.get("aStack")
+        if not aStack or not tracemalloc.is_tracing():
+            return
+        sName, iStart, iPeak = aStack.pop()
+        iCurrent, iTracedPeak = tracemalloc.get_traced_memory()
+        iPeak = max(iPeak, iTracedPeak)
+        if aStack:
+            aStack[-1][2] = max(aStack[-1][2], iPeak)
+        tracemalloc.reset_peak()
+        with self.oLock:
+            oStage = self.dStages.setdefault(sName, [0, 0, 0])
+            oStage[0] += 1
+            oStage[1] = max(oStage[1], iPeak - iStart)
+            oStage[2] += iCurrent - iStart
+            self.iPeak = max(self.iPeak, iPeak)
+
+    '''
+        Adds the size of a Blender datablock
+        sKind - eg. "mesh" or "image"
+        sName - name of the datablock
+        iBytes - its size in bytes
+    '''
+    def addDatablock(self, sKind, sName, iBytes):
+        with self.oLock:
+            self.aDatablocks.append((sKind, sName, iBytes))
+
+    '''
+        Formats the stages and datablocks as text tables
+        returns - the tables as a string
+    '''
+    def summary(self):
+        aLines = [f"{'stage':<20} {'calls':>7} {'peak MB':>10} {'retained MB':>12}"]
+        for sName, (iCalls, iPeak, iRetained) in self.dStages.items():
+            aLines.append(f"{sName:<20} {iCalls:>7} {iPeak / 1048576:>10.2f} {iRetained / 1048576:>12.2f}")
+        aLines.append(f"{'traced peak':<20} {'':>7} {self.iPeak / 1048576:>10.2f}")
+        dKinds = {}
+        for sKind, sName, iBytes in self.aDatablocks:
+            oKind = dKinds.setdefault(sKind, [0, 0, "", 0])
+            oKind[0] += 1
+            oKind[1] += iBytes
+            if iBytes >= oKind[3]:
+                oKind[2], oKind[3] = sName, iBytes
+        if dKinds:
+            aLines.append("")
+            aLines.append(f"{'datablocks':<20} {'count':>7} {'total MB':>10}  largest")
+            for sKind, (iCount, iBytes, sLargest, iLargest) in dKinds.items():
+                aLines.append(f"{sKind:<20} {iCount:>7} {iBytes / 1048576:>10.2f}  {sLargest} ({iLargest / 1048576:.2f} MB)")
+        return "\n".join(aLines)
+
+    '''
+        Returns the measurements as plain values, for JSON
+        returns - dict with "stages", "traced_peak" and "datablocks", sizes in bytes
+    '''
+    def report(self):
+        with self.oLock:
+            return {
+                "stages": [{"stage": sName, "calls": iCalls, "peak": iPeak, "retained": iRetained} for sName, (iCalls, iPeak, iRetained) in self.dStages.items()],
+                "traced_peak": self.iPeak,
+                "datablocks": [{"kind": sKind, "name": sName, "bytes": iBytes} for sKind, sName, iBytes in self.aDatablocks],
+            }
+
+    '''
+        Writes the measurements as JSON
+        sPath - the .json file to write
+    '''
+    def exportJson(self, sPath):
+        with open(sPath, "w") as fHandle:
+            json.dump(self.report(), fHandle, indent=1)
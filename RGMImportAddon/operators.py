@@ -0,0 +1,342 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Blender operator and menu entry. The importer itself (scene.py and the format
+# modules) is only imported once an import runs, which keeps add-on registration cheap.
+
+import bpy
+from bpy.types import Operator, AddonPreferences
+from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty, FloatProperty, CollectionProperty
+from bpy_extras.io_utils import ImportHelper
+import os
+from pathlib import Path
+
+#applies the decompression preference, see codec.py
+def UpdateDecompression(self, context):
+    from .codec import SetCodec
+    SetCodec(self.decompression)
+
+class ImportRgmPreferences(AddonPreferences):
+    bl_idname = __package__
+    
+    path_to_rgm_folder : StringProperty( # type: ignore
+        name = "Path to rgm Folder",
+        description = "Path where there rgm file is",
+        subtype='FILE_PATH',
+        default = "",
+    )
+
+    decompression : EnumProperty( # type: ignore
+        items = [('AUTO', "Fastest installed", "zlib-ng or ISA-L if installed, zlib otherwise"), ('ZLIB_NG', "zlib-ng", "Needs the zlib-ng Python package"),
+            ('ISAL', "ISA-L", "Needs the isal Python package"), ('ZLIB', "zlib", "Python's zlib, always available")],
+        name = "Texture Decompression",
+        description = "Library that decompresses .rgt texture mip levels",
+        default = 'AUTO',
+        update = UpdateDecompression,
+    )
+    
+    def draw(self, context):
+        from .codec import AvailableCodecs
+        layout = self.layout
+        layout.label(text="Preferences:")
+        layout.prop(self, "path_to_rgm_folder")
+        layout.prop(self, "decompression")
+        layout.label(text="Installed: " + ", ".join(AvailableCodecs()))
+
+    @classmethod
+    def get_path_to_rgm_folder(cls):
+        return Path(bpy.context.preferences.addons[__package__].preferences.path_to_rgm_folder)
+
+
+class ImportRgmAddon(Operator, ImportHelper):
+    """Import Rgm Importer"""
+    bl_idname = "import.rgm_importer"
+    bl_label = "Relic (.rgm)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filename_ext = '.rgm'
+
+    filter_glob: StringProperty(
+        default = "*.rgm",
+        options = {'HIDDEN'},
+        maxlen = 255,
+    )
+    
+    resetScene: BoolProperty(
+        name = "Reset Scene",
+        description = "Remove everything earlier .rgm imports added to the file before importing, other data is kept",
+        default = False,
+    )
+    
+    filepath: StringProperty(
+        name = "Import Model", 
+        description = "File path of .rgm model file", 
+        maxlen = 1024)
+
+    files: CollectionProperty(
+        type = bpy.types.OperatorFileListElement,
+        options = {'HIDDEN', 'SKIP_SAVE'},
+    )
+
+    directory: StringProperty(
+        subtype = 'DIR_PATH',
+        options = {'HIDDEN', 'SKIP_SAVE'},
+    )
+    
+    importMeshes: BoolProperty(
+        name = "Import Meshes",
+        description = "Import meshes from .rgm model files",
+        default = True,
+    )
+
+    importCategories: EnumProperty(
+        items = [('Normal', "Normal", "Intact objects"), ('Crushed', "Crushed", "Objects named *crush*"), ('Wrecked', "Wrecked", "Objects named *wreck*"), ('Tread', "Tread", "Objects named *critical_tread*")],
+        name = "Object Categories",
+        description = "Damage states to import, objects of the other ones are not decoded",
+        options = {'ENUM_FLAG'},
+        default = {'Normal', 'Crushed', 'Wrecked', 'Tread'},
+    )
+
+    objectFilter: StringProperty(
+        name = "Object Filter",
+        description = "Comma separated object names or wildcard patterns (eg. wheel*, hull), only matching objects are imported, empty imports all",
+        default = "",
+    )
+
+    vertexComponents: EnumProperty(
+        items = [('UVS', "UV 2/3", "Secondary UV channels"), ('COLOURS', "Colours", "Diffuse and specular vertex colours"), ('TANGENTS', "Tangents", "Tangents and binormals, needs Import Normals")],
+        name = "Vertex Data",
+        description = "Optional vertex components to import, the others are skipped when decoding",
+        options = {'ENUM_FLAG'},
+        default = {'UVS', 'COLOURS', 'TANGENTS'},
+    )
+
+    importNormals: BoolProperty(
+        name = "Import Normals",
+        description = "Use the normals stored in the model as custom split normals",
+        default = True,
+    )
+
+    weldVertices: BoolProperty(
+        name = "Weld Vertices",
+        description = "Merge coincident vertices of imported meshes, UV seams are kept",
+        default = False,
+    )
+
+    weldThreshold: FloatProperty(
+        name = "Weld Distance",
+        description = "Maximum distance between vertices that get merged",
+        default = 0.00001,
+        min = 0.000001,
+        precision = 6,
+    )
+
+    shareMeshes: BoolProperty(
+        name = "Share Identical Meshes",
+        description = "Objects with identical geometry in the imported models use one mesh datablock as linked duplicates",
+        default = True,
+    )
+
+    updateExisting: BoolProperty(
+        name = "Update Existing Import",
+        description = "If the model was imported before, rebuild only the meshes, materials and skeletons whose chunks changed, in place",
+        default = True,
+    )
+
+    importBones: BoolProperty(
+        name = "Import Bones",
+        description = "Import bones from .rgm model files",
+        default = False,
+    )
+
+    mirrorAxis: BoolProperty(
+        name = "Mirror Axis",
+        description = "Mirror the axis when importing  bones",
+        default = False,
+    )
+
+
+    importDatamarks: BoolProperty(
+        name = "Import Datamarks",
+        description = "Import datamarks from .rgm model files",
+        default = False,
+    )
+        
+    importTextures: BoolProperty(
+        name = "Import Textures",
+        description = "Import textures from .rgt/.dds texture files",
+        default = False,
+    )
+    
+    bakeMaps: BoolProperty(
+        name = "Bake Material Maps",
+        description = "Split the normal maps once into a normal, a specular and a roughness map (PNG files next to them), so materials use them directly instead of separating the channels while shading",
+        default = False,
+    )
+
+    importAnimations: BoolProperty(
+        name = "Import Animations",
+        description = "Import animations from .rga animation file",
+        default = False,
+    )
+        
+    importDirectory : EnumProperty(
+        items = [('Asset', "asset directory", "Import files from asset directory"), ('Work', "working directory", "Import files from working directory")],
+        name = "Import from", 
+        description = "Import directory of asset files",
+        default = 'Work',
+    )
+
+    parallelWorkers: IntProperty(
+        name = "Decoding Threads",
+        description = "Number of models decoded at the same time, 0 uses one thread per CPU, at most one per model",
+        default = 0,
+        min = 0,
+    )
+
+    streamBudget: IntProperty(
+        name = "Decode Budget (MB)",
+        description = "Decode vertex buffers in windows that fit this much memory and map the model file instead of reading it, for models that don't fit in memory. 0 decodes whole buffers at once",
+        default = 0,
+        min = 0,
+    )
+
+    backgroundImport: BoolProperty(
+        name = "Import in Background",
+        description = "Decode the model on a worker thread and keep the interface responsive, Esc cancels the import",
+        default = True,
+    )
+
+    progressiveImport: BoolProperty(
+        name = "Progressive",
+        description = "Show bounding box proxies of all objects as soon as the model is decoded and swap the meshes in while they build, with Import in Background",
+        default = False,
+    )
+
+    buildBudget: IntProperty(
+        name = "Build Time per Update (ms)",
+        description = "Time spent building datablocks between interface updates of a background import",
+        default = 40,
+        min = 5,
+        max = 1000,
+    )
+
+    profileMode: EnumProperty(
+        items = [('OFF', "Off", "No profiling"), ('CPROFILE', "cProfile", "Profile every function call"),
+            ('SAMPLING', "Sampling", "Sample the call stack with pyinstrument if it is installed, cProfile otherwise")],
+        name = "Profile",
+        description = "Import in the foreground under a profiler, write the hot functions to a text datablock and the profile next to the model",
+        default = 'OFF',
+    )
+
+    memoryReport: BoolProperty(
+        name = "Memory Report",
+        description = "Measure the Python memory of every import stage and the size of the meshes and images built, and write them to _memory.json next to the model. Stages run one after another and slower while measuring",
+        default = False,
+    )
+
+    debugOutput: BoolProperty(
+        name = "Debug Output",
+        description = "Print the import log and per stage timings, and write a timing trace (_trace.json) next to the model",
+        default = False,
+    )
+
+    def execute(self, context):   
+        #preferences = context.preferences
+        #addon_prefs = preferences.addons[__package__].preferences
+        from .scene import ImportRgm, ImportRgmJob
+        aPaths = [os.path.join(self.directory, oFile.name) for oFile in self.files if oFile.name]
+        if not aPaths:
+            aPaths = [self.filepath]
+        aImporters = []
+        for sPath in aPaths:
+            importer = ImportRgm()
+            importer.setData(self.resetScene, sPath, self.importTextures, self.importAnimations, self.importDirectory, self.importMeshes, self.importBones, self.importDatamarks, self.mirrorAxis, self.weldVertices, self.weldThreshold, self.importNormals, self.debugOutput, self.shareMeshes, self.updateExisting, self.importCategories, self.objectFilter, self.vertexComponents, self.streamBudget, self.profileMode, self.progressiveImport, self.memoryReport, self.bakeMaps)
+            importer.modelCollection = len(aPaths) > 1
+            aImporters.append(importer)
+
+        if self.profileMode != 'OFF':
+            #profiled imports finish before execute returns, the profile holds their decoding thread too
+            for importer in aImporters[1:]:
+                importer.resetScene = False
+            aStates = set()
+            for importer in aImporters:
+                oText, self._job, sState = importer.profileRgm()
+                self.report({'INFO'}, "Profile written to the text " + oText.name)
+                aStates |= self.finish(context, sState)
+            return {'FINISHED'} if 'FINISHED' in aStates else {'CANCELLED'}
+
+        self._job = ImportRgmJob(aImporters, self.parallelWorkers)
+        self._job.start()
+        if not self.backgroundImport or bpy.app.background:
+            return self.finish(context, self._job.update(float('inf'), bBlocking=True))
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.05, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            #the key is handled here, the next timer event rolls the import back and ends the operator
+            self._job.cancel()
+            return {'RUNNING_MODAL'}
+        elif event.type == 'TIMER':
+            sState = self._job.update(self.buildBudget / 1000)
+            if self.progressiveImport:
+                for area in context.screen.areas:
+                    if area.type == 'VIEW_3D':
+                        area.tag_redraw()
+            iPercent = int(self._job.progress() * 100)
+            context.window_manager.progress_update(iPercent)
+            context.workspace.status_text_set(f"{self._job.statusText()}: {iPercent}% (Esc to cancel)")
+            if sState != 'RUNNING':
+                wm = context.window_manager
+                wm.event_timer_remove(self._timer)
+                wm.progress_end()
+                context.workspace.status_text_set(None)
+                return self.finish(context, sState)
+        return {'PASS_THROUGH'}
+
+    def finish(self, context, sState):
+        if self._job.error is not None:
+            self.report({'ERROR'}, "Rgm import failed: " + self._job.error)
+        elif sState == 'CANCELLED':
+            self.report({'WARNING'}, "Rgm import cancelled")
+        elif self._job.aFailed:
+            self.report({'WARNING'}, "Unable to load " + ", ".join(self._job.aFailed))
+        for sWarning in self._job.warnings():
+            self.report({'WARNING'}, sWarning)
+        return {sState}
+    
+    def invoke(self, context, event):
+        self.filepath = "C:/Users/Carsten/Desktop/coh/CoH2/data/art/armies/german/vehicles/ostwind_flak_panzer"#"C:/Users/Carsten/Desktop/coh/antitank_75mm_pak40/" #hier from preference
+        wm = context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+def menu_func_import(self, context):
+    self.layout.operator(ImportRgmAddon.bl_idname, text=ImportRgmAddon.bl_label)
+
+def register():
+    bpy.utils.register_class(ImportRgmAddon)
+    bpy.utils.register_class(ImportRgmPreferences)
+    bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    oPreferences = bpy.context.preferences.addons.get(__package__)
+    if oPreferences is not None:
+        UpdateDecompression(oPreferences.preferences, bpy.context)
+
+def unregister():
+    bpy.utils.unregister_class(ImportRgmAddon)
+    bpy.utils.unregister_class(ImportRgmPreferences)
+    bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
@@ -0,0 +1,112 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Function level profiling of an import, with cProfile or the pyinstrument sampling profiler if it is installed.
+# Plain Python, does not need Blender.
+
+import cProfile
+import io
+import pstats
+
+'''
+    Profiles a call, and calls on other threads it runs through threadProfiler
+    sMode - 'CPROFILE' for cProfile, 'SAMPLING' for pyinstrument, which falls back to cProfile if it is not installed
+'''
+class Profiler:
+    def __init__(self, sMode='CPROFILE'):
+        self.sMode = sMode
+        self.oProfile = None
+        self.bRan = False
+        self.aThreadProfilers = [] #see threadProfiler
+        if sMode == 'SAMPLING':
+            try:
+                import pyinstrument
+                self.oProfile = pyinstrument.Profiler()
+            except ImportError:
+                print("pyinstrument is not installed, profiling with cProfile")
+                self.sMode = 'CPROFILE'
+        if self.sMode == 'CPROFILE':
+            self.oProfile = cProfile.Profile()
+
+    '''
+        Calls a function with the profiler running, only the calling thread is profiled
+        fnCall - the function
+        returns - what the function returns
+    '''
+    def run(self, fnCall, *args, **kwargs):
+        self.bRan = True
+        if self.sMode == 'SAMPLING':
+            self.oProfile.start()
+            try:
+                return fnCall(*args, **kwargs)
+            finally:
+                self.oProfile.stop()
+        return self.oProfile.runcall(fnCall, *args, **kwargs)
+
+    '''
+        Gives a profiler of the same kind for a call on another thread, both profilers only see their own thread.
+        What it records is added to the report and the saved profile of this one.
+        returns - the new Profiler
+    '''
+    def threadProfiler(self):
+        oProfiler = Profiler(self.sMode)
+        self.aThreadProfilers.append(oProfiler)
+        return oProfiler
+
+    # The pyinstrument sessions of this profiler and its thread profilers as one
+    def session(self):
+        from pyinstrument.session import Session
+        oSession = self.oProfile.last_session
+        for oProfiler in self.aThreadProfilers:
+            if oProfiler.bRan and oProfiler.oProfile.last_session is not None:
+                oSession = Session.combine(oSession, oProfiler.oProfile.last_session)
+        return oSession
+
+    '''
+        Formats the hot functions
+        iTop - number of functions listed, by cProfile once by own time and once by cumulative time
+        returns - the report as text
+    '''
+    def report(self, iTop=30):
+        if self.sMode == 'SAMPLING':
+            from pyinstrument.renderers import ConsoleRenderer
+            return ConsoleRenderer(unicode=True, color=False).render(self.session())
+        oStream = io.StringIO()
+        oStats = pstats.Stats(self.oProfile, stream=oStream)
+        for oProfiler in self.aThreadProfilers:
+            if oProfiler.bRan:
+                oStats.add(oProfiler.oProfile)
+        oStats.strip_dirs()
+        for sSort, sTitle in (('tottime', "own time"), ('cumulative', "cumulative time")):
+            oStream.write(f"Top {iTop} functions by {sTitle}\n")
+            oStats.sort_stats(sSort).print_stats(iTop)
+        return oStream.getvalue()
+
+    '''
+        Saves the profile, a cProfile .prof file can be opened with pstats, snakeviz or similar tools,
+        a pyinstrument .pyisession with "pyinstrument --load"
+        sBasePath - path without extension
+        returns - the path of the written file
+    '''
+    def save(self, sBasePath):
+        if self.sMode == 'SAMPLING':
+            sPath = sBasePath + ".pyisession"
+            self.session().save(sPath)
+        else:
+            sPath = sBasePath + ".prof"
+            oStats = pstats.Stats(self.oProfile)
+            for oProfiler in self.aThreadProfilers:
+                if oProfiler.bRan:
+                    oStats.add(oProfiler.oProfile)
+            oStats.dump_stats(sPath)
+        return sPath
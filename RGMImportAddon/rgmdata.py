@@ -0,0 +1,1268 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Decoding of .rgm model data into plain Python values and numpy arrays.
+# Does not need Blender, the scene is built from these results by scene.py.
+
+import struct
+import os
+import hashlib
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from .chunky import ReadChunkData, importRgt, DecodeEmbeddedDxtc
+from .schema import k_oCount, k_oString, k_oBone, k_oMarker, k_oMarkerParam, k_oMaterialVar, k_oSkinBone
+from .trace import DebugPrint
+
+k_texcoordScale = 1.0 / 32.0
+
+def round(argValue):
+    return int(argValue)
+
+class Point2d:
+    def __init__(self, u=0.0, v=0.0):
+        self.u = u
+        self.v = v
+
+class Point3d:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        
+class Point3:
+    def __init__(self, p1=0, p2=0, p3=0):
+        self.p1 = p1
+        self.p2 = p2
+        self.p3 = p3
+
+class Float4:
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+class Colour:
+    def __init__(self, r=0, g=0, b=0, a=0):
+        self.r = r
+        self.g = g
+        self.b = b
+        self.a = a
+
+def clamp(coord, lower, upper):
+    if coord.x < lower:
+        coord.x = lower
+    if coord.x > upper:
+        coord.x = upper
+    if coord.y < lower:
+        coord.y = lower
+    if coord.y > upper:
+        coord.y = upper
+    return coord
+
+class Float2:
+    def __init__(self, x=0.0, y=0.0):
+        self.x = x
+        self.y = y
+
+'''
+    Turns a colour value into a compressed float4
+    Colour: The colour to convert
+    Returns: The float4 from the colour
+'''
+def ConvertColourtoCompf4(colour):
+    compCoord = Float4()
+    compCoord.x = colour.b / 255.0
+    compCoord.y = 1.0 - (colour.g / 255.0)  # invert the y coord
+    compCoord.z = colour.r / 255.0
+    compCoord.w = colour.a / 255.0
+    return compCoord
+
+'''
+    Decompresses a UV coord
+    Coord: The float4 to decompress
+    Returns: A decompressed float2
+'''
+def DecompressTVertFloat(coord):
+    decompCoord = Float2()
+    coord.w = 1.0 - coord.w
+    decompCoord.x = (coord.x + (coord.z * k_texcoordScale))
+    decompCoord.y = (coord.y + (coord.w * k_texcoordScale))
+    return decompCoord
+
+def BytesToWeights(bytes):
+    weights = [0.0] * 4
+    weights[0] = (bytes[2] / 255.0 * 1000 - 0.5) / 1000
+    weights[1] = (bytes[1] / 255.0 * 1000 - 0.5) / 1000
+    weights[2] = (bytes[0] / 255.0 * 1000 - 0.5) / 1000
+    weights[3] = (bytes[3] / 255.0 * 1000 - 0.5) / 1000
+    total = sum(weights)
+    delta = total - 1.0
+    weights[0] -= delta
+    return weights
+
+'''
+    Builds the numpy record layout of one vertex from the per-vertex component list
+    aComponentVector - array of sPerVertStruct as read from the DATADATA chunk
+    iVertexSize - number of bytes taken up by each vertex on disk, None for the components without padding
+    aNeeded - names of the fields to decode, other components are skipped over, None for all of them
+    tracer - the Tracer warned about skipped components, see Tracer.warn
+    returns - a structured dtype covering one vertex, raises ValueError if an unknown component is followed by others
+              or the components do not fit into iVertexSize
+'''
+def VertexComponentDtype(aComponentVector, iVertexSize, aNeeded=None, tracer=None):
+    aNames = []
+    aFormats = []
+    aOffsets = []
+    iOffset = 0
+    for iComponent, oComponent in enumerate(aComponentVector):
+        match oComponent.iVertComponent:
+            case 0:  #Position
+                sName, sFormat = "position", ('<f4', 3)
+            case 1: #Bone Index
+                sName, sFormat = "boneIndices", ('u1', 4)
+            case 2: #Bone Weight
+                sName, sFormat = "boneWeights", ('u1', 4)
+            case 3: #Normal
+                sName, sFormat = "normal", ('u1', 4) if oComponent.iDataType == 2 else ('<f4', 3)
+            case 4: #BiNormal
+                sName, sFormat = "binormal", ('u1', 4)
+            case 5: #Tangent
+                sName, sFormat = "tangent", ('u1', 4)
+            case 6: #Diffuse Vertex Color
+                sName, sFormat = "diffuseColour", ('u1', 4)
+            case 7: #Specular Vertex Color
+                sName, sFormat = "specularColour", ('u1', 4)
+            case 8 | 9 | 10: #UV Channel 1 - 3
+                sName = "uv" + str(oComponent.iVertComponent - 7)
+                sFormat = ('u1', 4) if oComponent.iDataType == 2 else ('<f4', 2)
+            case _:
+                #its size is unknown, the vertex size only covers it while no other component follows
+                if iComponent != len(aComponentVector) - 1:
+                    raise ValueError("Unknown vertex component " + str(oComponent.iVertComponent) + ", the components after it cannot be located")
+                if tracer is not None:
+                    tracer.warn("Unknown vertex component " + str(oComponent.iVertComponent) + " skipped")
+                continue
+        if aNeeded is not None and sName not in aNeeded:
+            #left out of the record, numpy strides over its bytes
+            iOffset += np.dtype(sFormat).itemsize
+            continue
+        aNames.append(sName)
+        aFormats.append(sFormat)
+        aOffsets.append(iOffset)
+        iOffset += np.dtype(sFormat).itemsize
+    if iVertexSize is None:
+        iVertexSize = iOffset
+    elif iOffset > iVertexSize:
+        raise ValueError("Vertex components take " + str(iOffset) + " bytes, more than the vertex size of " + str(iVertexSize))
+    return np.dtype({'names': aNames, 'formats': aFormats, 'offsets': aOffsets, 'itemsize': iVertexSize})
+
+'''
+    Decodes a whole UV channel of the vertex buffer
+    aPacked - the UV field of the vertex records, either (n, 4) compressed bytes or (n, 2) floats
+    returns - (n, 2) float32 array of UV coordinates
+'''
+def DecodeUVArray(aPacked):
+    if aPacked.dtype == np.uint8:
+        #vectorized ConvertColourtoCompf4 followed by DecompressTVertFloat
+        aColour = aPacked.astype(np.float32) / 255.0
+        aUVs = np.empty((len(aPacked), 2), dtype=np.float32)
+        aUVs[:, 0] = aColour[:, 2] + aColour[:, 0] * k_texcoordScale
+        aUVs[:, 1] = (1.0 - aColour[:, 1]) + (1.0 - aColour[:, 3]) * k_texcoordScale
+    else:
+        aUVs = np.array(aPacked, dtype=np.float32)
+        aUVs[:, 1] = 1.0 - aUVs[:, 1]
+    return aUVs
+
+'''
+    Decodes a whole normal, tangent or binormal channel of the vertex buffer
+    aPacked - the field of the vertex records, either (n, 4) packed bytes or (n, 3) floats
+    returns - (n, 3) float32 array of unit vectors in Blender space
+'''
+def DecodeNormalArray(aPacked):
+    if aPacked.dtype == np.uint8:
+        #packed like a D3DCOLOR (z, y, x, w), every axis maps [0, 255] to [-1, 1]
+        aVectors = aPacked[:, [2, 1, 0]].astype(np.float32) * (2.0 / 255.0) - 1.0
+    else:
+        aVectors = np.array(aPacked, dtype=np.float32)
+    #Relic space to Blender space: (x, y, z) -> (x, z, y)
+    aVectors = aVectors[:, [0, 2, 1]]
+    aLengths = np.linalg.norm(aVectors, axis=1, keepdims=True)
+    np.divide(aVectors, aLengths, out=aVectors, where=aLengths > 0.0)
+    return aVectors
+
+'''
+    Decodes a whole vertex colour channel of the vertex buffer
+    aPacked - (n, 4) colour bytes, stored like a D3DCOLOR (b, g, r, a)
+    returns - (n, 4) float32 array of RGBA values in [0, 1]
+'''
+def DecodeColourArray(aPacked):
+    return aPacked[:, [2, 1, 0, 3]].astype(np.float32) / 255.0
+
+#neighbouring cells of the weld grid: every offset up to two cells away along each axis that comes after the cell itself,
+#so every pair of cells that can hold vertices within the weld distance of each other is visited once
+k_aNeighbourCells = np.array([(x, y, z) for x in range(-2, 3) for y in range(-2, 3) for z in range(-2, 3) if (x, y, z) > (0, 0, 0)], dtype=np.int64)
+#number of vertex pairs compared at once, bounds the memory of a weld
+k_iWeldPairChunk = 1 << 21
+
+'''
+    Gives every grid cell a key that sorts and compares as one value
+    aCells - (n, 3) int64 cell coordinates, not below 0
+    aDims - number of cells along each axis
+    returns - (n,) keys, int64 while the grid has few enough cells, opaque byte strings otherwise
+'''
+def CellKeys(aCells, aDims):
+    if np.prod(aDims.astype(np.float64)) < 2.0 ** 62:
+        return (aCells[:, 0] * aDims[1] + aCells[:, 1]) * aDims[2] + aCells[:, 2]
+    return np.ascontiguousarray(aCells).view(np.dtype((np.void, aCells.dtype.itemsize * 3))).ravel()
+
+'''
+    Follows the links of a union-find forest to the roots, a root links to itself and every link points to a lower index
+    aLabels - (n,) the links
+    aIndices - the vertices to look up
+    returns - their roots
+'''
+def WeldRoots(aLabels, aIndices):
+    aRoots = aLabels[aIndices]
+    while True:
+        aNext = aLabels[aRoots]
+        if np.array_equal(aNext, aRoots):
+            return aRoots
+        aRoots = aNext
+
+'''
+    Joins the groups of pairs of vertices in a union-find forest, see WeldRoots
+    aLabels - (n,) the links, changed in place
+    aA, aB - the vertex pairs
+'''
+def WeldUnion(aLabels, aA, aB):
+    while len(aA):
+        aRootsA, aRootsB = WeldRoots(aLabels, aA), WeldRoots(aLabels, aB)
+        bApart = aRootsA != aRootsB
+        aA, aB, aRootsA, aRootsB = aA[bApart], aB[bApart], aRootsA[bApart], aRootsB[bApart]
+        #a root linked to several others at once keeps the lowest, the rest are joined on the next pass
+        np.minimum.at(aLabels, np.maximum(aRootsA, aRootsB), np.minimum(aRootsA, aRootsB))
+
+'''
+    Merges vertices that lie within a distance threshold of each other. Merging is transitive: a chain of vertices,
+    each within fThreshold of the next, becomes one vertex even where its ends lie further apart, like a weld in 3ds Max.
+    Replaces meshop.weldVertsByThreshold from the 3ds Max importer.
+    Stacked duplicates, eg. along UV seams, are merged first. The rest are sorted into grid cells of half the threshold,
+    the vertices of a cell are always within the threshold of each other and merged, and the vertices of neighbouring
+    cells are compared pair by pair, a few million pairs at a time, until the two cells are merged.
+    aPositions - (n, 3) float array of vertex positions
+    aFaces - (m, 3) int array of vertex indices
+    fThreshold - the weld distance
+    returns - the welded positions and the faces indexing into them
+'''
+def WeldVertices(aPositions, aFaces, fThreshold):
+    if len(aPositions) == 0:
+        return aPositions, aFaces
+    #exact duplicates, +0.0 turns -0.0 into 0.0 so both compare equal
+    aExact = np.ascontiguousarray(aPositions + aPositions.dtype.type(0.0))
+    _, aFirstOf, aDuplicateOf = np.unique(aExact.view(np.dtype((np.void, aExact.dtype.itemsize * 3))).ravel(), return_index=True, return_inverse=True)
+    #distinct positions in the order they first occur, so the lowest index of a group is its first vertex
+    aOrder = np.argsort(aFirstOf, kind='stable')
+    aRank = np.empty_like(aOrder)
+    aRank[aOrder] = np.arange(len(aOrder))
+    aDistinct = aPositions[aFirstOf[aOrder]]
+    iCount = len(aDistinct)
+
+    #a cell of half the threshold is at most 0.87 thresholds across, vertices two cells apart can still be within it
+    aCells = np.floor(aDistinct / (fThreshold * 0.5)).astype(np.int64)
+    aCells -= aCells.min(axis=0) - 2
+    aDims = aCells.max(axis=0) + 3
+    aCellKeys, aFirstOfCell, aCellOf = np.unique(CellKeys(aCells, aDims), return_index=True, return_inverse=True)
+    aCellOf = aCellOf.reshape(-1)
+    #vertices sorted by cell, the vertices of cell k are aSorted[aStarts[k]:aStarts[k] + aSizes[k]]
+    aSorted = np.argsort(aCellOf, kind='stable')
+    aSizes = np.bincount(aCellOf, minlength=len(aCellKeys))
+    aStarts = np.cumsum(aSizes) - aSizes
+    #every vertex linked to the first vertex of its cell
+    aLabels = aFirstOfCell[aCellOf]
+
+    aPairsA, aPairsB = [], []
+    aCellCoords = aCells[aFirstOfCell]
+    for aOffset in k_aNeighbourCells:
+        if aCellKeys.dtype == np.int64:
+            #integer keys of neighbours lie a fixed distance apart
+            aNeighbourKeys = aCellKeys + int((aOffset[0] * aDims[1] + aOffset[1]) * aDims[2] + aOffset[2])
+        else:
+            aNeighbourKeys = CellKeys(aCellCoords + aOffset, aDims)
+        aFound = np.minimum(np.searchsorted(aCellKeys, aNeighbourKeys), len(aCellKeys) - 1)
+        bExists = aCellKeys[aFound] == aNeighbourKeys
+        aPairsA.append(np.nonzero(bExists)[0])
+        aPairsB.append(aFound[bExists])
+    aCellA, aCellB = np.concatenate(aPairsA), np.concatenate(aPairsB)
+    aDone = np.zeros(len(aCellA), dtype=np.int64) #vertex pairs of each cell pair compared so far
+
+    fThresholdSquared = fThreshold * fThreshold
+    while len(aCellA):
+        #cell pairs merged already need no more comparisons
+        bApart = WeldRoots(aLabels, aFirstOfCell[aCellA]) != WeldRoots(aLabels, aFirstOfCell[aCellB])
+        aCellA, aCellB, aDone = aCellA[bApart], aCellB[bApart], aDone[bApart]
+        if not len(aCellA):
+            break
+        aTotal = aSizes[aCellA] * aSizes[aCellB]
+        aEnds = np.cumsum(aTotal - aDone)
+        aPair = np.arange(min(aEnds[-1], k_iWeldPairChunk))
+        aPairCell = np.searchsorted(aEnds, aPair, side='right')
+        aWithin = aPair - (aEnds - (aTotal - aDone))[aPairCell] + aDone[aPairCell]
+        aSizeB = aSizes[aCellB][aPairCell]
+        aA = aSorted[aStarts[aCellA][aPairCell] + aWithin // aSizeB]
+        aB = aSorted[aStarts[aCellB][aPairCell] + aWithin % aSizeB]
+        bClose = np.square(aDistinct[aA] - aDistinct[aB]).sum(axis=1) <= fThresholdSquared
+        WeldUnion(aLabels, aA[bClose], aB[bClose])
+        aDone += np.bincount(aPairCell, minlength=len(aCellA))
+        bOpen = aDone < aTotal
+        aCellA, aCellB, aDone = aCellA[bOpen], aCellB[bOpen], aDone[bOpen]
+
+    aRoots = WeldRoots(aLabels, np.arange(iCount))
+    aFirst, aRemap = np.unique(aRoots, return_inverse=True)
+    return aDistinct[aFirst], aRemap.reshape(-1)[aRank[aDuplicateOf.reshape(-1)]][aFaces]
+
+'''
+    Holds the decoded vertex buffer of a mesh or trim, one array per vertex component, in Blender space
+    aPositions - (n, 3) vertex positions
+    aUVLayers - list of (layer name, (n, 2) UVs), UVMap is always present
+    aColourAttributes - list of (attribute name, (n, 4) RGBA colours)
+    aNormals - (n, 3) vertex normals or None
+    aTangentAttributes - list of (attribute name, (n, 3) vectors) for tangents and binormals
+'''
+class VertexArrays:
+    def __init__(self):
+        self.aPositions = None
+        self.aUVLayers = []
+        self.aColourAttributes = []
+        self.aNormals = None
+        self.aTangentAttributes = []
+
+    #all arrays, always in the same order
+    def arrays(self):
+        aArrays = [self.aPositions] + [aArray for sName, aArray in self.aUVLayers + self.aColourAttributes]
+        if self.aNormals is not None:
+            aArrays.append(self.aNormals)
+        return aArrays + [aArray for sName, aArray in self.aTangentAttributes]
+
+    '''
+        Creates empty arrays with the same layers as these ones
+        iCount - number of vertices
+        returns - a VertexArrays instance
+    '''
+    def allocate(self, iCount):
+        def Empty(aArray):
+            return np.empty((iCount,) + aArray.shape[1:], dtype=aArray.dtype)
+        oArrays = VertexArrays()
+        oArrays.aPositions = Empty(self.aPositions)
+        oArrays.aUVLayers = [(sName, Empty(aArray)) for sName, aArray in self.aUVLayers]
+        oArrays.aColourAttributes = [(sName, Empty(aArray)) for sName, aArray in self.aColourAttributes]
+        if self.aNormals is not None:
+            oArrays.aNormals = Empty(self.aNormals)
+        oArrays.aTangentAttributes = [(sName, Empty(aArray)) for sName, aArray in self.aTangentAttributes]
+        return oArrays
+
+'''
+    Reads the per-vertex component list and the vertex buffer that follows it
+    pData - the chunk data
+    iOffset - offset of the component count in pData
+    aNeeded - names of the fields to decode, see VertexComponentDtype
+    tracer - the Tracer warned about skipped components
+    returns - the structured vertex records and the offset behind the vertex buffer
+'''
+def ReadVertexBuffer(pData, iOffset, aNeeded=None, tracer=None):
+    #Per-Vertex Component Data
+    iComponentCount = struct.unpack_from('I', pData, iOffset)[0]
+    iOffset += 4
+
+    #Per-Vertex Data
+    class sPerVertStruct:
+        def __init__(self):
+            self.iVertComponent = 0
+            self.iVectorStorageType = 0
+            self.iDataType = 0
+
+    aComponentVector = []
+
+    for i in range(iComponentCount):
+        oComponent = sPerVertStruct()
+        oComponent.iVertComponent, oComponent.iVectorStorageType, oComponent.iDataType = struct.unpack_from('3I', pData, iOffset)
+        iOffset += 12
+        aComponentVector.append(oComponent)
+
+    #Vertex Data, decoded as a whole
+    iVertCount, iVertexSize = struct.unpack_from('2I', pData, iOffset)
+    iOffset += 8
+    oVertexDtype = VertexComponentDtype(aComponentVector, iVertexSize, aNeeded, tracer)
+    aVertexData = np.frombuffer(pData, dtype=oVertexDtype, count=iVertCount, offset=iOffset)
+    iOffset += iVertCount * oVertexDtype.itemsize
+    return aVertexData, iOffset
+
+'''
+    Lists the vertex components an import needs, the others are not decoded
+    importData - the import options: importNormals and vertexComponents, a set of 'UVS' (secondary UV channels), 'COLOURS' and 'TANGENTS'
+    returns - set of field names of VertexComponentDtype
+'''
+def NeededVertexComponents(importData):
+    aNeeded = {"position", "uv1"}
+    if 'UVS' in importData.vertexComponents:
+        aNeeded.update(("uv2", "uv3"))
+    if 'COLOURS' in importData.vertexComponents:
+        aNeeded.update(("diffuseColour", "specularColour"))
+    if importData.importNormals:
+        aNeeded.add("normal")
+        if 'TANGENTS' in importData.vertexComponents:
+            aNeeded.update(("tangent", "binormal"))
+    return aNeeded
+
+'''
+    Sorts an object into a damage state by its name
+    sObjectName - name of the object
+    returns - "Crushed", "Wrecked", "Tread" or "Normal"
+'''
+def ObjectCategory(sObjectName):
+    sLowerName = sObjectName.lower()
+    if "crush" in sLowerName:
+        return "Crushed"
+    elif "wreck" in sLowerName:
+        return "Wrecked"
+    elif "critical_tread" in sLowerName:
+        return "Tread"
+    return "Normal"
+
+'''
+    Checks an object against the category and name filters of the import
+    importData - the import options: importCategories, a set of ObjectCategory names, and objectFilter,
+                 comma separated name patterns, a pattern without wildcards matches any name containing it
+    sObjectName - name of the object
+    returns - true if the object gets imported
+'''
+def ObjectSelected(importData, sObjectName):
+    if ObjectCategory(sObjectName) not in importData.importCategories:
+        return False
+    aPatterns = [sPattern.strip().lower() for sPattern in importData.objectFilter.split(",") if sPattern.strip()]
+    if not aPatterns:
+        return True
+    sLowerName = sObjectName.lower()
+    for sPattern in aPatterns:
+        if not any(sChar in sPattern for sChar in "*?["):
+            sPattern = "*" + sPattern + "*"
+        if fnmatch.fnmatchcase(sLowerName, sPattern):
+            return True
+    return False
+
+'''
+    Decodes all components of a vertex buffer that the import needs
+    importData - the ImportRgm instance holding the import options
+    aVertexData - the structured vertex records from ReadVertexBuffer
+    returns - a VertexArrays instance
+'''
+def DecodeVertexArrays(importData, aVertexData):
+    oArrays = VertexArrays()
+    aNames = aVertexData.dtype.names
+    iVertCount = len(aVertexData)
+
+    #Relic space to Blender space: (x, y, z) -> (x, z, y)
+    oArrays.aPositions = np.zeros((iVertCount, 3), dtype=np.float32)
+    if "position" in aNames:
+        oArrays.aPositions[:] = aVertexData["position"][:, [0, 2, 1]]
+    if "uv1" in aNames:
+        oArrays.aUVLayers.append(("UVMap", DecodeUVArray(aVertexData["uv1"])))
+    else:
+        oArrays.aUVLayers.append(("UVMap", np.zeros((iVertCount, 2), dtype=np.float32)))
+
+    #secondary UV channels and vertex colours, only decoded when the model stores them
+    for sComponent, sLayerName in (("uv2", "UVMap2"), ("uv3", "UVMap3")):
+        if sComponent in aNames:
+            oArrays.aUVLayers.append((sLayerName, DecodeUVArray(aVertexData[sComponent])))
+    for sComponent, sAttributeName in (("diffuseColour", "DiffuseColour"), ("specularColour", "SpecularColour")):
+        if sComponent in aNames:
+            oArrays.aColourAttributes.append((sAttributeName, DecodeColourArray(aVertexData[sComponent])))
+
+    if importData.importNormals:
+        if "normal" in aNames:
+            oArrays.aNormals = DecodeNormalArray(aVertexData["normal"])
+        for sComponent in ("tangent", "binormal"):
+            if sComponent in aNames:
+                oArrays.aTangentAttributes.append(("rgm_" + sComponent, DecodeNormalArray(aVertexData[sComponent])))
+    return oArrays
+
+'''
+    Decodes a vertex buffer in windows of a fixed number of vertices and gathers the vertices every object references
+    into arrays of its own, so besides the objects only one decoded window is held at a time
+    importData - the import options, streamBudget is the memory for one window in MB
+    aVertexData - the structured vertex records from ReadVertexBuffer
+    aFaceLists - array of (m, 3) triangles indexing into aVertexData, one per object
+    returns - array of (VertexArrays of the object, its triangles indexing into them), one per object
+'''
+def DecodeVertexWindows(importData, aVertexData, aFaceLists):
+    iVertCount = len(aVertexData)
+    if iVertCount == 0:
+        return [(DecodeVertexArrays(importData, aVertexData), aFaceList) for aFaceList in aFaceLists]
+
+    #a window holds its records, the decoded arrays and about as much again for the temporaries of the decode
+    oFirst = DecodeVertexArrays(importData, aVertexData[:1])
+    iVertexBytes = aVertexData.dtype.itemsize + 2 * sum(aArray.nbytes for aArray in oFirst.arrays())
+    iWindow = max(1024, importData.streamBudget * 1024 * 1024 // iVertexBytes)
+
+    aObjects = []
+    for aFaceList in aFaceLists:
+        aVertIds, aLocalFaces = np.unique(aFaceList, return_inverse=True)
+        aObjects.append((aVertIds, oFirst.allocate(len(aVertIds)), aLocalFaces.reshape(-1, 3)))
+
+    for iStart in range(0, iVertCount, iWindow):
+        oWindow = DecodeVertexArrays(importData, aVertexData[iStart:iStart + iWindow])
+        for aVertIds, oArrays, aLocalFaces in aObjects:
+            #the vertex ids are sorted, so the ones inside the window are a slice of them
+            iFirst, iLast = np.searchsorted(aVertIds, (iStart, iStart + iWindow))
+            if iFirst == iLast:
+                continue
+            aIndices = aVertIds[iFirst:iLast] - iStart
+            for aTarget, aSource in zip(oArrays.arrays(), oWindow.arrays()):
+                aTarget[iFirst:iLast] = aSource[aIndices]
+        del oWindow
+    return [(oArrays, aLocalFaces) for aVertIds, oArrays, aLocalFaces in aObjects]
+
+'''
+    Holds the geometry of one object, ready to be turned into a mesh
+    sObjectName - name of the object
+    aPositions - (n, 3) vertex positions
+    aFaces - (m, 3) triangles indexing into aPositions
+    aUVLayers - list of (layer name, (m * 3, 2) UVs per face corner)
+    aColourAttributes - list of (attribute name, (m * 3, 4) colours per face corner)
+    aNormals - (n, 3) normals per vertex, (m * 3, 3) normals per face corner if bCornerNormals is set, or None
+    bCornerNormals - whether aNormals holds one normal per face corner
+    aTangentAttributes - list of (attribute name, (m * 3, 3) vectors per face corner)
+    sMaterialName - name of the material to assign
+    sGeometryHash - content hash of everything the mesh is built from, objects with the same hash can share one mesh
+'''
+class ObjectData:
+    def __init__(self):
+        self.sObjectName = ""
+        self.aPositions = None
+        self.aFaces = None
+        self.aUVLayers = []
+        self.aColourAttributes = []
+        self.aNormals = None
+        self.bCornerNormals = False
+        self.aTangentAttributes = []
+        self.sMaterialName = ""
+        self.sGeometryHash = ""
+
+'''
+    Hashes the geometry of an object: positions, faces, all face corner layers, normals and the material
+    oObject - the ObjectData
+    returns - the hash as a hex string
+'''
+def GeometryHash(oObject):
+    oHash = hashlib.blake2b(digest_size=16)
+    oHash.update(oObject.sMaterialName.encode('utf-8') + b'\x00')
+    oHash.update(np.ascontiguousarray(oObject.aPositions, dtype='<f4'))
+    oHash.update(np.ascontiguousarray(oObject.aFaces, dtype='<i4'))
+    for sName, aValues in oObject.aUVLayers + oObject.aColourAttributes + oObject.aTangentAttributes:
+        oHash.update(sName.encode('utf-8') + b'\x00')
+        oHash.update(np.ascontiguousarray(aValues, dtype='<f4'))
+    if oObject.aNormals is not None:
+        oHash.update(b'corner normals' if oObject.bCornerNormals else b'vertex normals')
+        oHash.update(np.ascontiguousarray(oObject.aNormals, dtype='<f4'))
+    return oHash.hexdigest()
+
+'''
+    Holds a decoded mesh or trim DATADATA chunk
+    aObjects - array of ObjectData
+    sMaterialName - name of the material used by all objects
+    aSkinBones - names of the bones the mesh is skinned to
+    aFilteredNames - names of the objects left out by the import filters
+    sChunkKey, sChunkHash - the chunk the mesh was decoded from, see ChunkHash
+'''
+class MeshData:
+    def __init__(self):
+        self.aObjects = []
+        self.sMaterialName = ""
+        self.aSkinBones = []
+        self.aFilteredNames = []
+        self.sChunkKey = ""
+        self.sChunkHash = ""
+
+'''
+    Gathers the geometry of one object out of a decoded vertex buffer
+    importData - the import options
+    sObjectName - name of the object
+    oArrays - the VertexArrays of the buffer the faces index into
+    aFaceList - (m, 3) array of triangles indexing into oArrays
+    sMaterialName - name of the material to assign
+    returns - an ObjectData instance
+'''
+def DecodeObjectData(importData, sObjectName, oArrays, aFaceList, sMaterialName):
+    with importData.tracer.span("remap", object=sObjectName) as oSpan:
+        oObject = RemapObjectData(importData, sObjectName, oArrays, aFaceList, sMaterialName)
+        oSpan.set(vertices=len(oObject.aPositions), faces=len(oObject.aFaces))
+    return oObject
+
+def RemapObjectData(importData, sObjectName, oArrays, aFaceList, sMaterialName):
+    oObject = ObjectData()
+    oObject.sObjectName = sObjectName
+    oObject.sMaterialName = sMaterialName
+
+    #Organise the verts for the per object mesh construction:
+    #copy the referenced verticies to a local list and make the face indices point into it
+    aVertIds, aLocalFaces = np.unique(aFaceList, return_inverse=True)
+    aLocalFaces = aLocalFaces.reshape(-1, 3)
+    aLocalPositions = oArrays.aPositions[aVertIds]
+
+    if importData.weldVertices:
+        aLocalPositions, aLocalFaces = WeldVertices(aLocalPositions, aLocalFaces, importData.weldThreshold)
+    #drop faces that collapsed to a line or point
+    aValidFaces = (aLocalFaces[:, 0] != aLocalFaces[:, 1]) & (aLocalFaces[:, 1] != aLocalFaces[:, 2]) & (aLocalFaces[:, 0] != aLocalFaces[:, 2])
+    if not aValidFaces.all():
+        aLocalFaces = aLocalFaces[aValidFaces]
+        aFaceList = aFaceList[aValidFaces]
+    oObject.aPositions = aLocalPositions
+    oObject.aFaces = aLocalFaces
+
+    #UVs and colours are kept per face corner, so welding keeps the UV seams intact
+    aCorners = aFaceList.ravel()
+    oObject.aUVLayers = [(sLayerName, aUVs[aCorners]) for sLayerName, aUVs in oArrays.aUVLayers]
+    oObject.aColourAttributes = [(sAttributeName, aColours[aCorners]) for sAttributeName, aColours in oArrays.aColourAttributes]
+    oObject.aTangentAttributes = [(sAttributeName, aVectors[aCorners]) for sAttributeName, aVectors in oArrays.aTangentAttributes]
+    if oArrays.aNormals is not None:
+        if importData.weldVertices:
+            oObject.aNormals = oArrays.aNormals[aCorners]
+            oObject.bCornerNormals = True
+        else:
+            oObject.aNormals = oArrays.aNormals[aVertIds]
+    oObject.sGeometryHash = GeometryHash(oObject)
+    return oObject
+
+'''
+    Reads the material name and skin bone list that end a mesh or trim DATADATA chunk
+    pData - the chunk data
+    iOffset - offset of the material name length in pData
+    oMeshData - the MeshData to fill in
+    returns - the offset behind the skin bone list
+'''
+def ReadMaterialAndSkin(pData, iOffset, oMeshData):
+    #Material
+    dMaterial, iOffset = k_oString.unpack_from(pData, iOffset)
+    oMeshData.sMaterialName = dMaterial["sValue"]
+
+    #Skin
+    dCount, iOffset = k_oCount.unpack_from(pData, iOffset)
+    aSkinBones, iOffset = k_oSkinBone.unpack_array(pData, iOffset, dCount["iCount"])
+    oMeshData.aSkinBones.extend(dSkinBone["sName"] for dSkinBone in aSkinBones)
+    return iOffset
+
+'''
+    Decodes the DATADATA chunk of a FOLDMRGM folder
+    importData - the import options
+    pData - the chunk data
+    returns - a MeshData instance
+'''
+def DecodeMeshDataData(importData, pData):
+    oMeshData = MeshData()
+    iOffset = 1
+
+    #holds data for a single object 
+    class sObjectStruct:
+        def __init__(self):
+            self.sObjectName = ""
+            self.aFaceList = None #(n, 3) array of indices into the global vertex list
+
+    #number of separate objects
+    iObjectCount = struct.unpack_from('I', pData, iOffset)[0]
+    iOffset += 4
+    aObjectList = []
+
+    for i in range(iObjectCount):
+        oObject = sObjectStruct()
+        #number of faces as the verts that make them. Meshes are triangles so divide by 3
+        iFaceCount = struct.unpack_from('I', pData, iOffset)[0] // 3
+        iOffset += 4
+        oObject.aFaceList = np.frombuffer(pData, dtype='<u2', count=iFaceCount * 3, offset=iOffset).reshape(-1, 3)
+        iOffset += iFaceCount * 6 + 13
+        iStrLen = struct.unpack_from('I', pData, iOffset)[0]
+        iOffset += 4
+        oObject.sObjectName = bytes(pData[iOffset:iOffset + iStrLen]).decode('utf-8')
+        iOffset += iStrLen
+        aObjectList.append(oObject)
+
+    aSelected = [oObject for oObject in aObjectList if ObjectSelected(importData, oObject.sObjectName)]
+    oMeshData.aFilteredNames = [oObject.sObjectName for oObject in aObjectList if oObject not in aSelected]
+
+    aVertexData, iOffset = ReadVertexBuffer(pData, iOffset, NeededVertexComponents(importData), importData.tracer)
+    aDecoded = []
+    if aSelected:
+        with importData.tracer.span("vertex decode") as oSpan:
+            oSpan.set(vertices=len(aVertexData), bytes=aVertexData.nbytes)
+            if importData.streamBudget > 0:
+                aDecoded = DecodeVertexWindows(importData, aVertexData, [oObject.aFaceList for oObject in aSelected])
+            else:
+                if len(aSelected) < len(aObjectList):
+                    #only the vertices of the selected objects are decoded, their faces are pointed at them
+                    aUsed = np.unique(np.concatenate([oObject.aFaceList.ravel() for oObject in aSelected]))
+                    aVertexData = aVertexData[aUsed]
+                    for oObject in aSelected:
+                        oObject.aFaceList = np.searchsorted(aUsed, oObject.aFaceList)
+                    oSpan.set(vertices=len(aVertexData), bytes=aVertexData.nbytes)
+                oArrays = DecodeVertexArrays(importData, aVertexData)
+                aDecoded = [(oArrays, oObject.aFaceList) for oObject in aSelected]
+
+    iOffset += 4 # skip unknown
+    ReadMaterialAndSkin(pData, iOffset, oMeshData)
+
+    for oTempObject, (oArrays, aFaceList) in zip(aSelected, aDecoded):
+        oMeshData.aObjects.append(DecodeObjectData(importData, oTempObject.sObjectName, oArrays, aFaceList, oMeshData.sMaterialName))
+    return oMeshData
+
+'''
+    Decodes the DATADATA chunk of a FOLDTRIM folder
+    importData - the import options
+    pData - the chunk data
+    sName - name of the trim, taken from the FOLDTRIM chunk
+    returns - a MeshData instance holding one object, None if the trim can't be imported
+'''
+def DecodeTrimDataData(importData, pData, sName):
+    if not ObjectSelected(importData, sName):
+        return None
+    oMeshData = MeshData()
+    aVertexData, iOffset = ReadVertexBuffer(pData, 0, NeededVertexComponents(importData), importData.tracer)
+    iOffset += 8 # skip unknown
+
+    # Faces
+    iVertsPerFace, iFaceCount = struct.unpack_from('2I', pData, iOffset)
+    iOffset += 8
+    if iVertsPerFace != 3:
+        importData.tracer.warn("Trim " + sName + " has " + str(iVertsPerFace) + " verts per face, only triangles are supported")
+        return None
+    iFaceCount = iFaceCount // iVertsPerFace
+    aFaceList = np.frombuffer(pData, dtype='<u2', count=iFaceCount * 3, offset=iOffset).reshape(-1, 3)
+    iOffset += iFaceCount * 6
+    # The 3ds Max importer added 1 to every index for its 1-based vertex lists, Blender is 0-based so the indices are used as stored.
+    # Trim faces are stored with the opposite winding, the Max importer read them as (0, 2, 1).
+    aFaceList = aFaceList[:, [0, 2, 1]]
+
+    with importData.tracer.span("vertex decode") as oSpan:
+        if importData.streamBudget > 0:
+            oArrays, aFaceList = DecodeVertexWindows(importData, aVertexData, [aFaceList])[0]
+        else:
+            oArrays = DecodeVertexArrays(importData, aVertexData)
+        oSpan.set(vertices=len(aVertexData), bytes=aVertexData.nbytes)
+
+    ReadMaterialAndSkin(pData, iOffset, oMeshData)
+    oMeshData.aObjects.append(DecodeObjectData(importData, sName, oArrays, aFaceList, oMeshData.sMaterialName))
+    return oMeshData
+
+'''
+    Holds one bone of a FOLDSKEL folder
+    sName - bone name
+    iParent - index of the parent bone, -1 for root bones
+    aMatrix - 3 rows of 4 floats, the bone transform as stored in the model
+'''
+class BoneData:
+    def __init__(self):
+        self.sName = ""
+        self.iParent = -1
+        self.aMatrix = [[0.0] * 4 for i in range(3)]
+
+'''
+    Holds the decoded bones of a FOLDSKEL folder
+    aBones - array of BoneData in file order, parents come before their children
+    sChunkKey, sChunkHash - the FOLDSKEL chunk, see ChunkHash
+'''
+class SkeletonData:
+    def __init__(self):
+        self.aBones = []
+        self.sChunkKey = ""
+        self.sChunkHash = ""
+
+'''
+    Decodes the bones of a FOLDSKEL folder
+    pData - the data of the FOLDSKEL chunk
+    oChunk - the FOLDSKEL chunk
+    returns - array of BoneData in file order, parents come before their children
+'''
+def DecodeSkeleton(pData, oChunk):
+    aBones = []
+    # Read number of bones in the skeleton
+    dataInfo = oChunk.aChildren[0]
+    numBones = k_oCount.unpack_from(pData, dataInfo.iDataPosition - oChunk.iDataPosition)[0]["iCount"]
+
+    # Read bones
+    for k in range(numBones):
+        dataBone = oChunk.aChildren[k + 1]
+        dRecord = k_oBone.unpack_from(pData, dataBone.iDataPosition - oChunk.iDataPosition)[0]
+        oBone = BoneData()
+        oBone.sName = dataBone.sName
+        oBone.iParent = dRecord["iParent"]
+        # Bone transforms are stored column by column
+        aValues = dRecord["aMatrix"]
+        oBone.aMatrix = [[aValues[i * 3 + j] for i in range(4)] for j in range(3)]
+        aBones.append(oBone)
+    return aBones
+
+'''
+    Holds one marker of a DATAMRKS chunk
+    sName - marker name
+    sParent - name of the parent bone, empty if the marker is placed in world space
+    aMatrix - 4 rows of 3 floats, the marker transform as stored in the model
+    aParams - array of (key, value) string pairs
+'''
+class MarkerData:
+    def __init__(self):
+        self.sName = ""
+        self.sParent = ""
+        self.aMatrix = []
+        self.aParams = []
+
+'''
+    Decodes the markers of a DATAMRKS chunk
+    pData - the data of the DATAMRKS chunk
+    returns - array of MarkerData
+'''
+def DecodeMarkers(pData):
+    aMarkers = []
+    # Read number of markers
+    dCount, iOffset = k_oCount.unpack_from(pData, 0)
+    if dCount["iCount"] == 0:
+        DebugPrint("No markers found")
+
+    # Read markers: name, parent name, transform matrix and parameters
+    for i in range(dCount["iCount"]):
+        dRecord, iOffset = k_oMarker.unpack_from(pData, iOffset)
+        oMarker = MarkerData()
+        oMarker.sName = dRecord["sName"]
+        oMarker.sParent = dRecord["sParent"]
+        oMarker.aMatrix = [list(dRecord["aMatrix"][j * 3:j * 3 + 3]) for j in range(4)]
+        aParams, iOffset = k_oMarkerParam.unpack_array(pData, iOffset, dRecord["iParamCount"])
+        oMarker.aParams = [(dParam["sKey"], dParam["sValue"]) for dParam in aParams]
+        aMarkers.append(oMarker)
+    return aMarkers
+
+'''
+    Holds a decoded FOLDMTRL folder
+    sName - material name
+    sShaderName - name of the shader the material uses
+    sDiffusePath - path of the diffuse .dds texture
+    sNormalPath - path of the normal map .dds texture
+    bImportError - true if one of the textures could not be found or converted
+    dEmbedded - .dds files decoded from texture sets embedded in the model, as bytes by texture path, these paths do not exist on disk
+    sChunkKey, sChunkHash - the FOLDMTRL chunk, see ChunkHash
+'''
+class MaterialData:
+    def __init__(self):
+        self.sName = ""
+        self.sShaderName = ""
+        self.sDiffusePath = ""
+        self.sNormalPath = ""
+        self.bImportError = False
+        self.dEmbedded = {}
+        self.sChunkKey = ""
+        self.sChunkHash = ""
+
+#models decoded in parallel can share textures, a lock per texture path keeps them from converting the same .rgt at once
+aTextureLocks = {}
+oTextureLocksLock = threading.Lock()
+
+'''
+    Makes sure a .dds texture exists, converting the .rgt next to it if needed
+    sPath - path of the .dds texture
+    sKind - texture kind for the log, eg. "diffuse"
+    oTracer - the Tracer timing the conversion, warned about a missing texture
+    returns - true if the .dds texture exists
+'''
+def ResolveTexture(sPath, sKind, oTracer):
+    with oTextureLocksLock:
+        oLock = aTextureLocks.setdefault(sPath, threading.Lock())
+    with oLock:
+        return ResolveTextureLocked(sPath, sKind, oTracer)
+
+def ResolveTextureLocked(sPath, sKind, oTracer):
+    if os.path.isfile(sPath):
+        DebugPrint("Image " + sPath + " found")
+        return True
+    sRgtPath = sPath.split('.')[0] + ".rgt"
+    if os.path.isfile(sRgtPath):
+        with oTracer.span("texture conversion", texture=sRgtPath) as oSpan:
+            importRgt(sRgtPath)
+            if os.path.isfile(sPath):
+                oSpan.set(bytes=os.path.getsize(sPath))
+        if os.path.isfile(sPath):
+            DebugPrint("Image " + sRgtPath + " found and imported")
+            return True
+        oTracer.warn("Image " + sRgtPath + " found, import failed")
+        return False
+    oTracer.warn("No " + sKind + " image found for " + sPath + ", material import failed")
+    return False
+
+'''
+    Name a texture is looked up by among the texture sets embedded in a model: the file name in lower case, without extension
+    sPath - texture path, with / or \\ separators
+    returns - the name
+'''
+def EmbeddedTextureName(sPath):
+    return os.path.splitext(sPath.replace('\\', '/').rstrip('\x00').rsplit('/', 1)[-1])[0].lower()
+
+'''
+    The FOLDTSET texture sets embedded in a FOLDMODL folder, each is decoded the first time a material uses it
+    importData - the import options
+    aChunks - the FOLDTSET chunks
+'''
+class EmbeddedTextures:
+    def __init__(self, importData, aChunks):
+        self.importData = importData
+        self.dSets = {} #FOLDTSET chunk by EmbeddedTextureName
+        self.dDecoded = {} #.dds bytes by EmbeddedTextureName, None if the set is no DXTC texture
+        self.sDigest = None
+        self.oLock = threading.Lock()
+        for oChunk in aChunks:
+            sName = oChunk.sName
+            if not sName:
+                folderTxtr = oChunk.getChildByType("FOLDTXTR")
+                sName = folderTxtr.sName if folderTxtr is not None else ""
+            if sName:
+                self.dSets[EmbeddedTextureName(sName)] = oChunk
+
+    '''
+        Hashes the data of all texture sets, materials include it in their chunk hash so they are rebuilt when an embedded texture changes
+        returns - the hash as bytes, empty if the model has no texture sets
+    '''
+    def digest(self):
+        with self.oLock:
+            if self.sDigest is None:
+                oHash = hashlib.blake2b(digest_size=16)
+                for sName in sorted(self.dSets):
+                    oHash.update(sName.encode('utf-8'))
+                    oHash.update(ReadChunkData(self.importData.sModelPath, self.dSets[sName], self.importData.fileMap))
+                self.sDigest = oHash.digest() if self.dSets else b""
+            return self.sDigest
+
+    '''
+        Decodes the texture set a texture path refers to
+        sPath - texture path of a material
+        returns - the .dds file as bytes, None if the model holds no DXTC texture set of that name
+    '''
+    def get(self, sPath):
+        sName = EmbeddedTextureName(sPath)
+        oChunk = self.dSets.get(sName)
+        if oChunk is None:
+            return None
+        with self.oLock:
+            if sName not in self.dDecoded:
+                with self.importData.tracer.span("texture decode", texture=oChunk.sName) as oSpan:
+                    pDds = DecodeEmbeddedDxtc(oChunk, ReadChunkData(self.importData.sModelPath, oChunk, self.importData.fileMap))
+                    if pDds is not None:
+                        oSpan.set(bytes=len(pDds))
+                self.dDecoded[sName] = pDds
+            return self.dDecoded[sName]
+
+'''
+    Decodes a FOLDMTRL folder and locates its textures, converting .rgt textures to .dds where needed.
+    Textures embedded in the model are decoded from it instead.
+    importData - the import options
+    oChunk - the FOLDMTRL chunk
+    pData - the data of the FOLDMTRL chunk
+    oEmbedded - the EmbeddedTextures of the model, None to look for texture files only
+    returns - a MaterialData instance
+'''
+def DecodeMaterial(importData, oChunk, pData, oEmbedded=None):
+    oMaterial = MaterialData()
+    oMaterial.sName = oChunk.sName
+
+    i = 0
+    while i < oChunk.iChildCount:
+        iOffset = oChunk.aChildren[i].iDataPosition - oChunk.iDataPosition
+        if oChunk.aChildren[i].sType == "DATAINFO":
+            oMaterial.sShaderName = k_oString.unpack_from(pData, iOffset)[0]["sValue"]
+            DebugPrint("Shader: " + oMaterial.sShaderName)
+        elif "VAR" in oChunk.aChildren[i].sType:
+            dVar, iOffset = k_oMaterialVar.unpack_from(pData, iOffset)
+            sTexType = dVar["sName"]
+            DebugPrint("Texture type: " + sTexType, end='')
+            if sTexType == "diffusetex":
+                sValue = k_oString.unpack_from(pData, iOffset)[0]["sValue"]
+                if importData.importDirectory == 'Work':
+                    sTexPath = sValue.rsplit('\\', 1)[1].split('.')[0].rstrip('\x00')
+                    oMaterial.sDiffusePath = importData.sWorkingDirectory + "/" + sTexPath + ".dds"
+                elif importData.importDirectory == 'Asset':
+                    sTexPath = sValue.split('.')[0].rstrip('\x00')
+                    oMaterial.sDiffusePath = importData.sAssetDirectory + "/data/" + sTexPath.replace('\\', '/') + ".dds"
+                DebugPrint(", path: " + oMaterial.sDiffusePath)
+            elif sTexType == "normalmap":
+                sValue = k_oString.unpack_from(pData, iOffset)[0]["sValue"]
+                if importData.importDirectory == 'Work':
+                    sTexPath = sValue.rsplit('\\', 1)[1].split('.')[0].rstrip('\x00')
+                    oMaterial.sNormalPath = importData.sWorkingDirectory + "/" + sTexPath + ".dds"
+                elif importData.importDirectory == 'Asset':
+                    sTexPath = sValue.split('.')[0].rstrip('\x00')
+                    oMaterial.sNormalPath = importData.sAssetDirectory + "/data/" + sTexPath.replace('\\', '/') + ".dds"
+                DebugPrint(", path: " + oMaterial.sNormalPath)
+            else:
+                DebugPrint("")
+        i = i + 1    
+
+    #Check for diffuse and normal image, embedded ones first
+    for sPath, sKind in ((oMaterial.sDiffusePath, "diffuse"), (oMaterial.sNormalPath, "normal")):
+        pDds = oEmbedded.get(sPath) if oEmbedded is not None and sPath else None
+        if pDds is not None:
+            DebugPrint("Image " + sPath + " found in the model")
+            oMaterial.dEmbedded[sPath] = pDds
+        elif not ResolveTexture(sPath, sKind, importData.tracer):
+            oMaterial.bImportError = True
+    return oMaterial
+
+'''
+    Holds everything decoded from a model. It is filled while decoding runs, so the scene can be built from the parts
+    decoded so far on another thread.
+    aSkeletons - array of SkeletonData, one per FOLDSKEL folder
+    aParts - array of (kind, data) in decoding order, kind is "skeleton" (SkeletonData), "mesh" (MeshData), "material" (MaterialData),
+             "markers" (MarkerData array) or "unchanged" (key of a chunk that was skipped because the scene already holds it, see ChunkHash)
+    aChunkKeys - set of the keys of all chunks in the model
+    dMaterialChunks - names of the materials the model decodes, by FOLDMTRL chunk key, known before any of its meshes are decoded
+    bComplete - set once decoding has ended, aParts then holds everything
+    oChanged - set whenever a part was added or decoding ended
+'''
+class ModelData:
+    def __init__(self):
+        self.aSkeletons = []
+        self.aParts = []
+        self.aChunkKeys = set()
+        self.dMaterialChunks = {}
+        self.bComplete = False
+        self.oLock = threading.Lock()
+        self.oChanged = threading.Event()
+
+    def addPart(self, sKind, oData):
+        with self.oLock:
+            if sKind == "skeleton":
+                self.aSkeletons.append(oData)
+            self.aParts.append((sKind, oData))
+        self.oChanged.set()
+
+    def expectMaterials(self, dMaterialChunks):
+        with self.oLock:
+            self.dMaterialChunks.update(dMaterialChunks)
+
+    '''
+        Lists the materials that are not built yet
+        aBuiltKeys - set of the FOLDMTRL chunk keys that are built or unchanged
+        returns - set of material names
+    '''
+    def pendingMaterials(self, aBuiltKeys):
+        with self.oLock:
+            return {sName for sKey, sName in self.dMaterialChunks.items() if sKey not in aBuiltKeys}
+
+    def finish(self):
+        self.bComplete = True
+        self.oChanged.set()
+
+'''
+    Gives every chunk a key that stays the same when the model is edited: the path of chunk types and names
+    leading to it, with a counter for siblings of the same type and name
+    aChunks - the chunks to name
+    aKeys - set the keys are added to
+    sParentKey - key of the parent chunk
+'''
+def AssignChunkKeys(aChunks, aKeys, sParentKey=""):
+    dCounts = {}
+    for oChunk in aChunks:
+        sId = oChunk.sType + ":" + oChunk.sName
+        iIndex = dCounts.get(sId, 0)
+        dCounts[sId] = iIndex + 1
+        oChunk.sKey = sParentKey + "/" + sId + ("#" + str(iIndex) if iIndex > 0 else "")
+        aKeys.add(oChunk.sKey)
+        AssignChunkKeys(oChunk.aChildren, aKeys, oChunk.sKey)
+
+#the import options that change what gets built from a mesh, skeleton or material chunk, see ChunkHash
+k_aHashedOptions = ("importTextures", "importBones", "mirrorAxis", "importNormals", "weldVertices", "weldThreshold", "importDirectory",
+    "sWorkingDirectory", "sAssetDirectory", "importCategories", "objectFilter", "vertexComponents", "bakeMaps")
+
+'''
+    Hashes the data of a chunk together with the import options that change what gets built from it.
+    All chunk kinds hash all of k_aHashedOptions, meshes depend on the materials and the skeleton built next to them.
+    importData - the import options
+    pData - the chunk data, for FOLDxxxx chunks all of their children
+    pExtra - more bytes the result depends on, eg. the embedded textures of a material
+    returns - the hash as a hex string
+'''
+def ChunkHash(importData, pData, pExtra=b""):
+    oHash = hashlib.blake2b(digest_size=16)
+    aOptions = [getattr(importData, sOption) for sOption in k_aHashedOptions]
+    oHash.update(repr([sorted(value) if isinstance(value, set) else value for value in aOptions]).encode('utf-8'))
+    oHash.update(pData)
+    oHash.update(pExtra)
+    return oHash.hexdigest()
+
+'''
+    Checks if the scene already holds what a chunk builds, importData.knownChunkHashes has the hashes of the last import
+    importData - the import options
+    oChunk - the chunk
+    pData - the chunk data
+    oModelData - the ModelData, an "unchanged" part is added for a chunk that can be skipped
+    pExtra - see ChunkHash
+    returns - the hash of the chunk, None if the chunk is unchanged
+'''
+def CheckChunkChanged(importData, oChunk, pData, oModelData, pExtra=b""):
+    sHash = ChunkHash(importData, pData, pExtra)
+    if importData.knownChunkHashes.get(oChunk.sKey) == sHash:
+        DebugPrint("Unchanged: " + oChunk.sKey)
+        oModelData.addPart("unchanged", oChunk.sKey)
+        return None
+    return sHash
+
+def DecodeModel_FoldMrgm(importData, oChunk, oModelData):
+    iDataDataCount = 0
+    i = 0
+    while i < oChunk.iChildCount:
+        if oChunk.aChildren[i].sType == "DATADATA":
+            if iDataDataCount == 0:
+                DebugPrint("Mesh-Data found")
+                pData = ReadChunkData(importData.sModelPath, oChunk.aChildren[i], importData.fileMap)
+                sHash = CheckChunkChanged(importData, oChunk.aChildren[i], pData, oModelData)
+                if sHash is not None:
+                    oMeshData = DecodeMeshDataData(importData, pData)
+                    oMeshData.sChunkKey, oMeshData.sChunkHash = oChunk.aChildren[i].sKey, sHash
+                    oModelData.addPart("mesh", oMeshData)
+                iDataDataCount = 1
+        i = i + 1
+
+def DecodeModel_FoldMgrp(importData, oChunk, oModelData):
+    i = 0
+    while i < oChunk.iChildCount:
+        if oChunk.aChildren[i].sType == "FOLDMESH":
+            DebugPrint("Mesh-Folder found")
+            DecodeModel_FoldMesh(importData, oChunk.aChildren[i], oModelData)
+        i = i + 1
+
+def DecodeModel_FoldMesh(importData, oChunk, oModelData):
+    i = 0
+    while i < oChunk.iChildCount and not importData.cancelled:
+        if oChunk.aChildren[i].sType == "FOLDMGRP":
+            DebugPrint("Mgrp-Folder found")
+            DecodeModel_FoldMgrp(importData, oChunk.aChildren[i], oModelData)
+        elif oChunk.aChildren[i].sType == "FOLDMRGM":
+            DebugPrint("Mrgm-Folder found")    
+            DecodeModel_FoldMrgm(importData, oChunk.aChildren[i], oModelData)
+        elif oChunk.aChildren[i].sType == "FOLDTRIM":
+            DebugPrint("Trim-Folder found")
+            DecodeModel_FoldTrim(importData, oChunk.aChildren[i], oModelData)
+        i = i + 1
+
+def DecodeModel_FoldTrim(importData, oChunk, oModelData):
+    iDataDataCount = 0
+    i = 1
+    while i < oChunk.iChildCount:
+        if oChunk.aChildren[i].sType == "DATADATA":
+            if iDataDataCount == 0:
+                DebugPrint("Trim-Data found")
+                pData = ReadChunkData(importData.sModelPath, oChunk.aChildren[i], importData.fileMap)
+                sHash = CheckChunkChanged(importData, oChunk.aChildren[i], pData, oModelData)
+                oMeshData = DecodeTrimDataData(importData, pData, oChunk.sName) if sHash is not None else None
+                if oMeshData is not None:
+                    oMeshData.sChunkKey, oMeshData.sChunkHash = oChunk.aChildren[i].sKey, sHash
+                    oModelData.addPart("mesh", oMeshData)
+                iDataDataCount = 1
+        i = i + 1
+
+'''
+    Decodes FOLDMTRL folders one after another, converting their textures
+    importData - the import options
+    aChunks - the FOLDMTRL chunks
+    oModelData - the ModelData the materials are added to
+    oEmbedded - the EmbeddedTextures of the model
+'''
+def DecodeModel_Materials(importData, aChunks, oModelData, oEmbedded):
+    for oChunk in aChunks:
+        if importData.cancelled:
+            break
+        pData = ReadChunkData(importData.sModelPath, oChunk)
+        sHash = CheckChunkChanged(importData, oChunk, pData, oModelData, oEmbedded.digest())
+        if sHash is not None:
+            with importData.tracer.span("material decode", material=oChunk.sName):
+                oMaterial = DecodeMaterial(importData, oChunk, pData, oEmbedded)
+            oMaterial.sChunkKey, oMaterial.sChunkHash = oChunk.sKey, sHash
+            oModelData.addPart("material", oMaterial)
+
+def DecodeModel_FoldModl(importData, oChunk, oModelData):
+    # Skeleton first
+    i = 0
+    while i < oChunk.iChildCount:
+        if oChunk.aChildren[i].sType == "FOLDSKEL":
+            DebugPrint("Skeleton-Folder found")
+            if importData.importBones == True:
+                pData = ReadChunkData(importData.sModelPath, oChunk.aChildren[i])
+                sHash = CheckChunkChanged(importData, oChunk.aChildren[i], pData, oModelData)
+                if sHash is not None:
+                    oSkeleton = SkeletonData()
+                    oSkeleton.aBones = DecodeSkeleton(pData, oChunk.aChildren[i])
+                    oSkeleton.sChunkKey, oSkeleton.sChunkHash = oChunk.aChildren[i].sKey, sHash
+                    oModelData.addPart("skeleton", oSkeleton)
+        i = i + 1
+
+    # Materials on a thread of their own, so reading and converting their textures overlaps with decoding the meshes.
+    # Meshes are built once their material is, see RgmIntoBlender_BuildSteps.
+    aMaterialChunks = [oChild for oChild in oChunk.aChildren if oChild.sType == "FOLDMTRL"] if importData.importTextures else []
+    oModelData.expectMaterials({oChild.sKey: oChild.sName for oChild in aMaterialChunks})
+    #textures embedded in the model are used before looking for files
+    oEmbedded = EmbeddedTextures(importData, [oChild for oChild in oChunk.aChildren if oChild.sType == "FOLDTSET"] if aMaterialChunks else [])
+    if importData.tracer.oMemory is not None or importData.profile != 'OFF':
+        #one stage at a time while memory is measured, and on the thread the profiler sees
+        DecodeModel_Materials(importData, aMaterialChunks, oModelData, oEmbedded)
+        DecodeModel_FoldModlRest(importData, oChunk, oModelData)
+        return
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        oMaterials = executor.submit(DecodeModel_Materials, importData, aMaterialChunks, oModelData, oEmbedded)
+        DecodeModel_FoldModlRest(importData, oChunk, oModelData)
+        oMaterials.result()
+
+def DecodeModel_FoldModlRest(importData, oChunk, oModelData):
+    i = 0
+    while i < oChunk.iChildCount and not importData.cancelled:
+        if oChunk.aChildren[i].sType == "FOLDTSET":
+            DebugPrint("Texture-Folder found")
+            #decoded with the materials using it, see EmbeddedTextures
+        elif oChunk.aChildren[i].sType == "FOLDMESH":
+            DebugPrint("Mesh-Folder found")
+            if importData.importMeshes == True:
+                DecodeModel_FoldMesh(importData, oChunk.aChildren[i], oModelData)
+        elif oChunk.aChildren[i].sType == "DATAMRKS":
+            DebugPrint("Datamarks found")
+            #if importData.importDatamarks == True:
+                #oModelData.addPart("markers", DecodeMarkers(ReadChunkData(importData.sModelPath, oChunk.aChildren[i])))
+        elif oChunk.aChildren[i].sType == "FOLDMTRL":
+            DebugPrint("Material-Folder found")
+        i = i + 1
+
+'''
+    Decodes all FOLDMODL folders of a model, without touching Blender
+    importData - the import options, setting importData.cancelled stops decoding at the next chunk,
+                 chunks whose hash matches importData.knownChunkHashes are not decoded,
+                 chunk data is read from importData.fileMap if it holds a mapping of the model, see MapChunkFile
+    oRgm - the loaded Chunky
+    oModelData - the ModelData to fill, shared with the thread building the scene, None for a new one
+    returns - the ModelData, complete
+'''
+def DecodeModel(importData, oRgm, oModelData=None):
+    if oModelData is None:
+        oModelData = ModelData()
+    try:
+        AssignChunkKeys(oRgm.aChunks, oModelData.aChunkKeys)
+        i = 0
+        while i < oRgm.iChunkCount and not importData.cancelled:
+            if oRgm.aChunks[i].sType == "FOLDMODL":
+                DecodeModel_FoldModl(importData, oRgm.aChunks[i], oModelData)
+            i = i + 1
+    finally:
+        oModelData.finish()
+    return oModelData
@@ -0,0 +1,1335 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Builds the Blender scene from the decoded model data.
+
+import bpy
+from mathutils import Vector
+import numpy as np
+import os
+import time
+import hashlib
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+from pathlib import Path
+import mathutils
+
+from .chunky import Chunky, ReadChunkData, MapChunkFile, CloseChunkFile
+from .rgmdata import DecodeModel, ModelData, ObjectCategory
+from . import trace
+from .trace import Tracer, DebugPrint
+from .profiler import Profiler
+from .memory import MemoryAccount
+
+'''
+    Creates a mesh datablock from vertex and face arrays without any per-vertex Python
+    sName - name of the mesh datablock
+    aPositions - (n, 3) float array of vertex positions
+    aFaces - (m, k) int array of vertex indices, k verts per face
+    returns - the new mesh
+'''
+def BuildMeshFromArrays(sName, aPositions, aFaces):
+    mesh_data = bpy.data.meshes.new(sName)
+    mesh_data.vertices.add(len(aPositions))
+    mesh_data.vertices.foreach_set("co", np.ascontiguousarray(aPositions, dtype=np.float32).ravel())
+    mesh_data.loops.add(aFaces.size)
+    mesh_data.loops.foreach_set("vertex_index", np.ascontiguousarray(aFaces, dtype=np.int32).ravel())
+    mesh_data.polygons.add(len(aFaces))
+    mesh_data.polygons.foreach_set("loop_start", np.arange(0, aFaces.size, aFaces.shape[1], dtype=np.int32))
+    mesh_data.update(calc_edges=True)
+    return mesh_data
+
+#faces of a box whose corners are numbered by their bits, 1 for the x, 2 for the y and 4 for the z maximum
+k_aBoxFaces = np.array([[0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4], [2, 6, 7, 3], [0, 4, 6, 2], [1, 3, 7, 5]], dtype=np.int32)
+
+'''
+    Creates a box mesh around vertex positions
+    sName - name of the mesh datablock
+    aPositions - (n, 3) float array of vertex positions
+    returns - the new mesh
+'''
+def BuildBoundingBox(sName, aPositions):
+    if len(aPositions):
+        aMin, aMax = aPositions.min(axis=0), aPositions.max(axis=0)
+    else:
+        aMin = aMax = np.zeros(3, dtype=np.float32)
+    aBits = np.arange(8)[:, None] >> np.arange(3) & 1
+    return BuildMeshFromArrays(sName, np.where(aBits, aMax, aMin), k_aBoxFaces)
+
+'''
+    Records datablocks created by the current import and tags them as built by the importer,
+    so a cancelled import and a scene reset can remove them again
+    importData - the ImportRgm instance
+    aIDs - the new datablocks
+'''
+def RgmIntoBlender_Created(importData, *aIDs):
+    for oID in aIDs:
+        oID["rgm_source"] = importData.sSourceKey
+        importData.createdData.append(oID)
+
+'''
+    Leaves out datablocks that were removed already, eg. by the user, they cannot be passed to bpy.data.batch_remove
+    aIDs - the datablocks
+    returns - array of the datablocks still in the file, without duplicates
+'''
+def RgmIntoBlender_Alive(aIDs):
+    aAlive = []
+    for oID in aIDs:
+        if oID is None:
+            continue
+        try:
+            oID.name
+        except ReferenceError:
+            continue
+        aAlive.append(oID)
+    return list(dict.fromkeys(aAlive))
+
+'''
+    Returns the collection an import links its objects and collections into
+    importData - the ImportRgm instance
+    returns - a collection named after the model if importData.modelCollection is set, None otherwise
+'''
+def RgmIntoBlender_ModelCollection(importData):
+    if not importData.modelCollection:
+        return None
+    if importData.rootCollection is None:
+        importData.rootCollection = bpy.data.collections.new(importData.sModelName)
+        RgmIntoBlender_Created(importData, importData.rootCollection)
+        bpy.context.scene.collection.children.link(importData.rootCollection)
+    return importData.rootCollection
+
+def RgmIntoBlender_LinkObject(importData, sObjectName, mesh_obj):
+    sCollectionName = ObjectCategory(sObjectName)
+    collection = importData.collections.get(sCollectionName)
+    if collection is None:
+        collection = bpy.data.collections.new(sCollectionName)
+        RgmIntoBlender_Created(importData, collection)
+        (RgmIntoBlender_ModelCollection(importData) or bpy.context.scene.collection).children.link(collection)
+        importData.collections[sCollectionName] = collection
+    collection.objects.link(mesh_obj)
+
+'''
+    Creates a placeholder object with a bounding box mesh for every object of a mesh chunk, linked where the real object goes,
+    so the layout of a big model shows up before its meshes are built. RgmIntoBlender_BuildObject swaps the meshes in.
+    importData - the ImportRgm instance, keeps the proxies by chunk key and object name
+    oMeshData - the MeshData of the chunk
+'''
+def RgmIntoBlender_Proxies(importData, oMeshData):
+    aExisting = {oID.get("rgm_name") for oID in importData.existingParts.get(oMeshData.sChunkKey, [])}
+    for oObject in oMeshData.aObjects:
+        if oObject.sObjectName in aExisting:
+            #the object of the earlier import already shows
+            continue
+        proxy_data = BuildBoundingBox(oObject.sObjectName + "_proxy", oObject.aPositions)
+        mesh_obj = bpy.data.objects.new(oObject.sObjectName, proxy_data)
+        mesh_obj.display_type = 'WIRE'
+        RgmIntoBlender_Created(importData, proxy_data, mesh_obj)
+        RgmIntoBlender_LinkObject(importData, oObject.sObjectName, mesh_obj)
+        #no chunk hash, a proxy left behind by an interrupted import is rebuilt by the next update
+        RgmIntoBlender_Tag(importData, mesh_obj, oObject.sObjectName, oMeshData.sChunkKey, "")
+        importData.proxies[(oMeshData.sChunkKey, oObject.sObjectName)] = mesh_obj
+
+'''
+    Marks a datablock as built from a chunk of the imported model, so a later import of the same model can update it
+    importData - the ImportRgm instance
+    oID - the object or material
+    sName - name the importer gave it, the user may rename it
+    sChunkKey, sChunkHash - the chunk it was built from
+'''
+def RgmIntoBlender_Tag(importData, oID, sName, sChunkKey, sChunkHash):
+    oID["rgm_source"] = importData.sSourceKey
+    oID["rgm_name"] = sName
+    oID["rgm_chunk"] = sChunkKey
+    oID["rgm_chunk_hash"] = sChunkHash
+
+'''
+    Collects the objects and materials an earlier import of the model built, by chunk, and the chunk hashes they were built from
+    importData - the ImportRgm instance, fills in existingParts and knownChunkHashes
+'''
+def RgmIntoBlender_FindImported(importData):
+    for aData in (bpy.data.objects, bpy.data.materials):
+        for oID in aData:
+            if oID.get("rgm_source") != importData.sSourceKey:
+                continue
+            sChunkKey = oID.get("rgm_chunk", "")
+            importData.existingParts.setdefault(sChunkKey, []).append(oID)
+            #a chunk whose datablocks disagree, eg. after a cancelled update, is built again
+            sHash = oID.get("rgm_chunk_hash")
+            if importData.knownChunkHashes.setdefault(sChunkKey, sHash) != sHash:
+                importData.knownChunkHashes[sChunkKey] = None
+
+'''
+    Takes a datablock of an earlier import of the model out of importData.existingParts, to be updated in place
+    importData - the ImportRgm instance
+    sChunkKey - the chunk the datablock was built from
+    sName - name the importer gave the datablock
+    returns - the datablock, None if there is none
+'''
+def RgmIntoBlender_TakeExisting(importData, sChunkKey, sName):
+    aExisting = importData.existingParts.get(sChunkKey, [])
+    for i, oID in enumerate(aExisting):
+        try:
+            if oID.get("rgm_name") == sName:
+                return aExisting.pop(i)
+        except ReferenceError:
+            #removed since the import started
+            pass
+    return None
+
+'''
+    Looks up a mesh built from the same geometry by the current job. Meshes of earlier imports are not shared,
+    the user may have edited them since, or they were built with other options.
+    importData - the ImportRgm instance, keeps the meshes by geometry hash, shared by the models of a job
+    sGeometryHash - the ObjectData.sGeometryHash of the object to build
+    returns - the mesh, None if there is none
+'''
+def RgmIntoBlender_FindSharedMesh(importData, sGeometryHash):
+    mesh_data = importData.meshesByHash.get(sGeometryHash)
+    try:
+        if mesh_data is not None and mesh_data.name:
+            return mesh_data
+    except ReferenceError:
+        #removed with a cancelled model of the job
+        del importData.meshesByHash[sGeometryHash]
+    return None
+
+'''
+    Builds one Blender object from decoded object data
+    importData - the ImportRgm instance holding the import options
+    oObject - the ObjectData to build
+    returns - the new object
+'''
+def RgmIntoBlender_BuildObject(importData, oObject, sChunkKey="", sChunkHash=""):
+    mesh_data = None
+    if importData.shareMeshes:
+        mesh_data = RgmIntoBlender_FindSharedMesh(importData, oObject.sGeometryHash)
+    if mesh_data is None:
+        mesh_data = RgmIntoBlender_BuildMesh(importData, oObject)
+    else:
+        DebugPrint("Mesh: " + oObject.sObjectName + " shares " + mesh_data.name)
+
+    #an object of an earlier import gets the new mesh and keeps everything the user changed on it, so does a proxy
+    mesh_obj = importData.proxies.pop((sChunkKey, oObject.sObjectName), None)
+    if mesh_obj is not None:
+        mesh_obj.display_type = 'TEXTURED'
+    else:
+        mesh_obj = RgmIntoBlender_TakeExisting(importData, sChunkKey, oObject.sObjectName)
+    if mesh_obj is not None:
+        importData.swappedData.append((mesh_obj, mesh_obj.data))
+        mesh_obj.data = mesh_data
+    else:
+        mesh_obj = bpy.data.objects.new(oObject.sObjectName, mesh_data)
+        RgmIntoBlender_Created(importData, mesh_obj)
+        RgmIntoBlender_LinkObject(importData, oObject.sObjectName, mesh_obj)
+    RgmIntoBlender_Tag(importData, mesh_obj, oObject.sObjectName, sChunkKey, sChunkHash)
+    return mesh_obj
+
+'''
+    Builds the mesh datablock of an object with all its layers, normals and its material
+    importData - the ImportRgm instance
+    oObject - the ObjectData to build
+    returns - the new mesh
+'''
+def RgmIntoBlender_BuildMesh(importData, oObject):
+    mesh_data = BuildMeshFromArrays(f"{oObject.sObjectName}_data", oObject.aPositions, oObject.aFaces)
+    RgmIntoBlender_Created(importData, mesh_data)
+    mesh_data["rgm_geometry_hash"] = oObject.sGeometryHash
+    importData.meshesByHash[oObject.sGeometryHash] = mesh_data
+
+    for sLayerName, aUVs in oObject.aUVLayers:
+        uv_layer = mesh_data.uv_layers.new(name=sLayerName)
+        uv_layer.data.foreach_set("uv", aUVs.ravel())
+    for sAttributeName, aColours in oObject.aColourAttributes:
+        colour_attribute = mesh_data.color_attributes.new(sAttributeName, 'BYTE_COLOR', 'CORNER')
+        colour_attribute.data.foreach_set("color_srgb", aColours.ravel())
+
+    material = bpy.data.materials.get(oObject.sMaterialName)
+    if material is not None:
+        mesh_data.materials.append(material)
+    mesh_data.shade_smooth()
+
+    #custom split normals from the game data, tangents and binormals are kept as face corner attributes
+    if oObject.aNormals is not None:
+        if oObject.bCornerNormals:
+            mesh_data.normals_split_custom_set(oObject.aNormals)
+        else:
+            mesh_data.normals_split_custom_set_from_vertices(oObject.aNormals)
+    for sAttributeName, aVectors in oObject.aTangentAttributes:
+        attribute = mesh_data.attributes.new(sAttributeName, 'FLOAT_VECTOR', 'CORNER')
+        attribute.data.foreach_set("vector", aVectors.ravel())
+
+    DebugPrint("Mesh: " + oObject.sObjectName + " built!")
+    return mesh_data
+
+def RgmIntoBlender_Skeleton(importData, oSkeleton): #To Do
+    aBones = oSkeleton.aBones
+    armature = bpy.data.armatures.new('Armature')
+    RgmIntoBlender_Created(importData, armature)
+    arm_object = RgmIntoBlender_TakeExisting(importData, oSkeleton.sChunkKey, 'Armature Object')
+    if arm_object is not None:
+        importData.swappedData.append((arm_object, arm_object.data))
+        arm_object.data = armature
+    else:
+        arm_object = bpy.data.objects.new('Armature Object', armature)
+        RgmIntoBlender_Created(importData, arm_object)
+        (RgmIntoBlender_ModelCollection(importData) or bpy.context.collection).objects.link(arm_object)
+    RgmIntoBlender_Tag(importData, arm_object, 'Armature Object', oSkeleton.sChunkKey, oSkeleton.sChunkHash)
+
+    bpy.context.view_layer.objects.active = arm_object
+    bpy.ops.object.mode_set(mode='EDIT', toggle=False)
+    edit_bones = arm_object.data.edit_bones
+    bone_array = []
+
+    #mat = mathutils.Matrix(((-1, 0, 0, 0), (0, -1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
+    #imat = mathutils.Matrix(((-1, 0, 0, 0), (0, -1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
+
+    #mat = mathutils.Matrix(((1, 0, 0, 0), (-1, -1, -1, -1), (-1, -1, -1, -1), (0, 0, 0, 1)))
+    #imat = mathutils.Matrix(((-1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))
+    x_mirror = False
+    # Create bones
+    for k, oBone in enumerate(aBones):
+        parent = oBone.iParent
+        matrix = mathutils.Matrix(((0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 1)))
+        for j in range(3):
+            matrix[j] = oBone.aMatrix[j]
+
+        #matrix = mathutils.Matrix(((0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 1)))
+        #matrix[0] = (-matrix_in[0][0], -matrix_in[0][2], -matrix_in[0][1], -matrix_in[0][3])
+        #matrix[1] = (-matrix_in[2][0], matrix_in[2][2], matrix_in[2][1], matrix_in[2][3])
+        #matrix[2] = (-matrix_in[1][0], matrix_in[1][2], matrix_in[1][1], matrix_in[1][3])
+
+        # Create bone
+        if importData.mirrorAxis:#"orient" in oBone.sName == 0 and matrix[0][0] == -1.0:
+            x_mirror = True
+
+        b = edit_bones.new(oBone.sName)
+        #b.head = (0.0, 0.0, 0.0)
+        b.tail = (0.0, 0.0, 1.0)
+        #newbone.boxSize = [0.05, 0.05, 0.05]
+        #newbone.wireColor = (255, 255, 0)
+
+        # Store new bone
+        bone_array.append(b)
+
+        # Set bone parent & transforms
+        if parent >= 0:
+            #tworld = sworld * transf. matrix * sworld inverse
+            #print("Name: ", oBone.sName)
+            #print("ID: ", k)
+            #print("ParentID: ", parent)
+            #print(matrix)
+            #matrix = imat @ matrix @ mat
+            #print("Matrix: ", matrix)
+            #print("Bonematrix: ", b.matrix)
+            b.parent = bone_array[parent]
+
+            DebugPrint("Parent Bonematrix: ", bone_array[parent].matrix)
+            matrix_i1 = mathutils.Matrix(((0, 0, 0), (0, 0, 0), (0, 0, 0)))
+            matrix_i1[0] = (matrix[0][0], matrix[0][1], matrix[0][2])
+            matrix_i1[1] = (matrix[1][0], matrix[1][1], matrix[1][2])
+            matrix_i1[2] = (matrix[2][0], matrix[2][1], matrix[2][2])
+
+            matrix_p = bone_array[parent].matrix
+            matrix_i2 = mathutils.Matrix(((0, 0, 0), (0, 0, 0), (0, 0, 0)))
+            matrix_i2[0] = (matrix_p[0][0], matrix_p[0][1], matrix_p[0][2])
+            matrix_i2[1] = (matrix_p[1][0], matrix_p[1][1], matrix_p[1][2])
+            matrix_i2[2] = (matrix_p[2][0], matrix_p[2][1], matrix_p[2][2])
+
+            matrix_m = mathutils.Matrix(((0, 0, 0), (0, 0, 0), (0, 0, 0)))
+            matrix_m = matrix_i1 @ matrix_i2
+
+            matrix_o = mathutils.Matrix(((0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 1)))
+
+            if x_mirror == True:
+                #Mirror on x-axis
+                matrix_o[0] = (matrix_m[0][0], matrix_m[0][1], matrix_m[0][2], -matrix[0][3] + matrix_p[0][3])
+                matrix_o[1] = (matrix_m[1][0], matrix_m[1][1], matrix_m[1][2], matrix[1][3] + matrix_p[1][3])
+                matrix_o[2] = (matrix_m[2][0], matrix_m[2][1], matrix_m[2][2], matrix[2][3] + matrix_p[2][3])
+            else:
+                #Mirror on y-axis
+                matrix_o[0] = (matrix_m[0][0], matrix_m[0][1], matrix_m[0][2], matrix[0][3] + matrix_p[0][3])
+                matrix_o[1] = (matrix_m[1][0], matrix_m[1][1], matrix_m[1][2], -matrix[1][3] + matrix_p[1][3])
+                matrix_o[2] = (matrix_m[2][0], matrix_m[2][1], matrix_m[2][2], matrix[2][3] + matrix_p[2][3])
+
+            #print(matrix_o)
+            b.transform(matrix_o)#matrix @ bone_array[parent].matrix)
+            #print("Matrix @ Parent Matrix: ", matrix_o)#matrix @ bone_array[parent].matrix)
+            #print("Neue Bonematrix: ", b.matrix)
+        else:
+            DebugPrint("Name: ", oBone.sName)
+            DebugPrint("ID: ", k)
+            DebugPrint(matrix)
+            matrix_o = mathutils.Matrix(((0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 0), (0, 0, 0, 1)))
+            matrix_o[0] = (matrix[0][0], matrix[0][2], matrix[0][1], matrix[0][3])
+            matrix_o[1] = (matrix[2][0], matrix[2][2], matrix[2][1], matrix[2][3])
+            matrix_o[2] = (matrix[1][0], matrix[1][2], matrix[1][1], matrix[1][3])
+            #print(matrix_o)
+            b.transform(matrix_o)# @ mathutils.Matrix(((-1, 0, 0, 0), (0, -1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1)))#transformation in xzy koordinatensystem
+            #print(b.matrix)
+
+        #Bone created
+        DebugPrint("Bone: " + oBone.sName + " created!")
+    bpy.ops.object.mode_set(mode='OBJECT')
+        
+def RgmIntoBlender_Markers(importData, aMarkers): #To Do
+    for oMarker in aMarkers:
+        # Create marker
+        #marker = Point(size=10)
+        #marker.wireColor = (14, 255, 2)
+        #marker.name = oMarker.sName
+        #marker.parent = getNodeByName(oMarker.sParent, exact=True)
+
+        # Add parameters to marker's User Defines properties
+        #for paramKey, paramValue in oMarker.aParams:
+            #setUserProp(marker, paramKey, paramValue)
+
+        # Set marker transforms
+        if oMarker.sParent != "" and oMarker.sParent is not None:
+            # Marker has a parent (transform in parent space)
+            #pos = mat.translationpart
+            #pos[0] *= -1
+            #rot = mat.rotationpart
+            #rot[0] *= -1
+            #in_coordsys(parent, marker.rotation = rot)
+            #in_coordsys(parent, marker.pos = pos)
+            pass
+        else:
+            pass
+            # Marker has no parent (transform in world space)
+            #marker.transform = mat @ ([[1, 0, 0], [0, 0, 1], [0, -1, 0], [0, 0, 0]])
+
+        # Adjust marker scale (for zooming)
+        #marker.scale = [0.01, 0.01, 0.01]
+
+        # Marker created
+        #print("Marker: " + oMarker.sName + " created!")
+
+'''
+    Loads an image file, an image loaded before from the same path is reused
+    importData - the ImportRgm instance, images it loads are recorded, see RgmIntoBlender_Created
+    sPath - the image file
+    returns - the image
+'''
+def RgmIntoBlender_LoadImageFile(importData, sPath):
+    iCount = len(bpy.data.images)
+    image = bpy.data.images.load(sPath, check_existing=True)
+    if len(bpy.data.images) > iCount:
+        RgmIntoBlender_Created(importData, image)
+    return image
+
+'''
+    Loads a texture of a material. Textures decoded from the model are packed into the .blend file,
+    an image packed by an earlier import is reused while its data is the same.
+    importData - the ImportRgm instance
+    oMaterial - the MaterialData
+    sPath - the texture path, see MaterialData
+    returns - the image
+'''
+def RgmIntoBlender_LoadImage(importData, oMaterial, sPath):
+    pDds = oMaterial.dEmbedded.get(sPath)
+    if pDds is None:
+        return RgmIntoBlender_LoadImageFile(importData, sPath)
+    sDigest = hashlib.blake2b(pDds, digest_size=16).hexdigest()
+    for image in bpy.data.images:
+        if image.get("rgm_embedded") == sDigest:
+            return image
+    image = bpy.data.images.new(os.path.basename(sPath), 1, 1)
+    image.pack(data=pDds, data_len=len(pDds))
+    image.source = 'FILE'
+    image["rgm_embedded"] = sDigest
+    RgmIntoBlender_Created(importData, image)
+    return image
+
+'''
+    Splits the pixels of a Relic normal map into the maps a material can use as they are
+    aPixels - (n, 4) float RGBA pixels, red holds the specular inverted, green the normal's y, blue the gloss and alpha the normal's x
+    returns - (n, 4) RGBA pixels each of the tangent space normal map, the specular and the roughness map
+'''
+def SwizzleNormalMap(aPixels):
+    aNormal = np.ones_like(aPixels)
+    aNormal[:, 0] = aPixels[:, 3]
+    aNormal[:, 1] = aPixels[:, 1]
+    aSpecular = np.ones_like(aPixels)
+    aSpecular[:, :3] = 1.0 - aPixels[:, 0:1]
+    aRoughness = np.ones_like(aPixels)
+    aRoughness[:, :3] = 1.0 - aPixels[:, 2:3]
+    return aNormal, aSpecular, aRoughness
+
+'''
+    Gives the normal, specular and roughness maps of a Relic normal map. They are baked once and written next to it
+    as <texture>_normal.png, _spec.png and _rough.png, later imports load them while they are newer than the normal map.
+    A normal map embedded in the model is baked next to where its file would be, while the baked maps are newer than the model.
+    importData - the ImportRgm instance
+    oMaterial - the MaterialData, its sNormalPath is the .dds normal map
+    returns - array of the three images, None if the normal map could not be loaded
+'''
+def RgmIntoBlender_BakedNormalMaps(importData, oMaterial):
+    sNormalPath = oMaterial.sNormalPath
+    bEmbedded = sNormalPath in oMaterial.dEmbedded
+    sBase = os.path.splitext(sNormalPath)[0]
+    aPaths = [sBase + "_normal.png", sBase + "_spec.png", sBase + "_rough.png"]
+    try:
+        fSourceTime = os.path.getmtime(importData.sModelPath if bEmbedded else sNormalPath)
+        bBaked = all(os.path.isfile(sPath) and os.path.getmtime(sPath) >= fSourceTime for sPath in aPaths)
+        if not bBaked:
+            with importData.tracer.span("normal map bake", texture=sNormalPath) as oSpan:
+                source = RgmIntoBlender_LoadImage(importData, oMaterial, sNormalPath)
+                source.colorspace_settings.is_data = True
+                iWidth, iHeight = source.size
+                aPixels = np.empty(iWidth * iHeight * 4, dtype=np.float32)
+                source.pixels.foreach_get(aPixels)
+                for sPath, aMap in zip(aPaths, SwizzleNormalMap(aPixels.reshape(-1, 4))):
+                    image = bpy.data.images.new(os.path.basename(sPath), iWidth, iHeight, alpha=False, is_data=True)
+                    image.pixels.foreach_set(aMap.ravel())
+                    image.filepath_raw = sPath
+                    image.file_format = 'PNG'
+                    image.save()
+                    bpy.data.images.remove(image)
+                if source.users == 0 and not bEmbedded:
+                    #frees the decoded pixels, the material uses the baked maps
+                    bpy.data.images.remove(source)
+                oSpan.set(pixels=iWidth * iHeight)
+            DebugPrint("Image " + sNormalPath + " baked")
+        aImages = [RgmIntoBlender_LoadImageFile(importData, sPath) for sPath in aPaths]
+    except (OSError, RuntimeError) as error:
+        print("Image " + sNormalPath + " could not be baked: ", error)
+        return None
+    for image in aImages:
+        image.colorspace_settings.is_data = True
+        if not bBaked:
+            #an image loaded before from the same path shows the old bake
+            image.reload()
+    return aImages
+
+'''
+    Sets up a material with baked maps: diffuse and alpha, normal, specular and roughness maps straight into the BSDF
+    importData - the ImportRgm instance
+    material - the material, with an output and a Principled BSDF node
+    BsdfNode - the Principled BSDF node
+    oMaterial - the MaterialData
+'''
+def RgmIntoBlender_BakedMaterial(importData, material, BsdfNode, oMaterial):
+    DiffImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+    DiffImageNode.location = Vector((-750.0, 400.0))
+    try:
+        DiffImageNode.image = RgmIntoBlender_LoadImage(importData, oMaterial, oMaterial.sDiffusePath)
+        DiffImageNode.image.colorspace_settings.is_data = False
+        DebugPrint("Image " + oMaterial.sDiffusePath + " loaded")
+    except:
+        print("Image " + oMaterial.sDiffusePath + " could not be loaded")
+    material.node_tree.links.new(BsdfNode.inputs[0], DiffImageNode.outputs[0])
+    material.node_tree.links.new(BsdfNode.inputs[4], DiffImageNode.outputs[1])
+
+    aImages = RgmIntoBlender_BakedNormalMaps(importData, oMaterial)
+    if aImages is None:
+        return
+    NormImage, SpecImage, RoughImage = aImages
+    NormImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+    NormMapNode = material.node_tree.nodes.new('ShaderNodeNormalMap')
+    SpecImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+    RoughImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+    NormImageNode.image, SpecImageNode.image, RoughImageNode.image = NormImage, SpecImage, RoughImage
+    NormImageNode.location = Vector((-750.0, -350.0))
+    NormMapNode.location = Vector((-250.0, -350.0))
+    SpecImageNode.location = Vector((-750.0, 100.0))
+    RoughImageNode.location = Vector((-750.0, -125.0))
+    material.node_tree.links.new(BsdfNode.inputs[2], RoughImageNode.outputs[0])
+    material.node_tree.links.new(BsdfNode.inputs[5], NormMapNode.outputs[0])
+    material.node_tree.links.new(BsdfNode.inputs[12], SpecImageNode.outputs[0])
+    material.node_tree.links.new(NormMapNode.inputs[1], NormImageNode.outputs[0])
+
+def RgmIntoBlender_Material(importData, oMaterial):
+    diffPath = oMaterial.sDiffusePath
+    normPath = oMaterial.sNormalPath
+
+    if oMaterial.bImportError == False:
+        DebugPrint("Material Name: " + oMaterial.sName)          
+
+        #a material of an earlier import is rebuilt in place, so the meshes using it stay linked to it
+        material = RgmIntoBlender_TakeExisting(importData, oMaterial.sChunkKey, oMaterial.sName)
+        if material is not None:
+            material.node_tree.nodes.clear()
+            OutputNode = material.node_tree.nodes.new('ShaderNodeOutputMaterial')
+            BsdfNode = material.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
+            OutputNode.location = Vector((300.0, 300.0))
+            material.node_tree.links.new(OutputNode.inputs[0], BsdfNode.outputs[0])
+        else:
+            material = bpy.data.materials.new(oMaterial.sName)
+            RgmIntoBlender_Created(importData, material)
+            material.use_nodes = True
+            BsdfNode = material.node_tree.nodes.get('Principled BSDF')
+        RgmIntoBlender_Tag(importData, material, oMaterial.sName, oMaterial.sChunkKey, oMaterial.sChunkHash)
+        if importData.bakeMaps:
+            RgmIntoBlender_BakedMaterial(importData, material, BsdfNode, oMaterial)
+            return
+
+        DiffImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+        NormImageNode = material.node_tree.nodes.new('ShaderNodeTexImage')
+        NormMapNode = material.node_tree.nodes.new('ShaderNodeNormalMap')
+        SepColorNode = material.node_tree.nodes.new('ShaderNodeSeparateColor')
+        CombColorNode = material.node_tree.nodes.new('ShaderNodeCombineColor')
+        SubtractGlossNode = material.node_tree.nodes.new('ShaderNodeMath')
+        SubtractSpecNode = material.node_tree.nodes.new('ShaderNodeMath')
+        
+        try:
+            DiffImage = RgmIntoBlender_LoadImage(importData, oMaterial, diffPath)
+            DiffImageNode.image = DiffImage
+            DiffImageNode.image.colorspace_settings.is_data = False
+            DebugPrint("Image " +  diffPath + " loaded")
+        except:
+            print("Image " +  diffPath + " could not be loaded")
+        
+        try:
+            NormImage = RgmIntoBlender_LoadImage(importData, oMaterial, normPath)
+            NormImageNode.image = NormImage
+            NormImageNode.image.colorspace_settings.is_data = True
+            DebugPrint("Image " +  normPath + " loaded")
+        except:
+            print("Image " +  normPath + " could not be loaded")
+                                          
+        DiffImageNode.location = Vector((-1250.0, 400.0))
+        NormImageNode.location = Vector((-1250.0, 50.0))
+        NormMapNode.location = Vector((-250.0, 200.0))
+        SepColorNode.location = Vector((-750.0, 0.0))
+        CombColorNode.location = Vector((-500.0, 200.0))
+        SubtractGlossNode.location = Vector((-250.0, 0.0))
+        SubtractSpecNode.location = Vector((-250.0, 400.0))
+        
+        SubtractSpecNode.operation = 'SUBTRACT'
+        SubtractGlossNode.operation = 'SUBTRACT'
+        
+        CombColorNode.inputs[2].default_value = 1.0
+        SubtractSpecNode.inputs[0].default_value = 1.0
+        SubtractGlossNode.inputs[0].default_value = 1.0
+        
+        material.node_tree.links.new(BsdfNode.inputs[0], DiffImageNode.outputs[0])
+        material.node_tree.links.new(BsdfNode.inputs[2], SubtractGlossNode.outputs[0])
+        material.node_tree.links.new(BsdfNode.inputs[4], DiffImageNode.outputs[1])
+        material.node_tree.links.new(BsdfNode.inputs[5], NormMapNode.outputs[0])
+        material.node_tree.links.new(BsdfNode.inputs[12], SubtractSpecNode.outputs[0])
+        material.node_tree.links.new(NormMapNode.inputs[1], CombColorNode.outputs[0])
+        material.node_tree.links.new(SubtractGlossNode.inputs[1], SepColorNode.outputs[2])
+        material.node_tree.links.new(SubtractSpecNode.inputs[1], SepColorNode.outputs[0])
+        material.node_tree.links.new(CombColorNode.inputs[0], NormImageNode.outputs[1])
+        material.node_tree.links.new(CombColorNode.inputs[1], SepColorNode.outputs[1])
+        material.node_tree.links.new(SepColorNode.inputs[0], NormImageNode.outputs[0])
+
+'''
+    Builds a model in Blender step by step while it is decoded on another thread. Skeletons and materials are built
+    as they are decoded, meshes once the material they use is built, and in progressive mode every mesh chunk gets
+    its proxies as soon as it is decoded.
+    importData - the ImportRgm instance
+    oModelData - the ModelData DecodeModel is filling
+    yields - True after every datablock that got built, False while it waits for the decoder, see ModelData.oChanged
+'''
+def RgmIntoBlender_BuildSteps(importData, oModelData):
+    iPart = 0
+    aBuiltMaterials = set() #FOLDMTRL chunk keys that are built or unchanged
+    aWaiting = [] #MeshData whose material is not built yet
+    aReady = deque() #(ObjectData, MeshData) that can be built
+    while True:
+        oModelData.oChanged.clear()
+        bComplete = oModelData.bComplete
+
+        # Parts decoded since the last look
+        while iPart < len(oModelData.aParts):
+            sKind, oData = oModelData.aParts[iPart]
+            iPart += 1
+            if sKind == "skeleton":
+                with importData.tracer.span("skeleton build", bones=len(oData.aBones)):
+                    RgmIntoBlender_Skeleton(importData, oData)
+                yield True
+            elif sKind == "mesh":
+                if importData.progressive:
+                    with importData.tracer.span("proxy build", objects=len(oData.aObjects)):
+                        RgmIntoBlender_Proxies(importData, oData)
+                    yield True
+                aWaiting.append(oData)
+            elif sKind == "material":
+                with importData.tracer.span("material build", material=oData.sName):
+                    RgmIntoBlender_Material(importData, oData)
+                aBuiltMaterials.add(oData.sChunkKey)
+                yield True
+            elif sKind == "markers":
+                RgmIntoBlender_Markers(importData, oData)
+                yield True
+            elif sKind == "unchanged":
+                #the scene already holds this chunk, keep what was built from it
+                importData.existingParts.pop(oData, None)
+                aBuiltMaterials.add(oData)
+                yield True
+
+        # Meshes whose material is built, all of them once decoding has ended
+        aPending = set() if bComplete else oModelData.pendingMaterials(aBuiltMaterials)
+        for oData in [oData for oData in aWaiting if oData.sMaterialName not in aPending]:
+            aWaiting.remove(oData)
+            aReady.extend((oObject, oData) for oObject in oData.aObjects)
+
+        # One object at a time, so parts decoded meanwhile come first
+        if aReady:
+            oObject, oData = aReady.popleft()
+            with importData.tracer.span("mesh build", object=oObject.sObjectName, vertices=len(oObject.aPositions), faces=len(oObject.aFaces)):
+                RgmIntoBlender_BuildObject(importData, oObject, oData.sChunkKey, oData.sChunkHash)
+            yield True
+        elif bComplete:
+            return
+        else:
+            yield False
+
+'''
+    Counts the steps RgmIntoBlender_BuildSteps takes for the parts decoded so far
+    oModelData - the ModelData from DecodeModel
+    bProgressive - mesh chunks get proxies, see ImportRgm.progressive
+    returns - the number of steps
+'''
+def CountBuildSteps(oModelData, bProgressive=False):
+    iSteps = 0
+    for sKind, oData in oModelData.aParts:
+        iSteps += len(oData.aObjects) + int(bProgressive) if sKind == "mesh" else 1
+    return iSteps
+
+#bytes per element of the mesh attribute data types
+k_dAttributeBytes = {'FLOAT': 4, 'INT': 4, 'FLOAT_VECTOR': 12, 'FLOAT_COLOR': 16, 'BYTE_COLOR': 4, 'STRING': 1, 'BOOLEAN': 1,
+    'FLOAT2': 8, 'INT8': 1, 'INT16_2D': 4, 'INT32_2D': 8, 'QUATERNION': 16, 'FLOAT4X4': 64}
+
+'''
+    Estimates the memory of a mesh datablock from its attributes and topology
+    mesh_data - the mesh
+    returns - the size in bytes
+'''
+def RgmIntoBlender_MeshBytes(mesh_data):
+    iBytes = 0
+    aNames = set()
+    for attribute in mesh_data.attributes:
+        iBytes += len(attribute.data) * k_dAttributeBytes.get(attribute.data_type, 4)
+        aNames.add(attribute.name)
+    #topology is not listed with the attributes in every Blender version
+    if ".corner_vert" not in aNames:
+        iBytes += len(mesh_data.loops) * 8 + len(mesh_data.edges) * 8 + len(mesh_data.polygons) * 4
+    if mesh_data.has_custom_normals:
+        iBytes += len(mesh_data.loops) * 4
+    return iBytes
+
+'''
+    Adds the sizes of the meshes and images an import created or used to the memory account of its tracer.
+    Images count with their decoded pixels, which Blender loads when they are first drawn.
+    importData - the ImportRgm instance
+'''
+def RgmIntoBlender_AccountDatablocks(importData):
+    oMemory = importData.tracer.oMemory
+    aImages = {}
+    for oID in RgmIntoBlender_Alive(importData.createdData):
+        if isinstance(oID, bpy.types.Mesh):
+            oMemory.addDatablock("mesh", oID.name, RgmIntoBlender_MeshBytes(oID))
+        elif isinstance(oID, bpy.types.Material) and oID.node_tree is not None:
+            for node in oID.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image is not None:
+                    aImages[node.image.name] = node.image
+    for sName, image in aImages.items():
+        iWidth, iHeight = image.size
+        oMemory.addDatablock("image", sName, iWidth * iHeight * image.channels * (4 if image.is_float else 1))
+
+def RgmIntoBlender(importData, oRgm):
+    oModelData = DecodeModel(importData, oRgm)
+    for step in RgmIntoBlender_BuildSteps(importData, oModelData):
+        pass
+
+'''
+def RgaIntoMax_FoldAnim(oRga, oChunk, sFirstFrame):
+    class sChannelInfo:
+        def __init__(self, name, type, dataType, subType=None, object=None, frameValueOffset=None, frameTimeOffset=None, unknown=None):
+            self.name = name
+            self.type = type
+            self.subType = subType
+            self.dataType = dataType
+            self.object = object
+            self.frameValueOffset = frameValueOffset
+            self.frameTimeOffset = frameTimeOffset
+            self.unknown = unknown
+            self.keys = []
+
+    class sKeyFrame:
+        def __init__(self, time=0, rotation=None, position=None):
+            self.time = time
+            self.rotation = rotation
+            self.position = position
+
+    # Get first chunk
+    foldCmps = oChunk.aChildren[1]
+
+    # Read animation info
+    dataInfo = foldCmps.aChildren[1]
+    fseek(oRga.fFile, dataInfo.iDataPosition, SEEK_SET)
+    duration = ReadFloat(oRga.fFile)
+
+    # Read animations channels
+    dataChrc = foldCmps.aChildren[2]
+    fseek(oRga.fFile, dataChrc.iDataPosition, SEEK_SET)
+
+    # Read number of channels
+    numChannels = ReadLong(oRga.fFile, unsigned=True)
+
+    # Read animation data size
+    dataSize = ReadLong(oRga.fFile, unsigned=True)
+
+    # Read channels
+    channels = [None] * numChannels
+    for i in range(numChannels):
+        # Read channel
+        channel = sChannelInfo()
+        tokens = filterString(read_string_n(oRga.fFile, ReadLong(oRga.fFile, unsigned=True)), ":")
+        channel.type = tokens[1]
+        channel.name = tokens[2]
+        channel.dataType = ReadLong(oRga.fFile, unsigned=True)
+        channel.keys = [None] * ReadLong(oRga.fFile, unsigned=True)
+        channel.frameValueOffset = ReadLong(oRga.fFile, unsigned=True)
+        channel.frameTimeOffset = ReadLong(oRga.fFile, unsigned=True)
+        channel.unknown = ReadFloat(oRga.fFile)
+
+        # Find channel object
+        if channel.type == "bone":
+            bones = getNodeByName(channel.name, exact=True, ignoreCase=True, all=True)
+            for bone in bones:
+                if channel.object is None and bone.boneEnable:
+                    channel.object = bone
+
+        elif channel.type == "material":
+            tokens = filterString(channel.name, ":")
+            channel.subType = tokens[3]
+            multiMat = getMeditMaterial(1)
+            for mat in multiMat.materialList:
+                if channel.object is None and mat.name == tokens[1]:
+                    channel.object = mat
+
+        # Store channel
+        channels[i] = channel
+
+    # Setup time configuration
+    stopAnimation()
+    frameRate = 30
+    animationRange = interval(0, (duration * frameRate - 1))
+    timeConfiguration.playbackSpeed = 3
+    sliderTime = 0
+
+    # Initialize matrices
+    mat = [[-1, 0, 0], [0, 1, 0], [0, 0, 1], [0, 0, 0]]
+    imat = inverse(mat)
+
+    # Read key frames
+    for channel in channels:
+        if channel.dataType != 3 and channel.dataType != 4:
+            print("WARNING: Channel '" + channel.name + "': unsupported data type (" + str(channel.dataType) + ")")
+
+        # Skip 48 bytes for type 5 (unknown)
+        if channel.dataType == 5:
+            fseek(oRga.fFile, 48, SEEK_CUR)
+
+        # Read key frame values
+        for i in range(channel.keys.count):
+            # Create key frame
+            keyFrame = sKeyFrame()
+
+            # Read key frame
+            if channel.dataType == 0:  # Material param value
+                keyFrame.position = ReadFloat(oRga.fFile)
+
+            elif channel.dataType == 3:  # Rotation
+                keyFrame.rotation = quat(ReadFloat(oRga.fFile), ReadFloat(oRga.fFile), ReadFloat(oRga.fFile), ReadFloat(oRga.fFile))
+
+            elif channel.dataType == 4:  # Rotation, Position
+                keyFrame.rotation = quat(ReadFloat(oRga.fFile), ReadFloat(oRga.fFile), ReadFloat(oRga.fFile), ReadFloat(oRga.fFile))
+                keyFrame.position = point3(ReadFloat(oRga.fFile), ReadFloat(oRga.fFile), ReadFloat(oRga.fFile))
+
+            elif channel.dataType == 5:  # Unknown
+                keyFrame.position = ReadFloat(oRga.fFile)
+
+            # Store key frame
+            channel.keys[i] = keyFrame
+
+        # Animate
+        with animate(on=True):
+            for i in range(channel.keys.count):
+                # Get key frame
+                keyFrame = channel.keys[i]
+
+                # Read key frame time
+                keyFrame.time = ReadFloat(oRga.fFile)
+
+                # Set frame
+                if channel.object is not None and (sFirstFrame == "false" or i == 1):
+                    frame = int(keyFrame.time * (duration * frameRate - 1))
+                    at(time=frame):
+                        if channel.dataType == 0:
+                            for map in channel.object.maps:
+                                if map is not None:
+                                    if channel.subType == "diffuse_offsetu":
+                                        map.coords.U_Offset = -keyFrame.position
+                                    elif channel.subType == "diffuse_offsetv":
+                                        map.coords.V_Offset = -keyFrame.position
+                        elif channel.dataType == 3:
+                            matrix = keyFrame.rotation as matrix3
+                            if channel.object.parent is not None:
+                                matrix = imat * matrix * mat
+                                in coordsys parent channel.object.rotation = matrix.rotation
+                            else:
+                                matrix *= [[1, 0, 0], [0, 0, 1], [0, -1, 0], [0, 0, 0]]
+                                channel.object.rotation = matrix.rotation
+                        elif channel.dataType == 4:
+                            matrix = keyFrame.rotation as matrix3
+                            matrix.position = keyFrame.position
+                            if channel.object.parent is not None:
+                                matrix = imat * matrix * mat
+                                in coordsys parent channel.object.rotation = matrix.rotation
+                                in coordsys parent channel.object.pos = matrix.position
+                            else:
+                                mtrx = [[0, 0, 0], [0, 0, 0], [0, 0, 0], [0, 0, 0]]
+                                mtrx.row1 = [matrix[1][1], matrix[3][1], -matrix[2][1]]
+                                mtrx.row2 = [-matrix[1][2], -matrix[3][2], matrix[2][2]]
+                                mtrx.row3 = [-matrix[1][3], -matrix[3][3], matrix[2][3]]
+                                mtrx.row4 = [-matrix[4][1], -matrix[4][3], matrix[4][2]]
+                                channel.object.transform = mtrx
+                        elif channel.dataType == 5:
+                            # TODO
+                            pass
+
+    # Add stale modifier to unused bones
+    if Relic_SceneCAs is not None:
+        for obj in $objects:
+            if obj.boneEnable:
+                if obj.pos.controller.keys.count == 0 and obj.rotation.controller.keys.count == 0:
+                    CustAttributes.add(obj, Relic_SceneCAs[20], BaseObject=True)
+    else:
+        print("WARNING: Relic Custom Attributes not found! Stale modifier will not be applied.")
+
+def rga_into_max(oRga, sSavePath):
+    sRefFilePath = os.path.join(sSavePath, "Model", "Reference.max")
+    sAnimationPath = os.path.join(sSavePath, "Animations")
+
+    # Get root chunk
+    foldModl = oRga.aChunks[2]
+
+    # Get number of animations
+    dataInfo = foldModl.aChildren[1]
+    oRga.fFile.seek(dataInfo.iDataPosition)
+    oRga.fFile.seek(20, os.SEEK_CUR)
+    numAnimations = read_long(oRga.fFile)  # unsigned
+
+    # Read animations
+    for i in range(1, numAnimations + 1):
+        foldAnim = foldModl.aChildren[i + 1]
+
+        # Load reference model
+        load_max_file(sRefFilePath)
+
+        # Read animation
+        rga_into_max_fold_anim(oRga, foldAnim)
+
+        # Create sub directories (if needed)
+        os.makedirs(os.path.join(sAnimationPath, get_filename_path(foldAnim.sName)), exist_ok=True)
+
+        # Save animation
+        save_max_file(os.path.join(sAnimationPath, f"{foldAnim.sName}.max"))  # useNewFile: False
+
+        # Update progress
+        progress_update(100.0 * i / numAnimations)
+
+        # Animation imported
+        print(f"Animation: {foldAnim.sName} imported!")
+
+    # Load back reference model
+    load_max_file(sRefFilePath)
+
+'''
+# Import entry point
+class ImportRgm():
+    def __init__(self) -> None:
+        self.resetScene = False
+        self.importTextures = False
+        self.importAnimations = False
+        self.importMeshes = True
+        self.importBones = False
+        self.importDatamarks = False
+        self.importDirectory = 'Work'
+        self.mirrorAxis = False
+        self.weldVertices = False
+        self.weldThreshold = 0.00001
+        self.importNormals = True
+        self.shareMeshes = True #objects with identical geometry use one mesh datablock
+        self.updateExisting = True #update what an earlier import of the model built instead of adding a copy
+        self.importCategories = {'Normal', 'Crushed', 'Wrecked', 'Tread'} #damage states to import, see ObjectCategory
+        self.objectFilter = "" #comma separated object name patterns, empty imports all objects
+        self.vertexComponents = {'UVS', 'COLOURS', 'TANGENTS'} #optional vertex components to import, see NeededVertexComponents
+        self.streamBudget = 0 #MB for decoding a vertex buffer window by window, 0 decodes whole buffers, see DecodeVertexWindows
+        self.fileMap = None #the model file mapped by decodeRgm while streamBudget is set, closed once the model is built, see closeFileMap
+        self.progressive = False #show bounding box proxies of all objects before building their meshes, see RgmIntoBlender_Proxies
+        self.proxies = {} #proxy objects waiting for their mesh, by (chunk key, object name)
+        self.existingParts = {} #datablocks of an earlier import by chunk key, see RgmIntoBlender_FindImported
+        self.knownChunkHashes = {} #chunk hashes of an earlier import by chunk key
+        self.swappedData = [] #(object, its previous data) of objects updated in place
+        self.meshesByHash = {} #meshes built by the current job by geometry hash, see RgmIntoBlender_FindSharedMesh
+        self.collections = {} #collections created by the current import, by name
+        self.modelCollection = False #put everything into a collection named after the model
+        self.rootCollection = None
+        self.createdData = [] #datablocks created by the current import
+        self.oModelData = None #decoded model, filled by decodeRgm while the scene is built from it
+        self.decodeStarted = threading.Event() #set once oModelData exists or the model failed to load
+        self.decodeFinished = threading.Event()
+        self.cancelled = False
+        self.sAssetDirectory = "C:/Users/Carsten/Desktop/coh/CoH2" #assets/data" #organized COH file directory     
+        self.sWorkingDirectory = "" #rgm file directory
+        self.debug = False #print the import log and write a timing trace next to the model
+        self.profile = 'OFF' #'CPROFILE' or 'SAMPLING' profiles the import, see profileRgm
+        self.decodeProfiler = None #Profiler decodeRgm runs under on its thread, see profileRgm
+        self.memoryReport = False #measure the memory of every stage and the datablocks built, see finishMemory
+        self.bakeMaps = False #materials use normal, specular and roughness maps split from the normal map, see RgmIntoBlender_BakedNormalMaps
+        self.tracer = Tracer()
+        
+        self.sModelName = "" #panzerfaust
+        self.sModelPath = "" #.rgm
+        self.sSourceKey = "" #normalized model path, tags the datablocks built from the model
+        
+    def setData(self, resetScene, modelPath, importTextures, importAnimations, importDirectory, importMeshes, importBones, importDatamarks, mirrorAxis, weldVertices=False, weldThreshold=0.00001, importNormals=True, debug=False, shareMeshes=True, updateExisting=True, importCategories=None, objectFilter="", vertexComponents=None, streamBudget=0, profile='OFF', progressive=False, memoryReport=False, bakeMaps=False):
+        self.resetScene = resetScene
+        self.importTextures = importTextures
+        self.importAnimations = importAnimations
+        self.importDirectory = importDirectory
+        self.importMeshes = importMeshes
+        self.importBones = importBones
+        self.importDatamarks = importDatamarks
+        self.mirrorAxis = mirrorAxis
+        self.weldVertices = weldVertices
+        self.weldThreshold = weldThreshold
+        self.importNormals = importNormals
+        self.debug = debug
+        self.shareMeshes = shareMeshes
+        self.updateExisting = updateExisting
+        if importCategories is not None:
+            self.importCategories = set(importCategories)
+        self.objectFilter = objectFilter
+        if vertexComponents is not None:
+            self.vertexComponents = set(vertexComponents)
+        self.streamBudget = streamBudget
+        self.profile = profile
+        self.progressive = progressive
+        self.memoryReport = memoryReport
+        self.bakeMaps = bakeMaps
+        self.sWorkingDirectory = os.path.dirname(modelPath).replace('\\', '/')
+        #directory = os.path.dirname(os.path.abspath(sFilename)).replace('\\', '/')
+        self.sModelPath = modelPath
+        self.sModelName = Path(modelPath).stem
+        self.sSourceKey = os.path.normcase(os.path.abspath(modelPath)).replace('\\', '/')
+
+    def beginBuild(self):
+        self.collections = {}
+        self.rootCollection = None
+        self.createdData = []
+        self.meshesByHash = {}
+        self.existingParts = {}
+        self.knownChunkHashes = {}
+        self.swappedData = []
+        self.proxies = {}
+        self.oModelData = None
+        self.decodeStarted = threading.Event()
+        self.decodeFinished = threading.Event()
+        self.cancelled = False
+        self.tracer = Tracer(self.debug, MemoryAccount() if self.memoryReport else None)
+        trace.bDebug = self.debug
+        if self.updateExisting:
+            RgmIntoBlender_FindImported(self)
+
+    # Removes everything earlier imports built, see RgmIntoBlender_Created, in one go. Data the user made is kept.
+    def clearScene(self):
+        aImported = []
+        for aData in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures, bpy.data.materials, bpy.data.collections, bpy.data.images):
+            aImported.extend(oID for oID in aData if "rgm_source" in oID)
+        if aImported:
+            bpy.data.batch_remove(aImported)
+
+    # Parses and decodes the model into self.oModelData. Does not touch Blender, so it can run on a worker thread,
+    # the main thread can build the parts decoded so far meanwhile, see RgmIntoBlender_BuildSteps.
+    def decodeRgm(self):
+        if self.decodeProfiler is not None:
+            oProfiler, self.decodeProfiler = self.decodeProfiler, None
+            return oProfiler.run(self.decodeRgm)
+        try:
+            oRgm = Chunky()
+            with self.tracer.span("chunk scan", file=self.sModelName) as oSpan:
+                bLoaded = oRgm.loadFromFile(self.sModelPath)
+                if bLoaded:
+                    oSpan.set(chunks=oRgm.iChunkCount, bytes=os.path.getsize(self.sModelPath))
+            if not bLoaded:
+                print("Unable to load file")
+                return False
+            if self.streamBudget > 0:
+                self.fileMap = MapChunkFile(self.sModelPath)
+            self.oModelData = ModelData()
+            self.decodeStarted.set()
+            with self.tracer.span("decode model", file=self.sModelName):
+                DecodeModel(self, oRgm, self.oModelData)
+            return True
+        finally:
+            if self.cancelled:
+                #the job may have stopped before the file was mapped
+                self.closeFileMap()
+            self.decodeStarted.set()
+            self.decodeFinished.set()
+
+    # Closes the mapping of the model file once the model is built or given up, see fileMap
+    def closeFileMap(self):
+        oMap, self.fileMap = self.fileMap, None
+        CloseChunkFile(oMap)
+
+    # Builds the decoded model, yields after every datablock
+    def buildSteps(self):
+        return RgmIntoBlender_BuildSteps(self, self.oModelData)
+
+    # Removes what an updated import replaced: data swapped out of objects, and datablocks of chunks that were rebuilt without them
+    # or that the model does not have anymore. Chunks left out by the import options keep their datablocks.
+    def finishUpdate(self):
+        aRebuilt = {oSkeleton.sChunkKey for oSkeleton in self.oModelData.aSkeletons}
+        aRebuilt.update(oData.sChunkKey for sKind, oData in self.oModelData.aParts if sKind in ("mesh", "material"))
+        dFiltered = {oData.sChunkKey: set(oData.aFilteredNames) for sKind, oData in self.oModelData.aParts if sKind == "mesh"}
+        aRemove = [oData for oOwner, oData in self.swappedData if oData is not None and oData.users == 0]
+        for sChunkKey, aExisting in self.existingParts.items():
+            if sChunkKey not in self.oModelData.aChunkKeys:
+                aRemove.extend(aExisting)
+            elif sChunkKey in aRebuilt:
+                #objects left out by the object filters are kept
+                aFiltered = dFiltered.get(sChunkKey, set())
+                aRemove.extend(oID for oID in aExisting if oID.get("rgm_name") not in aFiltered)
+        self.swappedData = []
+        self.existingParts = {}
+        aRemove = RgmIntoBlender_Alive(aRemove)
+        if aRemove:
+            #eg. swapped out proxy meshes, a rollback of the job must not remove them again
+            aRemoved = set(aRemove)
+            self.createdData = [oID for oID in RgmIntoBlender_Alive(self.createdData) if oID not in aRemoved]
+            bpy.data.batch_remove(aRemove)
+
+    # Gives objects updated in place their previous data back, for a cancelled import
+    def restoreSwapped(self):
+        for oOwner, oData in reversed(self.swappedData):
+            oOwner.data = oData
+        self.swappedData = []
+
+    # Removes everything this import built so far, so the scene is left as it was
+    def discardBuild(self):
+        self.restoreSwapped()
+        aCreated = RgmIntoBlender_Alive(self.createdData)
+        self.createdData = []
+        if aCreated:
+            bpy.data.batch_remove(aCreated)
+
+    # Prints the per stage timings and writes them as a Chrome trace (<model>_trace.json), only in debug mode
+    def finishTrace(self):
+        if not self.tracer.bEnabled:
+            return
+        print("Import timings of " + self.sModelName + ":")
+        print(self.tracer.summary())
+        sTracePath = os.path.splitext(self.sModelPath)[0] + "_trace.json"
+        try:
+            self.tracer.exportChromeTrace(sTracePath)
+            print("Trace written to " + sTracePath)
+        except OSError as error:
+            print("Unable to write trace: ", error)
+
+    # Prints the memory of every stage and of the datablocks built and writes them as JSON (<model>_memory.json), only with memoryReport
+    def finishMemory(self):
+        oMemory = self.tracer.oMemory
+        if oMemory is None:
+            return
+        oMemory.stop()
+        RgmIntoBlender_AccountDatablocks(self)
+        print("Import memory of " + self.sModelName + ":")
+        print(oMemory.summary())
+        sReportPath = os.path.splitext(self.sModelPath)[0] + "_memory.json"
+        try:
+            oMemory.exportJson(sReportPath)
+            print("Memory report written to " + sReportPath)
+        except OSError as error:
+            print("Unable to write memory report: ", error)
+
+    # Imports the model before returning, built while it is decoded on a worker thread like any ImportRgmJob.
+    # Returns the job and its end state, 'FINISHED' or 'CANCELLED', the job holds the errors.
+    def loadRgm(self):
+        oJob = ImportRgmJob([self], 1)
+        oJob.start()
+        sState = oJob.update(float('inf'), bBlocking=True)
+        #the decoding thread has ended, and so has its profile
+        concurrent.futures.wait([future for future in oJob.aFutures if future is not None])
+        return oJob, sState
+
+    # Runs loadRgm under the profiler chosen by self.profile, decoding on its thread included. The hot functions are written
+    # to the text datablock "<model> profile" and the profile is saved next to the model (<model>_profile.prof).
+    # Returns the text, and the job and end state of loadRgm.
+    def profileRgm(self):
+        oProfiler = Profiler(self.profile)
+        self.decodeProfiler = oProfiler.threadProfiler()
+        oJob, sState = oProfiler.run(self.loadRgm)
+        self.decodeProfiler = None
+        sName = self.sModelName + " profile"
+        oText = bpy.data.texts.get(sName) or bpy.data.texts.new(sName)
+        oText.clear()
+        oText.write("Profile of the import of " + self.sModelPath + "\n\n" + oProfiler.report())
+        try:
+            print("Profile written to " + oProfiler.save(os.path.splitext(self.sModelPath)[0] + "_profile"))
+        except OSError as error:
+            print("Unable to write profile: ", error)
+        return oText, oJob, sState
+
+'''
+    Runs the import of one or more models: all models are parsed and decoded in parallel on a thread pool,
+    and built on the main thread in the order given, a few datablocks at a time by calling update(),
+    eg. from a timer. A model is built while it is decoded, so building overlaps with reading and decoding.
+    Models measured for memory, see ImportRgm.memoryReport, are decoded one at a time and built once decoded.
+    A model that fails to decode or build is removed again, the other models are kept, see aFailed.
+    aImporters - array of ImportRgm instances to run, the resetScene option of the first one is used
+    iWorkers - number of decoding threads, 0 picks one per model up to the number of CPUs
+'''
+class ImportRgmJob():
+    def __init__(self, aImporters, iWorkers=0):
+        self.aImporters = aImporters
+        self.iWorkers = iWorkers if iWorkers > 0 else min(len(aImporters), os.cpu_count() or 1)
+        self.executor = None
+        self.aFutures = []
+        self.aFailed = [] #paths of models that could not be loaded
+        self.error = None
+        self.iCurrent = 0 #index of the model being built
+        self.steps = None
+        self.iStepsDone = 0
+        self.fProgress = 0.0
+
+    def start(self):
+        if self.aImporters[0].resetScene:
+            self.aImporters[0].clearScene()
+        dMeshesByHash = {}
+        for importer in self.aImporters:
+            importer.beginBuild()
+            #the models of a job share their meshes
+            importer.meshesByHash = dMeshesByHash
+        self.executor = ThreadPoolExecutor(max_workers=self.iWorkers)
+        self.aFutures = [None if importer.memoryReport else self.executor.submit(importer.decodeRgm) for importer in self.aImporters]
+
+    def cancel(self):
+        for importer in self.aImporters:
+            importer.cancelled = True
+
+    # Removes everything this job created so far, so a cancelled import leaves the scene as it was
+    def rollback(self):
+        for importer in self.aImporters:
+            importer.discardBuild()
+
+    def stop(self, sState):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for importer in self.aImporters:
+            if importer.tracer.oMemory is not None:
+                importer.tracer.oMemory.stop()
+            importer.closeFileMap()
+        if sState == 'CANCELLED':
+            self.rollback()
+        return sState
+
+    # Advances the import for at most fTimeBudget seconds, returns 'RUNNING', 'FINISHED' or 'CANCELLED'.
+    # With bBlocking set it waits for decoding instead of returning.
+    def update(self, fTimeBudget, bBlocking=False):
+        fEndTime = time.perf_counter() + fTimeBudget
+        while self.iCurrent < len(self.aImporters):
+            importer = self.aImporters[self.iCurrent]
+            if importer.cancelled:
+                return self.stop('CANCELLED')
+            future = self.aFutures[self.iCurrent]
+            if self.steps is None:
+                if future is None:
+                    future = self.aFutures[self.iCurrent] = self.executor.submit(importer.decodeRgm)
+                #a model measured for memory is built once it is decoded, so the stages do not overlap
+                oReady = importer.decodeFinished if importer.memoryReport else importer.decodeStarted
+                if not oReady.is_set():
+                    if not bBlocking:
+                        return 'RUNNING'
+                    oReady.wait()
+                if importer.oModelData is None:
+                    self.failed(importer, future)
+                    continue
+                self.steps = importer.buildSteps()
+                self.iStepsDone = 0
+            try:
+                for bBuilt in self.steps:
+                    if bBuilt:
+                        self.iStepsDone += 1
+                    elif bBlocking:
+                        importer.oModelData.oChanged.wait()
+                    else:
+                        #the decoder is behind, come back on the next update
+                        return 'RUNNING'
+                    if time.perf_counter() >= fEndTime:
+                        return 'RUNNING'
+            except Exception as error:
+                #only this model is removed, the models built before it are kept
+                print("Rgm build failed: ", error)
+                importer.cancelled = True
+                importer.discardBuild()
+                self.steps = None
+                self.failed(importer, future)
+                continue
+            if future.exception() is not None:
+                #what was built from the parts decoded before the error goes again
+                importer.discardBuild()
+                self.steps = None
+                self.failed(importer, future)
+                continue
+            importer.finishUpdate()
+            importer.finishTrace()
+            importer.finishMemory()
+            #the decoded arrays are not needed once the model is built
+            importer.oModelData = None
+            importer.closeFileMap()
+            self.steps = None
+            self.iCurrent += 1
+        if len(self.aFailed) == len(self.aImporters):
+            self.error = "Unable to load " + ", ".join(self.aFailed)
+            return self.stop('CANCELLED')
+        return self.stop('FINISHED')
+
+    # Records a model that could not be loaded, decoded or built and moves on to the next one
+    def failed(self, importer, future):
+        #a model whose build failed may still be decoding, it stops at the next chunk
+        if future.done() and future.exception() is not None:
+            print("Rgm decoding failed: ", future.exception())
+        self.aFailed.append(importer.sModelPath)
+        importer.oModelData = None
+        importer.closeFileMap()
+        self.iCurrent += 1
+
+    # Warnings of the models built so far, see Tracer.warn
+    def warnings(self):
+        return [sWarning for importer in self.aImporters for sWarning in importer.tracer.aWarnings]
+
+    # Fraction of the import that is done, reading the model counts as the first tenth of it.
+    # Steps are counted for the parts decoded so far, the fraction is held while more are decoded.
+    def progress(self):
+        fModel = 0.0
+        if self.steps is not None:
+            importer = self.aImporters[self.iCurrent]
+            iStepCount = CountBuildSteps(importer.oModelData, importer.progressive)
+            fModel = 0.1 + 0.9 * self.iStepsDone / max(iStepCount, 1)
+        self.fProgress = max(self.fProgress, min((self.iCurrent + fModel) / len(self.aImporters), 1.0))
+        return self.fProgress
+
+    def statusText(self):
+        iModel = min(self.iCurrent, len(self.aImporters) - 1)
+        sText = "Importing " + self.aImporters[iModel].sModelName
+        if len(self.aImporters) > 1:
+            sText += f" ({iModel + 1}/{len(self.aImporters)})"
+        return sText
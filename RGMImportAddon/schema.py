@@ -0,0 +1,136 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Record layouts of the chunky formats. Every layout is declared once as a list of fields and compiled to
+# struct.Struct instances, one per run of fixed size fields, so a record is read with as few unpacks as its strings allow.
+# Plain Python, does not need Blender.
+
+import re
+import struct
+
+'''
+    A record layout, compiled from its fields
+    aFields - array of (name, type), name None for padding. The type is a struct format code with an optional count,
+              eg. 'I', 'i', '12f', '8s' (decoded as UTF-8), '8x' (skipped), or 'string' for a UTF-8 string
+              prefixed with its length as uint32, or 'string:name' for a string whose length is the earlier field name
+'''
+class Record:
+    def __init__(self, aFields):
+        #steps are (struct.Struct, array of (name, value count, is bytes)) or (name of a string, name of its length field)
+        self.aSteps = []
+        sFormat = ""
+        aValues = []
+        for sName, sType in aFields:
+            if sType.startswith("string"):
+                sLengthField = sType.partition(":")[2]
+                if not sLengthField:
+                    #the length prefix joins the fixed fields before it
+                    sLengthField = "#" + sName
+                    sFormat += "I"
+                    aValues.append((sLengthField, 1, False))
+                if sFormat:
+                    self.aSteps.append((struct.Struct("<" + sFormat), aValues))
+                    sFormat, aValues = "", []
+                self.aSteps.append((sName, sLengthField))
+                continue
+            oMatch = re.fullmatch(r"(\d*)([a-zA-Z?])", sType)
+            if oMatch is None:
+                raise ValueError("Invalid field type: " + sType)
+            iCount, sCode = int(oMatch.group(1) or 1), oMatch.group(2)
+            sFormat += sType
+            if sCode == 'x':
+                continue
+            if sCode == 's':
+                aValues.append((sName, 1, True))
+            else:
+                aValues.append((sName, iCount, False))
+        if sFormat:
+            self.aSteps.append((struct.Struct("<" + sFormat), aValues))
+
+    def assign(self, dRecord, aValues, aUnpacked):
+        iIndex = 0
+        for sName, iCount, bBytes in aValues:
+            if bBytes:
+                dRecord[sName] = aUnpacked[iIndex].decode('utf-8')
+            elif iCount == 1:
+                dRecord[sName] = aUnpacked[iIndex]
+            else:
+                dRecord[sName] = aUnpacked[iIndex:iIndex + iCount]
+            iIndex += iCount
+
+    '''
+        Reads a record out of a buffer
+        pData - bytes, memoryview or anything else struct can unpack from
+        iOffset - offset of the record in pData
+        returns - dict of the field values, and the offset behind the record
+    '''
+    def unpack_from(self, pData, iOffset=0):
+        dRecord = {}
+        for oStep, oFields in self.aSteps:
+            if isinstance(oStep, struct.Struct):
+                self.assign(dRecord, oFields, oStep.unpack_from(pData, iOffset))
+                iOffset += oStep.size
+            else:
+                iLength = dRecord[oFields]
+                dRecord[oStep] = bytes(pData[iOffset:iOffset + iLength]).decode('utf-8')
+                iOffset += iLength
+        return dRecord, iOffset
+
+    '''
+        Reads a record from a file, one read per run of fixed size fields and per string
+        fHandle - the file, positioned at the record
+        returns - dict of the field values, None at the end of the file
+    '''
+    def read(self, fHandle):
+        dRecord = {}
+        for oStep, oFields in self.aSteps:
+            if isinstance(oStep, struct.Struct):
+                pData = fHandle.read(oStep.size)
+                if not pData and not dRecord:
+                    return None
+                self.assign(dRecord, oFields, oStep.unpack(pData))
+            else:
+                dRecord[oStep] = fHandle.read(dRecord[oFields]).decode('utf-8')
+        return dRecord
+
+    '''
+        Reads consecutive records out of a buffer
+        pData - the buffer
+        iOffset - offset of the first record
+        iCount - number of records
+        returns - array of dicts of the field values, and the offset behind the last record
+    '''
+    def unpack_array(self, pData, iOffset, iCount):
+        aRecords = []
+        for i in range(iCount):
+            dRecord, iOffset = self.unpack_from(pData, iOffset)
+            aRecords.append(dRecord)
+        return aRecords, iOffset
+
+#Chunky files
+k_oChunkyHeader = Record([("sHeader", "16s"), ("iVersion", "I"), (None, "16x")])
+k_oChunkHeader = Record([("sType", "8s"), ("iVersion", "I"), ("iDataLength", "I"), ("iNameLength", "I"), (None, "8x"), ("sName", "string:iNameLength")])
+k_oCount = Record([("iCount", "I")])
+k_oString = Record([("sValue", "string")])
+
+#RGT textures, FOLDTSET/FOLDTXTR/FOLDDXTC
+k_oDxtcFormat = Record([("iWidth", "I"), ("iHeight", "I"), (None, "8x"), ("iCompression", "I")]) #DATATFMT
+k_oMipEntry = Record([("iDataLength", "I"), ("iDataLengthCompressed", "I")]) #DATATMAN, after the mip count
+k_oMipHeader = Record([("iMipLevel", "I"), ("iWidth", "I"), ("iHeight", "I"), ("iDataLength", "I")]) #start of every decompressed mip level
+
+#RGM models
+k_oBone = Record([("iParent", "i"), (None, "4x"), ("aMatrix", "12f")]) #DATABONE of a FOLDSKEL, the matrix is stored column by column
+k_oMarker = Record([("sName", "string"), ("sParent", "string"), ("aMatrix", "12f"), ("iParamCount", "I")]) #DATAMRKS, after the marker count
+k_oMarkerParam = Record([("sKey", "string"), (None, "4x"), ("sValue", "string")])
+k_oMaterialVar = Record([("sName", "string"), ("iType", "I")]) #DATAxVAR of a FOLDMTRL, texture variables are followed by a string
+k_oSkinBone = Record([(None, "96x"), ("sName", "string")]) #two transform matrices and the bone name, after the skin bone count
@@ -0,0 +1,342 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Writes synthetic .rgm models and .rgt textures in the layout chunky.py and rgmdata.py read,
+# for benchmarks and for trying out the importer without game assets.
+# Plain Python and numpy, does not need Blender.
+
+import os
+import struct
+import zlib
+import numpy as np
+
+from .rgmdata import VertexComponentDtype
+
+k_sChunkyHeader = b'Relic Chunky\r\n\x1a\x00'
+
+#DATATFMT compression ids as read by Chunky.loadDxtc, and the block size of each format
+k_aDxtcFormats = {1: (13, 8), 3: (14, 16), 5: (15, 16)}
+
+'''
+    Describes a synthetic model
+    iMeshCount - number of FOLDMRGM meshes
+    iObjectCount - number of objects per mesh
+    iVertexCount - number of vertices per object, a mesh holds at most 65536 vertices
+    iFaceCount - number of triangles per object, 0 uses two per vertex
+    iTrimCount - number of FOLDTRIM meshes
+    bCompressedUVs - store UVs as 4 packed bytes instead of 2 floats
+    iUVChannels - number of UV channels, 1 to 3
+    bFloatNormals - store normals as 3 floats instead of 4 packed bytes
+    bTangents - store tangents and binormals
+    bColours - store diffuse and specular vertex colours
+    iSkinBones - number of skin bones per mesh, 0 for unskinned meshes
+    iBoneCount - number of bones in the FOLDSKEL folder, 0 for no skeleton
+    iMaterialCount - number of FOLDMTRL folders, each with a diffuse and a normal map
+    iTextureSize - width and height of the .rgt textures written by WriteModel, 0 for none
+    bEmbedTextures - store the textures as FOLDTSET folders in the model instead of .rgt files, needs iTextureSize
+    iMipCount - number of mip levels of the textures, 0 for a full mip chain
+    bZlib - zlib compress the texture mip levels
+    iSeed - random seed, the same spec always gives the same file
+'''
+class SynthModelSpec:
+    def __init__(self, **kwargs):
+        self.iMeshCount = 1
+        self.iObjectCount = 4
+        self.iVertexCount = 1000
+        self.iFaceCount = 0
+        self.iTrimCount = 0
+        self.bCompressedUVs = True
+        self.iUVChannels = 1
+        self.bFloatNormals = False
+        self.bTangents = True
+        self.bColours = False
+        self.iSkinBones = 0
+        self.iBoneCount = 0
+        self.iMaterialCount = 0
+        self.iTextureSize = 0
+        self.bEmbedTextures = False
+        self.iMipCount = 0
+        self.bZlib = True
+        self.iSeed = 0
+        for sKey, value in kwargs.items():
+            if not hasattr(self, sKey):
+                raise TypeError("Unknown model spec option " + sKey)
+            setattr(self, sKey, value)
+
+'''
+    Builds a chunk with its header
+    sType - eg. "DATADATA", 8 characters
+    sName - chunk name
+    pData - chunk data, for FOLDxxxx chunks the children
+    iVersion - chunk version
+    returns - the chunk as bytes
+'''
+def WriteChunk(sType, sName, pData, iVersion=1):
+    pName = sName.encode('utf-8')
+    return sType.encode('utf-8') + struct.pack('<3I', iVersion, len(pData), len(pName)) + bytes(8) + pName + pData
+
+def WriteFold(sType, sName, aChildren, iVersion=1):
+    return WriteChunk(sType, sName, b''.join(aChildren), iVersion)
+
+'''
+    Builds a chunky file
+    aChunks - the root level chunks as bytes
+    iVersion - file version
+    returns - the file as bytes
+'''
+def WriteChunky(aChunks, iVersion=3):
+    return k_sChunkyHeader + struct.pack('<I', iVersion) + bytes(16) + b''.join(aChunks)
+
+def WriteString(sValue):
+    pValue = sValue.encode('utf-8')
+    return struct.pack('<I', len(pValue)) + pValue
+
+#packs unit vectors like a D3DCOLOR (z, y, x, w), the inverse of DecodeNormalArray before its swizzle
+def PackVectors(aVectors):
+    aPacked = np.full((len(aVectors), 4), 255, dtype=np.uint8)
+    aPacked[:, [2, 1, 0]] = np.rint((aVectors + 1.0) * 127.5).clip(0, 255).astype(np.uint8)
+    return aPacked
+
+def RandomUnitVectors(oRandom, iCount):
+    aVectors = oRandom.normal(size=(iCount, 3)).astype(np.float32)
+    aVectors /= np.maximum(np.linalg.norm(aVectors, axis=1, keepdims=True), 1e-6)
+    return aVectors
+
+'''
+    Builds the per-vertex component list and the vertex buffer of a mesh or trim
+    oSpec - the SynthModelSpec
+    oRandom - numpy random generator
+    iVertCount - number of vertices
+    returns - the bytes from the component count to the end of the vertex buffer, as read by ReadVertexBuffer
+'''
+def WriteVertexBuffer(oSpec, oRandom, iVertCount):
+    #(component, storage type, data type), data type 2 marks packed bytes
+    aComponents = [(0, 2, 1)]
+    if oSpec.iSkinBones > 0:
+        aComponents += [(1, 4, 2), (2, 4, 2)]
+    aComponents.append((3, 4, 1) if oSpec.bFloatNormals else (3, 4, 2))
+    if oSpec.bTangents:
+        aComponents += [(4, 4, 2), (5, 4, 2)]
+    if oSpec.bColours:
+        aComponents += [(6, 4, 2), (7, 4, 2)]
+    for iChannel in range(max(1, min(oSpec.iUVChannels, 3))):
+        aComponents.append((8 + iChannel, 4, 2) if oSpec.bCompressedUVs else (8 + iChannel, 1, 1))
+
+    class sComponent:
+        def __init__(self, iVertComponent, iDataType):
+            self.iVertComponent = iVertComponent
+            self.iDataType = iDataType
+
+    oDtype = VertexComponentDtype([sComponent(iType, iDataType) for iType, iStorage, iDataType in aComponents], None)
+    aVertexData = np.zeros(iVertCount, dtype=oDtype)
+    aVertexData["position"] = oRandom.uniform(-1.0, 1.0, size=(iVertCount, 3))
+    for sName in oDtype.names:
+        if sName in ("normal", "tangent", "binormal"):
+            aVectors = RandomUnitVectors(oRandom, iVertCount)
+            aVertexData[sName] = PackVectors(aVectors) if oDtype[sName].base == np.uint8 else aVectors
+        elif sName == "boneIndices":
+            aVertexData[sName] = oRandom.integers(0, oSpec.iSkinBones, size=(iVertCount, 4))
+        elif sName in ("boneWeights", "diffuseColour", "specularColour"):
+            aVertexData[sName] = oRandom.integers(0, 256, size=(iVertCount, 4))
+        elif sName.startswith("uv"):
+            if oDtype[sName].base == np.uint8:
+                aVertexData[sName] = oRandom.integers(0, 256, size=(iVertCount, 4))
+            else:
+                aVertexData[sName] = oRandom.uniform(0.0, 1.0, size=(iVertCount, 2))
+
+    pData = struct.pack('<I', len(aComponents)) + b''.join(struct.pack('<3I', *oComponent) for oComponent in aComponents)
+    return pData + struct.pack('<2I', iVertCount, oDtype.itemsize) + aVertexData.tobytes()
+
+'''
+    Builds the triangles of one object, a strip over its vertex range so no face is degenerate
+    iFirst - index of the first vertex of the object in the buffer
+    iVertCount - number of vertices of the object
+    iFaceCount - number of triangles
+    returns - (iFaceCount, 3) uint16 array
+'''
+def WriteFaces(iFirst, iVertCount, iFaceCount):
+    aStart = np.arange(iFaceCount)
+    aFaces = (aStart[:, None] + np.array([0, 1, 2])) % iVertCount + iFirst
+    return aFaces.astype('<u2')
+
+def WriteMaterialAndSkin(oSpec, sMaterialName):
+    pData = WriteString(sMaterialName) + struct.pack('<I', oSpec.iSkinBones)
+    for i in range(oSpec.iSkinBones):
+        pData += bytes(96) + WriteString("bone_" + str(i))
+    return pData
+
+def FaceCount(oSpec):
+    return oSpec.iFaceCount if oSpec.iFaceCount > 0 else oSpec.iVertexCount * 2
+
+'''
+    Builds the DATADATA chunk data of a FOLDMRGM mesh, as read by DecodeMeshDataData
+    oSpec - the SynthModelSpec
+    oRandom - numpy random generator
+    sName - name prefix of the objects
+    sMaterialName - material of the mesh
+    returns - the chunk data as bytes
+'''
+def WriteMeshDataData(oSpec, oRandom, sName, sMaterialName):
+    iVertCount = oSpec.iObjectCount * oSpec.iVertexCount
+    if iVertCount > 65536:
+        raise ValueError("A mesh holds at most 65536 vertices, got " + str(iVertCount))
+    pData = b'\x00' + struct.pack('<I', oSpec.iObjectCount)
+    for i in range(oSpec.iObjectCount):
+        aFaces = WriteFaces(i * oSpec.iVertexCount, oSpec.iVertexCount, FaceCount(oSpec))
+        pData += struct.pack('<I', aFaces.size) + aFaces.tobytes() + bytes(13)
+        pData += WriteString(sName + "_" + str(i))
+    pData += WriteVertexBuffer(oSpec, oRandom, iVertCount)
+    pData += struct.pack('<I', 0) #unknown
+    return pData + WriteMaterialAndSkin(oSpec, sMaterialName)
+
+'''
+    Builds the DATADATA chunk data of a FOLDTRIM mesh, as read by DecodeTrimDataData
+    oSpec - the SynthModelSpec
+    oRandom - numpy random generator
+    sMaterialName - material of the trim
+    returns - the chunk data as bytes
+'''
+def WriteTrimDataData(oSpec, oRandom, sMaterialName):
+    pData = WriteVertexBuffer(oSpec, oRandom, oSpec.iVertexCount)
+    pData += bytes(8) #unknown
+    #trim faces are stored with the opposite winding
+    aFaces = WriteFaces(0, oSpec.iVertexCount, FaceCount(oSpec))[:, [0, 2, 1]]
+    pData += struct.pack('<2I', 3, aFaces.size) + np.ascontiguousarray(aFaces).tobytes()
+    return pData + WriteMaterialAndSkin(oSpec, sMaterialName)
+
+'''
+    Builds a FOLDSKEL folder, as read by DecodeSkeleton
+    oRandom - numpy random generator
+    iBoneCount - number of bones, every bone is parented to the one before it
+    returns - the chunk as bytes
+'''
+def WriteSkeleton(oRandom, iBoneCount):
+    aChildren = [WriteChunk("DATAINFO", "", struct.pack('<I', iBoneCount))]
+    for k in range(iBoneCount):
+        #3x4 transform stored column by column: rotation columns, then the translation
+        aColumns = [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), tuple(oRandom.uniform(-0.5, 0.5, size=3))]
+        pData = struct.pack('<iI', k - 1, 0) + b''.join(struct.pack('<3f', *aColumn) for aColumn in aColumns)
+        aChildren.append(WriteChunk("DATABONE", "bone_" + str(k), pData))
+    return WriteFold("FOLDSKEL", "", aChildren)
+
+'''
+    Builds a FOLDMTRL folder with a diffuse and a normal map, as read by DecodeMaterial
+    sName - material name
+    sDiffusePath - game path of the diffuse texture, eg. "art\\synth\\tex_dif.rgt"
+    sNormalPath - game path of the normal map
+    returns - the chunk as bytes
+'''
+def WriteMaterial(sName, sDiffusePath, sNormalPath):
+    aChildren = [WriteChunk("DATAINFO", "", WriteString("synth_shader"))]
+    for sTexType, sPath in (("diffusetex", sDiffusePath), ("normalmap", sNormalPath)):
+        aChildren.append(WriteChunk("DATAVAR ", "", WriteString(sTexType) + struct.pack('<I', 9) + WriteString(sPath)))
+    return WriteFold("FOLDMTRL", sName, aChildren)
+
+'''
+    Builds a whole .rgm model
+    oSpec - the SynthModelSpec
+    returns - the file as bytes
+'''
+def WriteRgm(oSpec):
+    oRandom = np.random.default_rng(oSpec.iSeed)
+    aModel = []
+    if oSpec.iBoneCount > 0:
+        aModel.append(WriteSkeleton(oRandom, oSpec.iBoneCount))
+    for i in range(oSpec.iMaterialCount):
+        aModel.append(WriteMaterial(MaterialName(i), "art\\synth\\" + TextureName(i, "dif") + ".rgt", "art\\synth\\" + TextureName(i, "nrm") + ".rgt"))
+    if oSpec.bEmbedTextures and oSpec.iTextureSize > 0:
+        for i in range(oSpec.iMaterialCount):
+            for sKind in ("dif", "nrm"):
+                aModel.append(WriteTextureSet("art\\synth\\" + TextureName(i, sKind), oSpec.iTextureSize, oSpec.iTextureSize, oSpec.iMipCount,
+                    bZlib=oSpec.bZlib, iSeed=oSpec.iSeed + i))
+
+    aMeshes = []
+    for i in range(oSpec.iMeshCount):
+        pData = WriteMeshDataData(oSpec, oRandom, "mesh_" + str(i), MaterialName(i % max(oSpec.iMaterialCount, 1)))
+        aMrgm = WriteFold("FOLDMRGM", "", [WriteChunk("DATADATA", "", pData)])
+        aMeshes.append(WriteFold("FOLDMESH", "mesh_" + str(i), [aMrgm]))
+    for i in range(oSpec.iTrimCount):
+        pData = WriteTrimDataData(oSpec, oRandom, MaterialName(i % max(oSpec.iMaterialCount, 1)))
+        aTrim = WriteFold("FOLDTRIM", "trim_" + str(i), [WriteChunk("DATAINFO", "", bytes(4)), WriteChunk("DATADATA", "", pData)])
+        aMeshes.append(WriteFold("FOLDMESH", "trim_" + str(i), [aTrim]))
+    aModel.append(WriteFold("FOLDMESH", "", [WriteFold("FOLDMGRP", "", aMeshes)]))
+    return WriteChunky([WriteFold("FOLDMODL", "synth", aModel)])
+
+def MaterialName(i):
+    return "synth_material_" + str(i)
+
+def TextureName(i, sKind):
+    return "synth_" + str(i) + "_" + sKind
+
+'''
+    Builds a DXTC .rgt texture, as read by Chunky.loadDxtc
+    iWidth, iHeight - size of the largest mip level
+    iMipCount - number of mip levels, 0 for a full mip chain
+    iDxtc - 1, 3 or 5
+    bZlib - zlib compress the mip levels
+    iSeed - random seed for the block data
+    returns - the file as bytes
+'''
+def WriteRgt(iWidth, iHeight, iMipCount=0, iDxtc=5, bZlib=True, iSeed=0):
+    return WriteChunky([WriteTextureSet("", iWidth, iHeight, iMipCount, iDxtc, bZlib, iSeed)])
+
+'''
+    Builds the FOLDTSET folder of a DXTC texture, the root chunk of a .rgt file or embedded in a model
+    sName - chunk name, the texture path for a texture set embedded in a model
+    the other parameters - see WriteRgt
+    returns - the chunk as bytes
+'''
+def WriteTextureSet(sName, iWidth, iHeight, iMipCount=0, iDxtc=5, bZlib=True, iSeed=0):
+    oRandom = np.random.default_rng(iSeed)
+    iFormat, iBlockSize = k_aDxtcFormats[iDxtc]
+    if iMipCount <= 0:
+        iMipCount = max(iWidth, iHeight).bit_length()
+    aLengths = []
+    aLevels = []
+    #smallest mip level first, the last one read ends up as level 0
+    for iMip in reversed(range(iMipCount)):
+        iMipWidth, iMipHeight = max(iWidth >> iMip, 1), max(iHeight >> iMip, 1)
+        iBlocks = max((iMipWidth + 3) // 4, 1) * max((iMipHeight + 3) // 4, 1)
+        #blocks that repeat a few patterns, so zlib has something to do like on real textures
+        aPatterns = oRandom.integers(0, 256, size=(8, iBlockSize), dtype=np.uint8)
+        pBlocks = aPatterns[oRandom.integers(0, 8, size=iBlocks)].tobytes()
+        pLevel = struct.pack('<4I', iMip, iMipWidth, iMipHeight, len(pBlocks)) + pBlocks
+        pStored = zlib.compress(pLevel) if bZlib else pLevel
+        aLengths.append(struct.pack('<2I', len(pLevel), len(pStored)))
+        aLevels.append(pStored)
+    aDxtc = [
+        WriteChunk("DATATFMT", "", struct.pack('<5I', iWidth, iHeight, 0, 0, iFormat)),
+        WriteChunk("DATATMAN", "", struct.pack('<I', iMipCount) + b''.join(aLengths)),
+        WriteChunk("DATATDAT", "", b''.join(aLevels)),
+    ]
+    aTxtr = WriteFold("FOLDTXTR", "", [WriteFold("FOLDDXTC", "", aDxtc)])
+    return WriteFold("FOLDTSET", sName, [aTxtr])
+
+'''
+    Writes a synthetic model and its textures to a directory, ready for a 'Work' directory import
+    sDirectory - the output directory, created if missing
+    oSpec - the SynthModelSpec
+    sName - file name of the model without extension
+    returns - path of the .rgm file
+'''
+def WriteModel(sDirectory, oSpec, sName="synth"):
+    os.makedirs(sDirectory, exist_ok=True)
+    sPath = os.path.join(sDirectory, sName + ".rgm")
+    with open(sPath, "wb") as fHandle:
+        fHandle.write(WriteRgm(oSpec))
+    if oSpec.iTextureSize > 0 and not oSpec.bEmbedTextures:
+        for i in range(oSpec.iMaterialCount):
+            for sKind in ("dif", "nrm"):
+                with open(os.path.join(sDirectory, TextureName(i, sKind) + ".rgt"), "wb") as fHandle:
+                    fHandle.write(WriteRgt(oSpec.iTextureSize, oSpec.iTextureSize, oSpec.iMipCount, bZlib=oSpec.bZlib, iSeed=oSpec.iSeed + i))
+    return sPath
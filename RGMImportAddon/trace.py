@@ -0,0 +1,163 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Timing of the import stages and the debug log output.
+# Plain Python, does not need Blender.
+
+import json
+import os
+import threading
+import time
+
+#enables the informational log output of the importer, set from ImportRgm.debug
+bDebug = False
+
+'''
+    Prints only when debug output is enabled, takes the same arguments as print
+'''
+def DebugPrint(*args, **kwargs):
+    if bDebug:
+        print(*args, **kwargs)
+
+'''
+    One timed region of an import, used as a context manager
+    sName - stage name, eg. "vertex decode"
+    dArgs - counts recorded with the span, eg. vertices or bytes
+'''
+class Span:
+    def __init__(self, oTracer, sName, dArgs):
+        self.oTracer = oTracer
+        self.sName = sName
+        self.dArgs = dArgs
+        self.fStart = 0.0
+
+    def __enter__(self):
+        if self.oTracer.oMemory is not None:
+            self.oTracer.oMemory.enter(self.sName)
+        self.fStart = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        fEnd = time.perf_counter()
+        if self.oTracer.oMemory is not None:
+            self.oTracer.oMemory.exit()
+        if self.oTracer.bEnabled:
+            self.oTracer.record(self.sName, self.fStart, fEnd, self.dArgs)
+        return False
+
+    # Adds counts that are only known inside the span
+    def set(self, **kwargs):
+        self.dArgs.update(kwargs)
+
+#returned by a disabled Tracer, costs one call per span
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+    def set(self, **kwargs):
+        pass
+
+oNullSpan = NullSpan()
+
+'''
+    Records the spans of an import, safe to use from several threads
+    bEnabled - if false, span() does nothing
+    oMemory - a memory.MemoryAccount measuring every span, spans are measured even if bEnabled is false
+'''
+class Tracer:
+    def __init__(self, bEnabled=False, oMemory=None):
+        self.bEnabled = bEnabled
+        self.oMemory = oMemory
+        self.aEvents = [] #(name, start, end, thread id, args)
+        self.aWarnings = [] #problems the import worked around, see warn
+        self.fOrigin = time.perf_counter()
+        self.oLock = threading.Lock()
+
+    '''
+        Times a region of code
+        sName - stage name
+        kwargs - counts to record with the span
+        returns - a context manager, its set() method adds counts
+    '''
+    def span(self, sName, **kwargs):
+        if not self.bEnabled and self.oMemory is None:
+            return oNullSpan
+        return Span(self, sName, kwargs)
+
+    def record(self, sName, fStart, fEnd, dArgs):
+        with self.oLock:
+            self.aEvents.append((sName, fStart, fEnd, threading.get_ident(), dArgs))
+
+    '''
+        Records a problem the import worked around, eg. data it left out, to report once the import ends.
+        Recorded whether or not the tracer is enabled, a repeated warning is recorded once.
+        sMessage - the warning
+    '''
+    def warn(self, sMessage):
+        with self.oLock:
+            if sMessage in self.aWarnings:
+                return
+            self.aWarnings.append(sMessage)
+        DebugPrint(sMessage)
+
+    '''
+        Sums up the spans per stage
+        returns - array of (stage, calls, total seconds, summed counts) in order of first appearance
+    '''
+    def stages(self):
+        dStages = {}
+        with self.oLock:
+            aEvents = list(self.aEvents)
+        for sName, fStart, fEnd, iThread, dArgs in aEvents:
+            oStage = dStages.setdefault(sName, [0, 0.0, {}])
+            oStage[0] += 1
+            oStage[1] += fEnd - fStart
+            for sKey, value in dArgs.items():
+                if isinstance(value, (int, float)):
+                    oStage[2][sKey] = oStage[2].get(sKey, 0) + value
+        return [(sName, oStage[0], oStage[1], oStage[2]) for sName, oStage in dStages.items()]
+
+    '''
+        Formats the per stage totals as a text table
+        returns - the table as a string
+    '''
+    def summary(self):
+        aLines = [f"{'stage':<20} {'calls':>7} {'total ms':>10} {'mean ms':>9}  counts"]
+        for sName, iCalls, fTotal, dCounts in self.stages():
+            sCounts = ", ".join(f"{sKey}={value:,}" for sKey, value in dCounts.items())
+            aLines.append(f"{sName:<20} {iCalls:>7} {fTotal * 1000.0:>10.2f} {fTotal * 1000.0 / iCalls:>9.3f}  {sCounts}")
+        return "\n".join(aLines)
+
+    '''
+        Writes the spans as a Chrome trace (chrome://tracing, Perfetto)
+        sPath - the .json file to write
+    '''
+    def exportChromeTrace(self, sPath):
+        aTraceEvents = []
+        with self.oLock:
+            aEvents = list(self.aEvents)
+        for sName, fStart, fEnd, iThread, dArgs in aEvents:
+            aTraceEvents.append({
+                "name": sName,
+                "ph": "X",
+                "ts": (fStart - self.fOrigin) * 1e6,
+                "dur": (fEnd - fStart) * 1e6,
+                "pid": os.getpid(),
+                "tid": iThread,
+                "args": {sKey: value if isinstance(value, (int, float)) else str(value) for sKey, value in dArgs.items()},
+            })
+        with open(sPath, "w") as fHandle:
+            json.dump({"traceEvents": aTraceEvents, "displayTimeUnit": "ms"}, fHandle)
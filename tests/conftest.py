@@ -0,0 +1,5 @@
+# The format layer of the add-on is plain Python and numpy, the tests import it without Blender.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
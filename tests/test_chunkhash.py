@@ -0,0 +1,41 @@
+import pytest
+
+from RGMImportAddon.bench import BenchOptions
+from RGMImportAddon.rgmdata import ChunkHash, k_aHashedOptions
+from RGMImportAddon.trace import Tracer
+
+#a value different from the BenchOptions default for every hashed option
+k_dChangedOptions = {
+    "importTextures": False,
+    "importBones": False,
+    "mirrorAxis": True,
+    "importNormals": False,
+    "weldVertices": True,
+    "weldThreshold": 0.001,
+    "importDirectory": 'Asset',
+    "sWorkingDirectory": "/other/work",
+    "sAssetDirectory": "/other/assets",
+    "importCategories": {'Normal'},
+    "objectFilter": "wheel*",
+    "vertexComponents": {'UVS'},
+    "bakeMaps": True,
+}
+
+def test_every_hashed_option_is_covered():
+    assert set(k_dChangedOptions) == set(k_aHashedOptions)
+
+@pytest.mark.parametrize("sOption", sorted(k_dChangedOptions))
+def test_option_changes_hash(sOption):
+    oOptions = BenchOptions("/models/synth.rgm", Tracer(False))
+    sHash = ChunkHash(oOptions, b"chunk data")
+    assert getattr(oOptions, sOption) != k_dChangedOptions[sOption]
+    setattr(oOptions, sOption, k_dChangedOptions[sOption])
+    assert ChunkHash(oOptions, b"chunk data") != sHash
+
+def test_same_options_same_hash():
+    oFirst = BenchOptions("/models/synth.rgm", Tracer(False))
+    oSecond = BenchOptions("/models/synth.rgm", Tracer(False))
+    #sets hash the same whatever their order
+    oSecond.importCategories = set(reversed(sorted(oFirst.importCategories)))
+    assert ChunkHash(oFirst, b"chunk data") == ChunkHash(oSecond, b"chunk data")
+    assert ChunkHash(oFirst, b"chunk data") != ChunkHash(oFirst, b"other data")
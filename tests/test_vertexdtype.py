@@ -0,0 +1,28 @@
+import pytest
+
+from RGMImportAddon.rgmdata import VertexComponentDtype
+from RGMImportAddon.trace import Tracer
+
+class sComponent:
+    def __init__(self, iVertComponent, iDataType=1):
+        self.iVertComponent = iVertComponent
+        self.iDataType = iDataType
+
+def test_vertex_size_pads_the_record():
+    oDtype = VertexComponentDtype([sComponent(0), sComponent(3, 2)], 32)
+    assert oDtype.itemsize == 32
+    assert oDtype.fields["normal"][1] == 12
+
+def test_components_larger_than_vertex_size():
+    with pytest.raises(ValueError):
+        VertexComponentDtype([sComponent(0), sComponent(3)], 12)
+
+def test_unknown_last_component_is_reported():
+    oTracer = Tracer(False)
+    oDtype = VertexComponentDtype([sComponent(0), sComponent(99)], 20, tracer=oTracer)
+    assert oDtype.names == ("position",)
+    assert oTracer.aWarnings == ["Unknown vertex component 99 skipped"]
+
+def test_unknown_component_followed_by_others():
+    with pytest.raises(ValueError):
+        VertexComponentDtype([sComponent(99), sComponent(0)], 20)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from RGMImportAddon.rgmdata import WeldVertices
+
+def test_weld_across_cell_boundary():
+    #0.0099 and 0.0101 lie in different cells of a 0.01 grid but only 0.0002 apart
+    aPositions = np.array([[0.0099, 0, 0], [0.0101, 0, 0], [0.5, 0, 0]], dtype=np.float32)
+    aWelded, aFaces = WeldVertices(aPositions, np.array([[0, 1, 2]]), 0.01)
+    assert len(aWelded) == 2
+    assert aFaces.tolist() == [[0, 0, 1]]
+
+def test_weld_keeps_vertices_beyond_threshold():
+    #both in the same cell of a 0.01 grid, but further apart than the threshold
+    aPositions = np.array([[0.0001, 0, 0], [0.0099, 0, 0], [0.0001, 0.0099, 0]], dtype=np.float32)
+    aWelded, aFaces = WeldVertices(aPositions, np.array([[0, 1, 2]]), 0.005)
+    assert len(aWelded) == 3
+    assert aFaces.tolist() == [[0, 1, 2]]
+
+def test_weld_many_coincident_vertices():
+    #stacked seam duplicates, compared pair by pair they would take minutes and gigabytes
+    aPositions = np.repeat(np.array([[0.0, 0, 0], [1.0, 0, 0]], dtype=np.float32), 50000, axis=0)
+    aFaces = np.array([[0, 50000, 99999]])
+    aWelded, aFaces = WeldVertices(aPositions, aFaces, 0.001)
+    assert aWelded.tolist() == [[0.0, 0, 0], [1.0, 0, 0]]
+    assert aFaces.tolist() == [[0, 1, 1]]
+
+def test_weld_dense_cell():
+    #many distinct vertices within the weld distance of each other
+    aPositions = np.random.default_rng(0).random((20000, 3)).astype(np.float32) * 0.001
+    aWelded, aFaces = WeldVertices(aPositions, np.array([[0, 1, 2]]), 0.01)
+    assert len(aWelded) == 1
+    assert aFaces.tolist() == [[0, 0, 0]]
+
+def test_weld_chains_vertices():
+    #each vertex is within the distance of the next, so all of them merge
+    aPositions = np.array([[0.0, 0, 0], [0.008, 0, 0], [0.016, 0, 0], [0.5, 0, 0]], dtype=np.float32)
+    aWelded, aFaces = WeldVertices(aPositions, np.array([[0, 2, 3]]), 0.01)
+    assert len(aWelded) == 2
+    assert aFaces.tolist() == [[0, 0, 1]]